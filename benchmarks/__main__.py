@@ -0,0 +1,285 @@
+"""
+Benchmarks for prmt.
+
+    python -m benchmarks [--quick] [--filter NAME] [--output FILE]
+
+The results are written as JSON, so they can be compared across releases.
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import prmt
+from prmt.testing import ScriptedIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS: List[Callable] = []
+
+
+def benchmark(func: Callable) -> Callable:
+    BENCHMARKS.append(func)
+    return func
+
+
+def measure(
+    name: str,
+    func: Callable[[], None],
+    number: int,
+    size: Optional[int] = None,
+    **params,
+) -> Dict:
+    """
+    Call 'func' 'number' times and return the timing as a result record.
+    'size' is the number of bytes processed per call, if it is relevant.
+    """
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        func()
+    elapsed = time.perf_counter_ns() - start
+
+    result = {
+        "name": name,
+        "params": params,
+        "number": number,
+        "ns_per_op": elapsed / number,
+        "ops_per_sec": number / (elapsed / 1e9) if elapsed else None,
+    }
+
+    if size is not None:
+        result["bytes_per_sec"] = size * number / (elapsed / 1e9) if elapsed else None
+
+    return result
+
+
+def scripted(answer: str, number: int) -> ScriptedIO:
+    io = ScriptedIO(*([answer] * number))
+    return io
+
+
+@benchmark
+def call_overhead(quick: bool) -> List[Dict]:
+    number = 2_000 if quick else 50_000
+    prompt = prmt.Prompt(fmt_question="{} ")
+    options = ["a", "b", "c"]
+    results = []
+
+    cases = [
+        ("string", "joe", lambda io: prmt.string("Name?", io=io)),
+        ("integer", "5", lambda io: prmt.integer("Number?", io=io)),
+        ("confirm", "y", lambda io: prmt.confirm("Continue?", io=io)),
+        ("list_of_string", "a, b", lambda io: prmt.list_of_string("Items?", io=io)),
+        ("select", "1", lambda io: prmt.select("Pick", options, io=io)),
+        ("Prompt.string", "joe", lambda io: prompt.string("Name?", io=io)),
+        ("Prompt.integer", "5", lambda io: prompt.integer("Number?", io=io)),
+        ("Prompt.confirm", "y", lambda io: prompt.confirm("Continue?", io=io)),
+        (
+            "Prompt.list_of_string",
+            "a, b",
+            lambda io: prompt.list_of_string("Items?", io=io),
+        ),
+        ("Prompt.select", "1", lambda io: prompt.select("Pick", options, io=io)),
+    ]
+
+    for name, answer, call in cases:
+        io = scripted(answer, number)
+        results.append(measure(f"call.{name}", lambda: call(io), number))
+
+    return results
+
+
+@benchmark
+def retry_path(quick: bool) -> List[Dict]:
+    number = 200 if quick else 2_000
+    results = []
+
+    for retries in (1, 10, 100):
+        io = ScriptedIO()
+        for _ in range(number):
+            io.feed(*(["maybe"] * retries), "y")
+
+        results.append(
+            measure(
+                "retry.confirm",
+                lambda: prmt.confirm("Continue?", io=io),
+                number,
+                retries=retries,
+            )
+        )
+
+    return results
+
+
+@benchmark
+def hooks(quick: bool) -> List[Dict]:
+    number = 2_000 if quick else 50_000
+    results = []
+
+    for registered in (0, 1):
+        if registered:
+            prmt.add_hook(len)
+        try:
+            io = scripted("y", number)
+            results.append(
+                measure(
+                    "hooks.confirm",
+                    lambda: prmt.confirm("Continue?", io=io),
+                    number,
+                    hooks=registered,
+                )
+            )
+        finally:
+            if registered:
+                prmt.remove_hook(len)
+
+    return results
+
+
+@benchmark
+def select_rendering(quick: bool) -> List[Dict]:
+    results = []
+    sizes = (10, 10_000) if quick else (10, 10_000, 1_000_000)
+
+    for size in sizes:
+        options = [f"option {i}" for i in range(size)]
+        number = max(1, 100_000 // size) if quick else max(3, 1_000_000 // size)
+        io = scripted("0", number)
+
+        def call():
+            prmt.select("Pick", options, io=io)
+            io.take_output()
+
+        result = measure("select.render", call, number, options=size)
+        result["writes_per_op"] = io.writer.writes / number
+        result["bytes_per_op"] = io.writer.bytes_written / number
+        results.append(result)
+
+    return results
+
+
+@benchmark
+def list_of_string_parsing(quick: bool) -> List[Dict]:
+    results = []
+    counts = (1_000, 100_000) if quick else (1_000, 100_000, 1_000_000)
+
+    for count in counts:
+        line = ", ".join(f"host-{i}" for i in range(count))
+        number = 3 if quick else 10
+        io = scripted(line, number)
+
+        results.append(
+            measure(
+                "list_of_string.parse",
+                lambda: prmt.list_of_string("Hosts?", io=io),
+                number,
+                size=len(line),
+                items=count,
+            )
+        )
+
+    return results
+
+
+PASTE_CHILD = """
+import sys
+import prmt
+
+answer = prmt.string(question="Paste:", multiline=True)
+sys.stderr.write(str(len(answer)))
+"""
+
+
+@benchmark
+def multiline_paste(quick: bool) -> List[Dict]:
+    try:
+        import pty
+        import termios
+    except ImportError:
+        return []
+
+    size = (4 if quick else 32) * 1024 * 1024
+    line = b"x" * 99 + b"\n"
+    paste = line * (size // len(line))
+
+    master, slave = pty.openpty()
+    attrs = termios.tcgetattr(slave)
+    attrs[3] = attrs[3] & ~termios.ECHO
+    termios.tcsetattr(slave, termios.TCSANOW, attrs)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-c", PASTE_CHILD],
+        stdin=slave,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        cwd=ROOT,
+    )
+
+    try:
+        while termios.tcgetattr(slave)[3] & termios.ICANON:
+            time.sleep(0.001)
+
+        start = time.perf_counter_ns()
+        view = memoryview(paste)
+        while view:
+            view = view[os.write(master, view[:65536]) :]
+        os.write(master, b"\x04")
+        proc.communicate(timeout=120)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        os.close(master)
+        os.close(slave)
+
+    return [
+        {
+            "name": "multiline.paste",
+            "params": {"bytes": len(paste)},
+            "number": 1,
+            "ns_per_op": elapsed,
+            "ops_per_sec": 1e9 / elapsed,
+            "bytes_per_sec": len(paste) / (elapsed / 1e9),
+        }
+    ]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Use smaller inputs.")
+    parser.add_argument("--filter", help="Only run benchmarks with this in their name.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    results = []
+
+    for bench in BENCHMARKS:
+        if args.filter and args.filter not in bench.__name__:
+            continue
+        print(f"Running {bench.__name__} ...", file=sys.stderr)
+        results.extend(bench(args.quick))
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "quick": args.quick,
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,1686 @@
 """
 A bunch of functions to prompt a user for values on the command line.
 """
-from typing import Union, Any, Optional, Tuple, List
-import tempfile
+
+from typing import (
+    Union,
+    Any,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    IO,
+    Callable,
+    Iterator,
+    Generator,
+    NamedTuple,
+    Mapping,
+    Sequence,
+)
+import functools
 import os
-import subprocess as sp
-import platform
+import stat
 import sys
+import time
+
+# Public names that live in modules which are imported on first use.
+_LAZY = {
+    "get_input_from_texteditor": "prmt._editor",
+    "read_stdin_non_blocking_windows": "prmt._terminal",
+    "read_stdin_non_blocking_unix": "prmt._terminal",
+    "read_stdin_non_blocking": "prmt._terminal",
+    "read_stdin_multiline_unix": "prmt._terminal",
+    "read_stdin_multiline_windows": "prmt._terminal",
+    "read_stdin_multiline": "prmt._terminal",
+    "PromptCoordinator": "prmt.coordinator",
+    "CoordinatorStats": "prmt.coordinator",
+    "PromptBroker": "prmt.broker",
+    "BrokerError": "prmt.broker",
+    "LineFile": "prmt.options",
+    "LazySequence": "prmt.options",
+    "OptionSet": "prmt.options",
+    "FuzzyIndex": "prmt.options",
+    "Selection": "prmt.options",
+    "Table": "prmt.options",
+    "OptionStream": "prmt.options",
+    "AnswerCache": "prmt.cache",
+    "Form": "prmt.form",
+    "FormAnswers": "prmt.form",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+
+class AnswerBuffer:
+    """
+    Collect the chunks of a multiline or editor answer.
+
+    The chunks are kept in a list and joined once at the end. If 'max_bytes' is
+    set and the answer grows beyond it, the buffer either rejects the answer
+    (overflow="reject") or moves it into a temporary file (overflow="spill").
+    Subclass this to plug in a different storage.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, overflow: str = "reject"):
+        if overflow not in ("reject", "spill"):
+            raise ValueError("overflow must be 'reject' or 'spill'.")
+
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self.size = 0
+        self.rejected = False
+        self._chunks: List[str] = []
+        self._file: Optional[IO[str]] = None
+
+    def write(self, text: str) -> None:
+        if self.rejected or not text:
+            return
+
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+
+        if (
+            self._file is None
+            and self.max_bytes is not None
+            and self.size + size > self.max_bytes
+        ):
+            if self.overflow == "spill":
+                self._spill()
+            else:
+                self.rejected = True
+                self._chunks = []
+                return
+
+        if self._file is not None:
+            self._file.write(text)
+        else:
+            self._chunks.append(text)
+
+        self.size += size
+
+    def _spill(self) -> None:
+        import tempfile
+
+        self._file = tempfile.NamedTemporaryFile(
+            mode="w+", encoding="utf-8", prefix="prmt-", suffix=".txt"
+        )
+        self._file.writelines(self._chunks)
+        self._chunks = []
+
+    def getvalue(self) -> Union[str, IO[str]]:
+        """
+        Return the answer as a string, or as a file object positioned at the
+        start of the text, if the answer was spilled to disk.
+        The temporary file is deleted when the file object is closed.
+        """
+        if self._file is not None:
+            self._file.flush()
+            self._file.seek(0)
+            return self._file
+
+        return "".join(self._chunks)
+
+
+class Terminal:
+    """
+    Describe what the terminal behind a 'PromptIO' can do.
+
+    :param interactive: A user types the answers. If False, answers are read line by line and prompts are not rendered.
+    :param fd: File descriptor of the terminal. It is used for raw mode input. None, if raw mode is not available.
+    :param size: Fixed terminal size as (columns, lines). If None, the size is read from the terminal.
+    """
+
+    def __init__(
+        self,
+        interactive: bool = True,
+        fd: Optional[int] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ):
+        self.interactive = interactive
+        self.fd = fd
+        self._size = size
+        # (resize generation, size) of the last size read from the terminal.
+        self._cached: Optional[Tuple[int, Tuple[int, int]]] = None
+
+    @classmethod
+    def detect(cls, stream: Any) -> "Terminal":
+        """
+        Create the terminal description for an input stream.
+        """
+        try:
+            fd = stream.fileno()
+            interactive = os.isatty(fd)
+        except (AttributeError, OSError, ValueError):
+            fd = None
+            isatty = getattr(stream, "isatty", None)
+            interactive = bool(isatty and isatty())
+
+        return cls(interactive=interactive, fd=fd if interactive else None)
+
+    def size(self) -> Tuple[int, int]:
+        """
+        Return the terminal size as (columns, lines).
+
+        Where SIGWINCH is available, the size is cached until the terminal is
+        resized, so redrawing prompts do not ask the terminal for each frame.
+        """
+        if self._size is not None:
+            return self._size
+
+        if self.fd is not None:
+            from prmt import _terminal
+
+            generation = _terminal.size_generation
+
+            if _terminal.watch_size():
+                cached = self._cached
+                if cached is not None and cached[0] == generation:
+                    return cached[1]
+
+            try:
+                size = tuple(os.get_terminal_size(self.fd))
+            except OSError:
+                pass
+            else:
+                self._cached = (generation, size)
+                return size
+
+        return (80, 24)
+
+
+class OutputWriter:
+    """
+    Collect the output of a prompt and write it to the stream with a single
+    call. A prompt builds its whole frame (question, options and prompt line)
+    before it is written, so slow terminals (e.g. over SSH) do not get many
+    small writes.
+
+    'writes' and 'bytes_written' count what was written so far.
+    """
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes_written = 0
+        self._parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        if text:
+            self._parts.append(text)
+
+    def flush(self, stream: IO[str]) -> None:
+        """
+        Write the collected text to 'stream' and flush it.
+        """
+        if not self._parts:
+            return
+
+        text = "".join(self._parts)
+        self._parts.clear()
+
+        stream.write(text)
+        stream.flush()
+
+        self.writes += 1
+
+        if text.isascii():
+            self.bytes_written += len(text)
+        else:
+            encoding = getattr(stream, "encoding", None) or "utf-8"
+            self.bytes_written += len(text.encode(encoding, "replace"))
+
+
+# A line with only this text ends a multiline answer on non-interactive input.
+MULTILINE_END = "."
+
+# Read chunks of this size from pipes while a prompt has a timeout.
+_CHUNK_SIZE = 65536
+
+
+def _wait_fd(stream: Any) -> Optional[int]:
+    """
+    Return the file descriptor to wait on for input from 'stream', or None if
+    reading it never blocks (e.g. regular files and in-memory streams).
+    """
+    try:
+        fd = stream.fileno()
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    return fd
+
+
+class PromptIO:
+    """
+    The input, output and terminal that prompts use.
+
+    If the terminal is interactive, prompts are rendered to 'output' and the
+    answers are read from 'input'. Multiline answers end with ctrl+d or
+    ctrl+c, or ctrl+z on the Windows console. If raw mode is available, they are read in non-canonical mode.
+
+    If the terminal is not interactive (e.g. 'input' is a pipe), answers are
+    read line by line and prompts are only rendered to 'echo', if it is set.
+    Multiline and editor answers end at a line that only contains MULTILINE_END
+    or at the end of the input.
+
+    Reads that are given a 'deadline' (a 'time.monotonic()' value) wait for
+    input with 'select' and raise TimeoutError when the deadline passes. Pipes
+    are then read without the buffer of 'input', text that was read ahead is
+    kept for the next prompt. With 'countdown' set, an interactive terminal
+    shows the seconds that are left in a line above the prompt line, formatted
+    with 'countdown_fmt'.
+
+    Text is written through 'writer'. It is collected until the prompt waits
+    for input or is done, 'write(..., flush=True)' and 'flush()' write it.
+
+    A prompt takes its answer from the answers source ('set_answers') first,
+    without any io. Otherwise it uses the io it is given, or the io of its
+    'Prompt'. Without one, it is forwarded to the 'PromptBroker' in
+    PRMT_BROKER if that is set, else it uses stdin and stdout, or stderr with
+    PRMT_OUTPUT=stderr.
+
+    :param input: Read answers from this stream. Defaults to sys.stdin.
+    :param output: Render prompts to this stream. Defaults to sys.stdout.
+    :param terminal: A 'Terminal'. Detected from 'input' by default.
+    :param echo: Render prompts to this stream if the terminal is not interactive.
+    :param writer: An 'OutputWriter', e.g. to share its counters between several PromptIOs.
+    """
+
+    countdown_fmt = "{}s left"
+
+    def __init__(
+        self,
+        input: Optional[IO[str]] = None,
+        output: Optional[IO[str]] = None,
+        terminal: Optional[Terminal] = None,
+        echo: Optional[IO[str]] = None,
+        writer: Optional[OutputWriter] = None,
+    ):
+        self.input = input
+        self.output = output
+        self.writer = writer or OutputWriter()
+        self.terminal = terminal or Terminal.detect(input or sys.stdin)
+        self.echo = echo
+        self.interactive = self.terminal.interactive
+        self.renders = self.interactive or echo is not None
+
+        # Use the builtin input() for stdin, so 'readline' line editing works.
+        self._builtin_input = self.interactive and input is None and output is None
+
+        # Text that reads with a deadline took from a pipe, or that was typed
+        # after the end of a multiline answer, but was not used yet.
+        self._pending = ""
+        self._decoder: Any = None
+
+    def _out(self) -> Optional[IO[str]]:
+        if self.interactive:
+            return self.output or sys.stdout
+        return self.echo
+
+    def _in(self) -> IO[str]:
+        return self.input or sys.stdin
+
+    def write(self, text: str, flush: bool = False) -> None:
+        out = self._out()
+        if out is not None:
+            self.writer.write(text)
+            if flush:
+                self.writer.flush(out)
+
+    def flush(self) -> None:
+        out = self._out()
+        if out is not None:
+            self.writer.flush(out)
+
+    def _countdown(
+        self, prompt: str, deadline: Optional[float], countdown: bool
+    ) -> Tuple[str, Optional[Callable[..., None]]]:
+        """
+        Add the countdown line above the last line of 'prompt'. Return the
+        prompt and the function that updates the countdown, if it is shown.
+        """
+        if not countdown or deadline is None or not self.interactive:
+            return prompt, None
+
+        from prmt._terminal import _seconds_left
+
+        fmt = self.countdown_fmt
+        start = prompt.rfind("\n") + 1
+        seconds = max(_seconds_left(deadline), 0)
+        prompt = prompt[:start] + fmt.format(seconds) + "\n" + prompt[start:]
+
+        def tick(seconds: int, lines: int = 0) -> None:
+            # Save the cursor, rewrite the countdown line and restore the cursor.
+            self.write(
+                f"\x1b7\x1b[{lines + 1}A\r{fmt.format(seconds)}\x1b[K\x1b8",
+                flush=True,
+            )
+
+        return prompt, tick
+
+    def _unread(self, text: str) -> None:
+        """
+        Keep text that was read but belongs to the next prompt.
+        """
+        self._pending = text + self._pending
+
+    def _readline(self) -> str:
+        pending = self._pending
+
+        if pending:
+            end = pending.find("\n")
+            if end != -1:
+                self._pending = pending[end + 1 :]
+                return pending[: end + 1]
+            self._pending = ""
+
+        return pending + self._in().readline()
+
+    def _readline_until(
+        self, deadline: float, on_tick: Optional[Callable[..., None]] = None
+    ) -> str:
+        """
+        Read a line, including the newline. Raise TimeoutError if there is no
+        complete line at 'deadline'.
+        """
+        stream = self._in()
+        fd = _wait_fd(stream)
+
+        if fd is None or "\n" in self._pending:
+            return self._readline()
+
+        from prmt._terminal import wait_readable
+
+        if os.isatty(fd):
+            # A terminal in canonical mode has input once a line is complete.
+            if not wait_readable(fd, deadline, on_tick):
+                raise TimeoutError
+            return self._readline()
+
+        if self._decoder is None:
+            import codecs
+
+            encoding = getattr(stream, "encoding", None) or "utf-8"
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+        while "\n" not in self._pending:
+            if not wait_readable(fd, deadline, on_tick):
+                raise TimeoutError
+
+            data = os.read(fd, _CHUNK_SIZE)
+            self._pending += self._decoder.decode(data, final=not data)
+
+            if not data:
+                break
+
+        return self._readline()
+
+    def readline(
+        self, prompt: str, deadline: Optional[float] = None, countdown: bool = False
+    ) -> str:
+        if deadline is not None:
+            prompt, tick = self._countdown(prompt, deadline, countdown)
+
+            if self.renders:
+                self.write(prompt, flush=True)
+
+            line = self._readline_until(deadline, tick)
+
+        elif self._builtin_input and not self._pending:
+            # Only the prompt line goes to input(), 'readline' redraws it.
+            start = prompt.rfind("\n") + 1
+            self.write(prompt[:start], flush=True)
+            return input(prompt[start:])
+
+        else:
+            if self.renders:
+                self.write(prompt, flush=True)
+
+            line = self._readline()
+
+        if not line:
+            raise EOFError
+
+        return line[:-1] if line[-1] == "\n" else line
+
+    def read_multiline(
+        self,
+        prompt: str,
+        buffer: AnswerBuffer,
+        deadline: Optional[float] = None,
+        countdown: bool = False,
+    ) -> AnswerBuffer:
+        prompt, tick = self._countdown(prompt, deadline, countdown)
+
+        if self.interactive and self.terminal.fd is not None:
+            from prmt._terminal import read_stdin_multiline
+
+            typed, self._pending = self._pending, ""
+
+            return read_stdin_multiline(
+                buffer,
+                fd=self.terminal.fd,
+                on_ready=lambda: self.write(prompt, flush=True),
+                deadline=deadline,
+                on_tick=tick,
+                typed=typed,
+                on_rest=self._unread,
+            )
+
+        if self.renders:
+            self.write(prompt, flush=True)
+
+        if deadline is None:
+            readline = self._readline
+        else:
+            readline = functools.partial(self._readline_until, deadline, tick)
+
+        if self.interactive:
+            # Without raw mode ctrl+d only arrives at the end of a line.
+            while True:
+                line = readline()
+                end = line.find("\x04")
+                if end != -1:
+                    buffer.write(line[:end])
+                    break
+                if not line:
+                    break
+                buffer.write(line)
+        else:
+            end = MULTILINE_END
+            end_nl = end + "\n"
+
+            while True:
+                line = readline()
+                if not line or line == end_nl or line == end:
+                    break
+                buffer.write(line)
+
+        return buffer
+
+    def read_keys(
+        self,
+        on_ready: Callable[[], None],
+        deadline: Optional[float] = None,
+        wake_fd: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Read single keys from an interactive terminal, without echo. Escape
+        sequences like "\\x1b[A" (up) are one key, ctrl+c is "\\x03".
+        'on_ready' is called once keys can be read, e.g. to show the prompt.
+        In raw mode, an empty string is read instead of a key when 'wake_fd'
+        is readable.
+
+        Without raw mode the input is read line by line and split into keys,
+        the end of each line is an enter key.
+
+        Keys that were read but not used when the caller stops, e.g. keys typed
+        after enter, are kept for the next prompt.
+        """
+        from prmt._terminal import split_keys
+
+        keys, self._pending = split_keys(self._pending)
+
+        if self.terminal.fd is not None:
+            from prmt._terminal import read_keys
+
+            reads = read_keys(self.terminal.fd, on_ready, deadline, wake_fd)
+        else:
+            reads = self._read_line_keys(on_ready, deadline)
+
+        try:
+            for read in reads:
+                keys.extend(read)
+                while keys:
+                    yield keys.pop(0)
+        finally:
+            reads.close()
+            self._pending = "".join(keys) + self._pending
+
+    def _read_line_keys(
+        self, on_ready: Callable[[], None], deadline: Optional[float]
+    ) -> Iterator[List[str]]:
+        from prmt._terminal import split_keys
+
+        on_ready()
+
+        yield []
+
+        while True:
+            if deadline is None:
+                line = self._readline()
+            else:
+                line = self._readline_until(deadline)
+
+            if not line:
+                raise EOFError
+
+            keys, rest = split_keys(line)
+            yield keys + [rest] if rest else keys
+
+    def read_editor(
+        self,
+        prompt: str,
+        buffer: AnswerBuffer,
+        deadline: Optional[float] = None,
+        countdown: bool = False,
+        **editor_args,
+    ) -> AnswerBuffer:
+        if not self.interactive:
+            return self.read_multiline(prompt, buffer, deadline, countdown)
+
+        from prmt._editor import get_input_from_texteditor
+
+        # The deadline is not checked while the editor runs, an editor that is
+        # killed would leave the terminal in its state.
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError
+
+        self.write(prompt, flush=True)
+        answer = get_input_from_texteditor(buffer=buffer, echo=False, **editor_args)
+
+        if isinstance(answer, str):
+            self.write(answer + "\n")
+
+        return buffer
+
+
+_io_stdin: Any = None
+_io: Any = None
+
+
+def _get_io() -> PromptIO:
+    """
+    Get the default prompt I/O for the current stdin.
+    Whether stdin is interactive is only checked once per stdin object.
+    Prompts are rendered to stderr instead of stdout if PRMT_OUTPUT=stderr.
+    """
+    global _io_stdin, _io
+
+    stdin = sys.stdin
+
+    if stdin is not _io_stdin:
+        echo = sys.stderr if os.environ.get("PRMT_PIPE_ECHO") == "1" else None
+        output = sys.stderr if os.environ.get("PRMT_OUTPUT") == "stderr" else None
+        _io = PromptIO(output=output, echo=echo)
+        _io_stdin = stdin
+
+    return _io
+
+
+class RetriesExhausted(Exception):
+    """
+    Raised if the user enters invalid input more often than 'max_retries'
+    allows and 'on_exhausted' is set to "raise".
+    """
+
+    def __init__(self, question: str, retries: int):
+        super().__init__(f"No valid answer after {retries} retries: {question}")
+        self.question = question
+        self.retries = retries
+
+
+class PromptTimeout(TimeoutError):
+    """
+    Raised if a prompt with a 'timeout' got no valid answer in time and
+    'on_timeout' is set to "raise".
+    """
+
+    def __init__(self, question: str, timeout: float):
+        super().__init__(f"No answer within {timeout:g} seconds: {question}")
+        self.question = question
+        self.timeout = timeout
+
+
+# Returned by a prompt attempt if the user input was invalid.
+_INVALID = object()
+
+_ON_EXHAUSTED = ("raise", "default", "none")
+
+_ON_TIMEOUT = ("default", "raise")
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def _timed(deadline: Optional[float], countdown: bool) -> tuple:
+    """
+    Return the extra arguments for the reads of a 'PromptIO'. They are only
+    passed with a deadline, so subclasses that do not take them keep working.
+    """
+    return () if deadline is None else (deadline, countdown)
+
+
+def _time_left(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+
+class _Read(NamedTuple):
+    """
+    A read that a prompt flow waits for. Prompts are generators that yield
+    their reads and get the results back, so the same prompt runs blocking
+    ('_run') and in an event loop ('prmt.aio').
+
+    'method' is the name of a read of 'io', e.g. "readline". Without an
+    'io', 'method' is a function that blocks, like waiting for options.
+    """
+
+    io: Any
+    method: Any
+    args: tuple = ()
+    kwargs: Optional[Dict[str, Any]] = None
+
+
+# A prompt flow, it yields '_Read's and returns the answer.
+_Flow = Generator[_Read, Any, Any]
+
+
+def _run(flow: _Flow) -> Any:
+    """
+    Run a prompt flow, blocking on each of its reads.
+    Errors of a read are raised inside the flow.
+    """
+    send: Callable[[Any], _Read] = flow.send
+    result: Any = None
+
+    while True:
+        try:
+            read = send(result)
+        except StopIteration as stop:
+            return stop.value
+
+        func = read.method if read.io is None else getattr(read.io, read.method)
+
+        try:
+            result = func(*read.args, **(read.kwargs or {}))
+            send = flow.send
+        except BaseException as e:
+            result = e
+            send = flow.throw
+
+
+def _result(value: Any) -> _Flow:
+    """
+    A flow that returns 'value' without reading.
+    """
+    return value
+    yield
+
+
+def _retry(
+    question: str,
+    attempt: Callable[[], _Flow],
+    fallback: Callable[[], _Flow],
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    rec: Optional["_Recorder"] = None,
+) -> _Flow:
+    """
+    Run the flow of 'attempt' until it returns a valid value.
+
+    If the user gave invalid input more than 'max_retries' times, raise
+    'RetriesExhausted' (on_exhausted="raise"), return the result of
+    'fallback' (on_exhausted="default") or return None (on_exhausted="none").
+
+    If 'timeout' is set and 'attempt' raises TimeoutError, return the result of
+    'fallback' (on_timeout="default") or raise 'PromptTimeout'
+    (on_timeout="raise").
+
+    The outcome is emitted to the hooks with 'rec'.
+    """
+    try:
+        if on_exhausted not in _ON_EXHAUSTED:
+            raise ValueError(f"on_exhausted must be one of {_ON_EXHAUSTED}.")
+
+        if on_timeout not in _ON_TIMEOUT:
+            raise ValueError(f"on_timeout must be one of {_ON_TIMEOUT}.")
+
+        retries = 0
+        status = "answered"
+
+        while True:
+            if rec is not None:
+                rec.attempts += 1
+
+            try:
+                value = yield from attempt()
+            except TimeoutError:
+                if timeout is None:
+                    raise
+                if on_timeout == "raise":
+                    raise PromptTimeout(question, timeout) from None
+                status = "timeout"
+                value = yield from fallback()
+                break
+
+            if value is not _INVALID:
+                break
+
+            if max_retries is not None and retries >= max_retries:
+                if on_exhausted == "raise":
+                    raise RetriesExhausted(question, retries)
+                status = on_exhausted
+                if on_exhausted == "default":
+                    value = yield from fallback()
+                break
+
+            retries += 1
+
+    except BaseException as e:
+        if rec is not None:
+            rec.failed(e)
+        raise
+
+    if value is _INVALID:
+        value = None
+
+    if rec is not None:
+        rec.emit("user", status, value)
+
+    return value
+
+
+class InvalidAnswer(ValueError):
+    """
+    Raised if an answer from the answers source is not valid for its prompt.
+    """
+
+    def __init__(self, question: str, answer: Any):
+        super().__init__(f"Invalid answer {answer!r} for: {question}")
+        self.question = question
+        self.answer = answer
+
+
+class MissingAnswer(LookupError):
+    """
+    Raised by a strict answers source that has no answer for a prompt.
+    """
+
+    def __init__(self, question: str, prompt_id: Optional[str] = None):
+        super().__init__(f"No answer for: {prompt_id or question}")
+        self.question = question
+        self.prompt_id = prompt_id
+
+
+# Returned by an answers lookup if there is no answer for a prompt.
+_MISSING = object()
+
+
+def _env_key(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name).upper()
+
+
+def _answer_text(value: Any) -> str:
+    """
+    Convert an answer to the text the user would type in.
+    """
+    if value is None:
+        return ""
+    if value is True:
+        return "yes"
+    if value is False:
+        return "no"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+class Answers:
+    """
+    A source of answers for running prompts unattended.
+
+    Answers are looked up by the 'prompt_id' of a prompt first and then by the
+    question text. They are validated like user input. An invalid answer
+    raises 'InvalidAnswer'. If there is no answer the prompt falls back to
+    asking the user, unless 'strict' is set, then 'MissingAnswer' is raised.
+    """
+
+    def __init__(
+        self,
+        answers: Mapping[str, Any],
+        strict: bool = False,
+        key: Optional[Callable[[str], str]] = None,
+    ):
+        self.strict = strict
+        self._key = key
+        self._index = {
+            (key(str(k)) if key else str(k)): _answer_text(v)
+            for k, v in answers.items()
+        }
+
+    @classmethod
+    def from_file(cls, path: Union[str, "os.PathLike"], strict: bool = False):
+        """
+        Load answers from a JSON file that contains a single object.
+        """
+        import json
+
+        with open(path, encoding="utf-8") as f:
+            answers = json.load(f)
+
+        if not isinstance(answers, dict):
+            raise ValueError(f"The answers file must contain an object: {path}")
+
+        return cls(answers, strict=strict)
+
+    @classmethod
+    def from_env(cls, prefix: str = "PRMT_ANSWER_", strict: bool = False):
+        """
+        Collect answers from environment variables that start with 'prefix'.
+        The prompt id or question is upper cased and every character that is not
+        a letter or digit is replaced with '_', e.g. "db.host" -> PRMT_ANSWER_DB_HOST.
+        """
+        answers = {
+            name[len(prefix) :]: value
+            for name, value in os.environ.items()
+            if name.startswith(prefix)
+        }
+        return cls(answers, strict=strict, key=_env_key)
+
+    def get(self, question: str, prompt_id: Optional[str] = None) -> Any:
+        """
+        Return the answer text for a prompt or '_MISSING'.
+        """
+        index = self._index
+        key = self._key
+
+        if prompt_id is not None:
+            answer = index.get(key(prompt_id) if key else prompt_id, _MISSING)
+            if answer is not _MISSING:
+                return answer
+
+        answer = index.get(key(question) if key else question, _MISSING)
+
+        if answer is _MISSING and self.strict:
+            raise MissingAnswer(question, prompt_id)
+
+        return answer
+
+
+_answers: Optional[Answers] = None
+_answers_loaded = False
+
+
+def set_answers(
+    answers: Optional[Union[Answers, Mapping[str, Any], str, "os.PathLike"]],
+) -> Optional[Answers]:
+    """
+    Set the answers source for all prompts.
+
+    :param answers: An 'Answers' object, a mapping or the path to a JSON file.
+        Pass None to ask the user again.
+    """
+    global _answers, _answers_loaded
+
+    if answers is None or isinstance(answers, Answers):
+        _answers = answers
+    elif isinstance(answers, Mapping):
+        _answers = Answers(answers)
+    else:
+        _answers = Answers.from_file(answers)
+
+    _answers_loaded = True
+
+    return _answers
+
+
+def get_answers() -> Optional[Answers]:
+    """
+    Get the answers source. On first use it is loaded from the JSON file in the
+    environment variable PRMT_ANSWERS, if it is set.
+    """
+    if not _answers_loaded:
+        path = os.environ.get("PRMT_ANSWERS")
+        set_answers(path or None)
+
+    return _answers
+
+
+def _preset_answer(question: str, prompt_id: Optional[str]) -> Any:
+    """
+    Return the answer text from the answers source or '_MISSING'.
+    """
+    answers = _answers if _answers_loaded else get_answers()
+
+    if answers is None:
+        return _MISSING
+
+    return answers.get(question, prompt_id)
+
+
+_answer_cache: Optional["AnswerCache"] = None
+_answer_cache_loaded = False
+
+
+def set_answer_cache(
+    cache: Optional[Union["AnswerCache", str, "os.PathLike"]],
+) -> Optional["AnswerCache"]:
+    """
+    Set the cache that remembers the answers of prompts between runs.
+    Prompts with a 'prompt_id' and without a 'default' get their last answer
+    as the default.
+
+    :param cache: An 'AnswerCache' or the path to its JSON file. Pass None to
+        stop remembering answers.
+    """
+    global _answer_cache, _answer_cache_loaded
+
+    if cache is None or hasattr(cache, "put"):
+        _answer_cache = cache
+    else:
+        from prmt.cache import AnswerCache
+
+        _answer_cache = AnswerCache(cache)
+
+    _answer_cache_loaded = True
+
+    return _answer_cache
+
+
+def get_answer_cache() -> Optional["AnswerCache"]:
+    """
+    Get the answer cache. On first use it is set to the JSON file in the
+    environment variable PRMT_ANSWER_CACHE, if it is set.
+    """
+    if not _answer_cache_loaded:
+        path = os.environ.get("PRMT_ANSWER_CACHE")
+        set_answer_cache(path or None)
+
+    return _answer_cache
+
+
+def _cached_default(
+    prompt_id: Optional[str],
+    default: Any,
+    parse: Optional[Callable[[str], Any]],
+) -> Any:
+    """
+    Return 'default', or if it is None the last answer of the prompt from the
+    answer cache. A cached answer that 'parse' rejects is not used.
+    """
+    if default is not None or prompt_id is None:
+        return default
+
+    cache = _answer_cache if _answer_cache_loaded else get_answer_cache()
+
+    if cache is None:
+        return None
+
+    answer = cache.get(prompt_id)
+
+    if answer is None or parse is not None and parse(answer) is _INVALID:
+        return None
+
+    return answer
+
+
+def _remember(
+    prompt_id: Optional[str],
+    value: Any,
+    text: Callable[[Any], str] = _answer_text,
+) -> Any:
+    """
+    Keep the answer of a prompt in the answer cache and return it.
+    """
+    cache = _answer_cache if _answer_cache_loaded else get_answer_cache()
+
+    # Answers that spilled to a file are too big to keep.
+    if cache is None or prompt_id is None or value is None or hasattr(value, "read"):
+        return value
+
+    answer = text(value)
+
+    if answer:
+        try:
+            cache.put(prompt_id, answer)
+        except OSError:
+            # The answer is not lost because it could not be remembered.
+            pass
+
+    return value
+
+
+def _forward(rec: Optional["_Recorder"], type: str, question: str, **args) -> Any:
+    """
+    Send the prompt to the broker of a parent process ('PromptBroker').
+    Return the answer or '_MISSING', if this process has no broker.
+    """
+    from prmt.broker import forward
+
+    value = forward(type, question, args)
+
+    if rec is not None and value is not _MISSING:
+        rec.emit("broker", "answered", value)
+
+    return value
+
+
+class PromptEvent(NamedTuple):
+    """
+    Emitted to the hooks when a prompt is done.
+
+    'source' is "user", "answers" (the answers source) or "broker" (answered
+    by the 'PromptBroker' of a parent process). 'status' is one of
+    "answered", "default" (retries exhausted, the default was returned), "none"
+    (retries exhausted, None was returned), "exhausted" ('RetriesExhausted' was
+    raised), "interrupted" (ctrl+c or end of input), "cancelled" (an async
+    prompt was cancelled), "timeout" (the prompt timed out, the default was
+    returned or 'PromptTimeout' was raised) or "error".
+
+    Durations are in nanoseconds: 'render_ns' is spent formatting and writing
+    the prompt, 'wait_ns' waiting for the answer (including the editor) and
+    'validation_ns' parsing and validating answers. 'time_ns',
+    'editor_spawn_ns' and 'editor_exit_ns' are wall clock timestamps from
+    time.time_ns(). 'answer_size' is the size of the answer text in bytes,
+    'output_bytes' the number of bytes the prompt wrote to the terminal.
+    """
+
+    type: str
+    question: str
+    prompt_id: Optional[str]
+    source: str
+    status: str
+    time_ns: int
+    total_ns: int
+    render_ns: int
+    wait_ns: int
+    validation_ns: int
+    retries: int
+    editor_spawn_ns: Optional[int]
+    editor_exit_ns: Optional[int]
+    answer_size: Optional[int]
+    output_bytes: int = 0
+
+
+_hooks: Tuple[Callable[[PromptEvent], Any], ...] = ()
+
+
+def add_hook(hook: Callable[[PromptEvent], Any]) -> Callable[[PromptEvent], Any]:
+    """
+    Call 'hook' with a 'PromptEvent' after every prompt.
+    Returns 'hook', so this can be used as a decorator.
+    """
+    global _hooks
+
+    _hooks = _hooks + (hook,)
+
+    return hook
+
+
+def remove_hook(hook: Callable[[PromptEvent], Any]) -> None:
+    """
+    Remove a hook that was added with 'add_hook'.
+    """
+    global _hooks
+
+    hooks = list(_hooks)
+    hooks.remove(hook)
+    _hooks = tuple(hooks)
+
+
+class JSONLinesSink:
+    """
+    A hook that writes every event as a line of JSON.
+
+        prmt.add_hook(prmt.JSONLinesSink("prompts.jsonl"))
+
+    :param target: A path (the file is opened for appending) or a text stream.
+    """
+
+    def __init__(self, target: Union[str, "os.PathLike", IO[str]]):
+        if isinstance(target, (str, os.PathLike)):
+            self._file = open(target, "a", encoding="utf-8")
+            self._owned = True
+        else:
+            self._file = target
+            self._owned = False
+
+        import threading
+
+        self._lock = threading.Lock()
+
+    def __call__(self, event: PromptEvent) -> None:
+        import json
+
+        line = json.dumps(event._asdict(), ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+
+def _answer_size(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if hasattr(value, "fileno"):
+        return os.fstat(value.fileno()).st_size
+    return len(_answer_text(value).encode("utf-8"))
+
+
+class _TimedIO:
+    """
+    Wrap a 'PromptIO' and add the time spent in it to a '_Recorder'.
+    """
+
+    def __init__(self, io: PromptIO, recorder: "_Recorder"):
+        self._io = io
+        self._recorder = recorder
+        self.renders = io.renders
+        self.interactive = io.interactive
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._io, name)
+
+    def write(self, text: str, flush: bool = False) -> None:
+        start = time.perf_counter_ns()
+        self._io.write(text, flush)
+        self._recorder.render_ns += time.perf_counter_ns() - start
+
+    def flush(self) -> None:
+        start = time.perf_counter_ns()
+        self._io.flush()
+        self._recorder.render_ns += time.perf_counter_ns() - start
+
+    def readline(self, prompt: str, *timed) -> str:
+        start = time.perf_counter_ns()
+        try:
+            return self._io.readline(prompt, *timed)
+        finally:
+            self._recorder.wait_ns += time.perf_counter_ns() - start
+
+    def read_multiline(self, prompt: str, buffer: AnswerBuffer, *timed) -> AnswerBuffer:
+        start = time.perf_counter_ns()
+        try:
+            return self._io.read_multiline(prompt, buffer, *timed)
+        finally:
+            self._recorder.wait_ns += time.perf_counter_ns() - start
+
+    def read_keys(self, on_ready: Callable[[], None], *timed) -> Iterator[str]:
+        keys = self._io.read_keys(on_ready, *timed)
+
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                key = next(keys)
+            except StopIteration:
+                return
+            finally:
+                self._recorder.wait_ns += time.perf_counter_ns() - start
+            yield key
+
+    def read_editor(
+        self,
+        prompt: str,
+        buffer: AnswerBuffer,
+        *timed,
+        **editor_args,
+    ) -> AnswerBuffer:
+        recorder = self._recorder
+        start = time.perf_counter_ns()
+
+        if self.interactive:
+            recorder.editor_spawn_ns = time.time_ns()
+
+        try:
+            return self._io.read_editor(prompt, buffer, *timed, **editor_args)
+        finally:
+            if self.interactive:
+                recorder.editor_exit_ns = time.time_ns()
+            recorder.wait_ns += time.perf_counter_ns() - start
+
+
+class _Recorder:
+    """
+    Collect the timings of one prompt and emit a 'PromptEvent' to the hooks.
+    Prompts only create a recorder if a hook is registered.
+    """
+
+    def __init__(self, type: str, question: str, prompt_id: Optional[str]):
+        self.type = type
+        self.question = question
+        self.prompt_id = prompt_id
+        self.time_ns = time.time_ns()
+        self.start = time.perf_counter_ns()
+        self.render_ns = 0
+        self.wait_ns = 0
+        self.validation_ns = 0
+        self.attempts = 0
+        self.editor_spawn_ns: Optional[int] = None
+        self.editor_exit_ns: Optional[int] = None
+        self.timed_out = False
+        self._render_start = 0
+        self._io: Optional[PromptIO] = None
+        self._bytes_written = 0
+
+    def validator(self, func: Callable[[str], Any]) -> Callable[[str], Any]:
+        """
+        Wrap a parse or validation function to time it.
+        """
+
+        def timed(answer):
+            start = time.perf_counter_ns()
+            try:
+                return func(answer)
+            finally:
+                self.validation_ns += time.perf_counter_ns() - start
+
+        return timed
+
+    def io(self, io: PromptIO) -> Any:
+        """
+        Start timing the rendering and return the wrapped 'io'.
+        """
+        self.start_render()
+        self.output_from(io)
+        return _TimedIO(io, self)
+
+    def output_from(self, io: PromptIO) -> None:
+        """
+        Count the bytes that 'io' writes from now on.
+        """
+        self._io = io
+        self._bytes_written = io.writer.bytes_written
+
+    def start_render(self) -> None:
+        self._render_start = time.perf_counter_ns()
+
+    def rendered(self) -> None:
+        self.render_ns += time.perf_counter_ns() - self._render_start
+
+    def preset(self, value: Any) -> Any:
+        self.emit("answers", "answered", value)
+        return value
+
+    def failed(self, error: BaseException) -> None:
+        """
+        Emit the outcome of a prompt that raised 'error'.
+        """
+        if isinstance(error, RetriesExhausted):
+            status = "exhausted"
+        elif isinstance(error, TimeoutError):
+            status = "timeout"
+        elif isinstance(error, (KeyboardInterrupt, EOFError, SystemExit)):
+            status = "interrupted"
+        elif type(error).__name__ == "CancelledError":
+            status = "cancelled"
+        else:
+            status = "error"
+
+        self.emit("user", status, None)
+
+    def emit(self, source: str, status: str, value: Any) -> None:
+        output_bytes = 0
+
+        if self._io is not None:
+            # The end of the prompt is still collected in the writer.
+            self._io.flush()
+            output_bytes = self._io.writer.bytes_written - self._bytes_written
+
+        event = PromptEvent(
+            type=self.type,
+            question=self.question,
+            prompt_id=self.prompt_id,
+            source=source,
+            status=status,
+            time_ns=self.time_ns,
+            total_ns=time.perf_counter_ns() - self.start,
+            render_ns=self.render_ns,
+            wait_ns=self.wait_ns,
+            validation_ns=self.validation_ns,
+            retries=max(self.attempts - 1, 0),
+            editor_spawn_ns=self.editor_spawn_ns,
+            editor_exit_ns=self.editor_exit_ns,
+            answer_size=_answer_size(value),
+            output_bytes=output_bytes,
+        )
+
+        for hook in _hooks:
+            hook(event)
+
+
+class _Template(NamedTuple):
+    """
+    A compiled prompt template. The format strings are resolved and the prompt
+    format is split into its start and end once, when the template is created.
+    """
+
+    question: str
+    default: str
+    prompt: str
+    prompt_start: str
+    prompt_end: str
+
+    def render(self, question: str, default: Any = None) -> str:
+        if default:
+            return (
+                self.question.format(question)
+                + self.default.format(default)
+                + self.prompt_start
+            )
+        else:
+            return self.question.format(question) + self.prompt_start
+
+
+class _SelectTemplate(NamedTuple):
+    """
+    A compiled template for 'select'.
+    The template for the custom string input is compiled as well.
+    """
+
+    question: str
+    option: str
+    options_end: str
+    default: str
+    prompt: str
+    prompt_start: str
+    prompt_end: str
+    custom: _Template
+    page: str
+
+    def render(self, default: Any = None) -> str:
+        if default:
+            return self.options_end + self.default.format(default) + self.prompt_start
+        else:
+            return self.options_end + self.prompt_start
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_template(
+    fmt_question: str,
+    fmt_default: str,
+    fmt_prompt: str,
+) -> _Template:
+    fmt_prompt_start, _, fmt_prompt_end = fmt_prompt.partition("{}")
+
+    return _Template(
+        fmt_question, fmt_default, fmt_prompt, fmt_prompt_start, fmt_prompt_end
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_select_template(
+    fmt_question: str,
+    fmt_option: str,
+    fmt_options_end: str,
+    fmt_default: str,
+    fmt_prompt: str,
+    custom: _Template,
+    fmt_page: str,
+) -> _SelectTemplate:
+    fmt_prompt_start, _, fmt_prompt_end = fmt_prompt.partition("{}")
+
+    return _SelectTemplate(
+        fmt_question,
+        fmt_option,
+        fmt_options_end,
+        fmt_default,
+        fmt_prompt,
+        fmt_prompt_start,
+        fmt_prompt_end,
+        custom,
+        fmt_page,
+    )
+
+
+_DEFAULT_TEMPLATE = _compile_template("\n{}\n", "[{}]", "> {}\n")
+
+_DEFAULT_SELECT_TEMPLATE = _compile_select_template(
+    "\n{}\n",
+    "  {}: {}",
+    "\n",
+    "[{}]",
+    "> {}\n",
+    _DEFAULT_TEMPLATE,
+    "  Page {} of {} ({} next, {} previous)",
+)
+
+_NO_FMT = (None, None, None, None, None)
+
+
+def _template(
+    fmt=None,
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    base: _Template = _DEFAULT_TEMPLATE,
+) -> _Template:
+    """
+    Get the compiled template for the given formats.
+    Formats that are not set are taken from 'base'.
+    """
+    fmt = fmt or _NO_FMT
+
+    return _compile_template(
+        fmt_question or fmt[0] or base.question,
+        fmt_default or fmt[1] or base.default,
+        fmt_prompt or fmt[2] or base.prompt,
+    )
+
+
+def _select_template(
+    fmt=None,
+    fmt_question=None,
+    fmt_option=None,
+    fmt_options_end=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    fmt_custom=None,
+    fmt_custom_question=None,
+    fmt_custom_default=None,
+    fmt_custom_prompt=None,
+    fmt_page=None,
+    base: _SelectTemplate = _DEFAULT_SELECT_TEMPLATE,
+) -> _SelectTemplate:
+    """
+    Get the compiled select template for the given formats.
+    Formats that are not set are taken from 'base'.
+    """
+    fmt = fmt or _NO_FMT
+
+    return _compile_select_template(
+        fmt_question or fmt[0] or base.question,
+        fmt_option or fmt[1] or base.option,
+        fmt_options_end or fmt[2] or base.options_end,
+        fmt_default or fmt[3] or base.default,
+        fmt_prompt or fmt[4] or base.prompt,
+        _template(
+            fmt_custom,
+            fmt_custom_question,
+            fmt_custom_default,
+            fmt_custom_prompt,
+            base=base.custom,
+        ),
+        fmt_page or base.page,
+    )
+
+
+class _Context(NamedTuple):
+    """
+    What the render step of a prompt gets once the io is chosen: the io, the
+    default (possibly from the answer cache), 'parse' (an empty answer is the
+    default) and the reads with the deadline of the prompt.
+    """
 
-if platform.system == "Windows":
-    import msvcrt
-else:
-    import termios
+    io: Any
+    default: Any
+    parse: Callable[[str], Any]
+    deadline: Optional[float]
+    timed: tuple
+    rec: Optional[_Recorder]
 
+    def read(self, method: str, *args, **kwargs) -> _Read:
+        """
+        A read of 'io' that stops at the deadline.
+        """
+        return _Read(self.io, method, args + self.timed, kwargs)
 
-def get_input_from_texteditor(
-    instruction=None,
-    default=None,
-    file_type=None,
-    remove_comments=True,
-) -> str:
-    if default:
-        q = f"{default}\n"
-    else:
-        q = "\n"
 
-    if instruction is None and remove_comments == True:
-        q += "# Lines starting with '#' will be ignored.\n"
-    elif isinstance(instruction, str):
-        for line in instruction.splitlines():
-            q += f"# {line}\n"
+def _prompt(
+    type: str,
+    question: str,
+    parse: Callable[[str], Any],
+    render: Callable[[_Context], Callable[[], _Flow]],
+    forward: Dict[str, Any],
+    default: Any = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    deadline: Optional[float] = None,
+    preset: Optional[Callable[[str, Callable[[str], Any]], _Flow]] = None,
+    fallback: Optional[Callable[[_Context], _Flow]] = None,
+    remember: Optional[Callable[[Any], str]] = _answer_text,
+    check_cached: bool = True,
+) -> _Flow:
+    """
+    The flow that all prompts share: the default from the answer cache, the
+    answer from the answers source, forwarding to the broker, choosing the io,
+    the hooks, the retries and remembering the answer.
+
+    :param parse: Parse an answer, return '_INVALID' if it is not valid.
+    :param render: Render the prompt for a '_Context' and return the flow of
+        one attempt.
+    :param forward: The arguments of the prompt for the broker.
+    :param preset: A flow that parses an answer from the answers source with
+        the parse function it gets. Defaults to parsing it.
+    :param fallback: The flow of the value for "default" on exhaustion and
+        timeout. Defaults to the parsed default.
+    :param remember: Convert the answer to the text kept in the answer cache.
+        None does not use the answer cache.
+    :param check_cached: Only use a cached default that 'parse' accepts.
+    """
+    if remember is not None:
+        default = _cached_default(prompt_id, default, parse if check_cached else None)
+
+    rec = None
 
-    editor = os.environ.get("EDITOR") or "vi"
+    if _hooks:
+        rec = _Recorder(type, question, prompt_id)
+        parse = rec.validator(parse)
 
-    with tempfile.NamedTemporaryFile(suffix=file_type or "", mode="w+") as tmp_file:
-        tmp_file.write(q)
-        tmp_file.flush()
+    def parse_answer(answer):
+        return parse(answer or _default_key(default))
 
-        if editor in ["vi", "vim"] and file_type:
-            sp.run([editor, "-c", f"set filetype={file_type}", tmp_file.name])
+    answer = _preset_answer(question, prompt_id)
+
+    if answer is not _MISSING:
+        if preset is None:
+            value = parse_answer(answer)
         else:
-            sp.run([editor, tmp_file.name])
+            value = yield from preset(answer, parse_answer)
+        if value is _INVALID:
+            raise InvalidAnswer(question, answer)
+        return rec.preset(value) if rec else value
 
-        tmp_file.seek(0)
+    if io is None and "PRMT_BROKER" in os.environ:
+        args = dict(
+            default=default,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+        )
+        args.update(forward)
+        value = yield _Read(None, _forward, (rec, type, question), args)
+        if value is not _MISSING:
+            return value
 
-        user_input_raw = tmp_file.read()
+    io = io or _get_io()
 
-    user_input_clean = ""
+    if deadline is None:
+        deadline = _deadline(timeout)
 
-    if q:
-        user_input_clean = user_input_raw.replace(q, "")
-    else:
-        user_input_clean = user_input_raw
+    if rec is not None:
+        io = rec.io(io)
+
+    context = _Context(
+        io, default, parse_answer, deadline, _timed(deadline, countdown), rec
+    )
+    attempt = render(context)
+
+    if rec is not None:
+        rec.rendered()
+
+    def fallback_value():
+        if fallback is None:
+            return _result(parse_answer(""))
+        return fallback(context)
+
+    try:
+        value = yield from _retry(
+            question,
+            attempt,
+            fallback_value,
+            max_retries,
+            on_exhausted,
+            timeout,
+            on_timeout,
+            rec,
+        )
+    finally:
+        io.flush()
 
-    print(user_input_clean)
+    if remember is None:
+        return value
 
-    return user_input_clean
+    return _remember(prompt_id, value, remember)
 
 
-def read_stdin_non_blocking_windows():
+def _render_line(
+    question: str,
+    template: _Template,
+    show_invalid: bool = True,
+) -> Callable[[_Context], Callable[[], _Flow]]:
     """
-    TODO: This is not tested...
+    The render step of prompts that parse one line.
     """
-    if msvcrt.kbhit():
-        return msvcrt.getch().decode("utf-8")
-    else:
-        return None
 
+    def render(context):
+        io = context.io
+        prompt = template.render(question, context.default) if io.renders else ""
+        fmt_prompt_end = template.prompt_end
 
-def read_stdin_non_blocking_unix():
-    fd = sys.stdin.fileno()
-    orig = termios.tcgetattr(fd)
+        def attempt():
+            answer: str = yield context.read("readline", prompt)
 
-    new = termios.tcgetattr(fd)
-    new[3] = new[3] & ~termios.ICANON
-    new[6][termios.VMIN] = 1
-    new[6][termios.VTIME] = 0
+            io.write(fmt_prompt_end)
 
-    try:
-        termios.tcsetattr(fd, termios.TCSAFLUSH, new)
-        return sys.stdin.read(1)
-    finally:
-        termios.tcsetattr(fd, termios.TCSAFLUSH, orig)
+            return_val = context.parse(answer)
 
+            if return_val is _INVALID and show_invalid:
+                io.write("Invalid input." + fmt_prompt_end + "\n")
 
-def read_stdin_non_blocking():
-    if platform.system == "Windows":
-        return read_stdin_non_blocking_windows()
-    else:
-        return read_stdin_non_blocking_unix()
+            return return_val
+
+        return attempt
+
+    return render
 
 
 def _string_base(
@@ -100,79 +1692,112 @@ def _string_base(
     editor_file_type=None,
     editor_remove_comments=True,
     multiline=False,
-    fmt=["\n{}\n", "[{}]", "> {}\n"],
-    fmt_question=None,
-    fmt_default=None,
-    fmt_prompt=None,
-) -> str:
-    fmt = fmt or [None, None, None]
-    fmt_question = fmt_question or fmt[0] or "\n{}\n"
-    fmt_default = fmt_default or fmt[1] or "[{}]"
-    fmt_prompt = fmt_prompt or fmt[2] or "> {}\n"
-    fmt_prompt_start = fmt_prompt.split("{}")[0]
-    fmt_prompt_end = fmt_prompt.split("{}")[1]
-
-    prompt = ""
-
-    if default:
-        prompt = (
-            fmt_question.format(question)
-            + fmt_default.format(default)
-            + fmt_prompt_start
-        )
-    else:
-        prompt = fmt_question.format(question) + fmt_prompt_start
+    max_bytes: Optional[int] = None,
+    overflow: str = "reject",
+    answer_buffer=AnswerBuffer,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    template: _Template = _DEFAULT_TEMPLATE,
+) -> _Flow:
+    def validate(answer):
+        return _INVALID if blacklist and answer in blacklist else answer
+
+    def parse(answer):
+        if max_bytes is not None:
+            buffer = answer_buffer(max_bytes=max_bytes, overflow=overflow)
+            buffer.write(answer)
+            if buffer.rejected:
+                return _INVALID
+            answer = buffer.getvalue()
+
+        return validate(answer)
+
+    def render(context):
+        io = context.io
+        default = context.default
+        check = validate if context.rec is None else context.rec.validator(validate)
+        prompt = template.render(question, default) if io.renders else ""
+        fmt_prompt_end = template.prompt_end
+
+        def attempt():
+            rejected = False
+
+            if open_editor:
+                buffer = yield context.read(
+                    "read_editor",
+                    prompt,
+                    answer_buffer(max_bytes=max_bytes, overflow=overflow),
+                    instruction=editor_instruction,
+                    default=default,
+                    file_type=editor_file_type,
+                    remove_comments=editor_remove_comments,
+                )
+                answer = buffer.getvalue() or default or ""
+                rejected = buffer.rejected
+
+            elif multiline:
+                buffer = yield context.read(
+                    "read_multiline",
+                    prompt,
+                    answer_buffer(max_bytes=max_bytes, overflow=overflow),
+                )
+                answer = buffer.getvalue() or default or ""
+                rejected = buffer.rejected
+
+            else:
+                answer = (yield context.read("readline", prompt)) or default or ""
+
+            if rejected or check(answer) is _INVALID:
+                io.write("Invalid input." + fmt_prompt_end + "\n")
+                return _INVALID
+
+            io.write(fmt_prompt_end)
+
+            return answer
+
+        return attempt
 
     if open_editor:
-        print(prompt, end="")
-        answer = (
-            get_input_from_texteditor(
-                instruction=editor_instruction,
-                default=default,
-                file_type=editor_file_type,
-                remove_comments=editor_remove_comments,
-            )
-            or default
-            or ""
+        forward = dict(
+            blacklist=blacklist,
+            instruction=editor_instruction,
+            file_type=editor_file_type,
+            remove_comments=editor_remove_comments,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            fmt=template[:3],
         )
-
-    elif multiline:
-        print(prompt, end="")
-
-        answer = ""
-
-        try:
-            while True:
-                user_input = read_stdin_non_blocking()
-                if user_input is not None:
-                    answer += user_input
-        except EOFError:
-            pass
-        except KeyboardInterrupt:
-            pass
-
-        answer = answer or default or ""
-
     else:
-        answer = input(prompt) or default or ""
-
-    if blacklist and answer in blacklist:
-        print("Invalid input." + fmt_prompt_end)
-
-        answer = _string_base(
-            question=question,
-            default=default,
+        forward = dict(
             blacklist=blacklist,
-            open_editor=open_editor,
-            editor_instruction=editor_instruction,
-            fmt_question=fmt_question,
-            fmt_default=fmt_default,
-            fmt_prompt=fmt_prompt,
+            multiline=multiline,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            fmt=template[:3],
         )
-    else:
-        print(fmt_prompt_end, end="")
 
-    return answer
+    return _prompt(
+        "string_from_editor" if open_editor else "string",
+        question,
+        parse,
+        render,
+        forward,
+        default=default,
+        max_retries=max_retries,
+        on_exhausted=on_exhausted,
+        prompt_id=prompt_id,
+        io=io,
+        timeout=timeout,
+        on_timeout=on_timeout,
+        countdown=countdown,
+    )
 
 
 def string_from_editor(
@@ -186,7 +1811,18 @@ def string_from_editor(
     fmt_question=None,
     fmt_default=None,
     fmt_prompt=None,
-) -> str:
+    *,
+    max_bytes: Optional[int] = None,
+    overflow: str = "reject",
+    answer_buffer=AnswerBuffer,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+) -> Union[str, IO[str]]:
     """
     Prompt the user for a string in a new editor window.
 
@@ -196,22 +1832,41 @@ def string_from_editor(
     :param instruction: A commented text that appears in the editor window to give the user instructions
     :param file_type: Specify a file type for the editor window. This can be useful for syntax highligting etc.
     :param remove_comments: Lines starting with a `#` will be removed from the user's input text.
+    :param max_bytes: Limit the size of the answer in bytes.
+    :param overflow: What to do with answers bigger than 'max_bytes'. "reject" asks again, "spill" returns the answer as a temporary file object.
+    :param answer_buffer: A subclass of 'AnswerBuffer' that collects the answer.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. The editor itself is not stopped.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
     :param fmt_question: Define a template for displaying the question.
     :param fmt_default: Define a template for displaying the default value.
     :param fmt_prompt: Define a template for displaying the prompt line.
     """
-    return _string_base(
-        question=question,
-        default=default,
-        blacklist=blacklist,
-        open_editor=True,
-        editor_instruction=instruction,
-        editor_file_type=file_type,
-        editor_remove_comments=remove_comments,
-        fmt=fmt,
-        fmt_question=fmt_question,
-        fmt_default=fmt_default,
-        fmt_prompt=fmt_prompt,
+    return _run(
+        _string_base(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            open_editor=True,
+            editor_instruction=instruction,
+            editor_file_type=file_type,
+            editor_remove_comments=remove_comments,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
     )
 
 
@@ -224,7 +1879,18 @@ def string(
     fmt_question=None,
     fmt_default=None,
     fmt_prompt=None,
-) -> str:
+    *,
+    max_bytes: Optional[int] = None,
+    overflow: str = "reject",
+    answer_buffer=AnswerBuffer,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+) -> Union[str, IO[str]]:
     """
     Prompt the user for a string.
 
@@ -232,212 +1898,785 @@ def string(
     :param default: Define a default value.
     :param blacklist: Retry if user input is found in 'blacklist'.
     :param multiline: Allow multiline answers. Use ctrl+d or ctrl+c to send.
+    :param max_bytes: Limit the size of multiline answers in bytes.
+    :param overflow: What to do with multiline answers bigger than 'max_bytes'. "reject" asks again, "spill" returns the answer as a temporary file object.
+    :param answer_buffer: A subclass of 'AnswerBuffer' that collects multiline answers.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
+    :param fmt_question: Define a template for displaying the question.
+    :param fmt_default: Define a template for displaying the default value.
+    :param fmt_prompt: Define a template for displaying the prompt line.
+    """
+    return _run(
+        _string_base(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            open_editor=False,
+            multiline=multiline,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+def _parse_integer(answer: str, blacklist: Optional[List[int]]) -> Any:
+    if not answer:
+        return_val = None
+    else:
+        try:
+            return_val = int(answer)
+        except ValueError:
+            return _INVALID
+
+    if blacklist and return_val in blacklist:
+        return _INVALID
+
+    return return_val
+
+
+def _integer(
+    question: str,
+    default: Optional[str] = None,
+    blacklist: Optional[List[int]] = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    template: _Template = _DEFAULT_TEMPLATE,
+) -> _Flow:
+    def parse(answer):
+        return _parse_integer(answer, blacklist)
+
+    return _prompt(
+        "integer",
+        question,
+        parse,
+        _render_line(question, template),
+        dict(blacklist=blacklist, fmt=template[:3]),
+        default=default,
+        max_retries=max_retries,
+        on_exhausted=on_exhausted,
+        prompt_id=prompt_id,
+        io=io,
+        timeout=timeout,
+        on_timeout=on_timeout,
+        countdown=countdown,
+    )
+
+
+def integer(
+    question: str,
+    default: Optional[str] = None,
+    blacklist: Optional[List[int]] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+) -> Union[int, None]:
+    """
+    Prompt the user for an integer.
+
+    :param question: Question to ask.
+    :param default: Add default value.
+    :param blacklist: Retry if user input is found in 'blacklist'.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
+    :param fmt_question: Define a template for displaying the question.
+    :param fmt_default: Define a template for displaying the default value.
+    :param fmt_prompt: Define a template for displaying the prompt line.
+    """
+    return _run(
+        _integer(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+def _parse_confirm(answer: str) -> Any:
+    if answer and answer.lower() in ["y", "yes", "true", "1"]:
+        return True
+
+    elif answer and answer.lower() in ["n", "no", "false", "0"]:
+        return False
+
+    return _INVALID
+
+
+def _confirm(
+    question: str,
+    default: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    template: _Template = _DEFAULT_TEMPLATE,
+) -> _Flow:
+    return _prompt(
+        "confirm",
+        question,
+        _parse_confirm,
+        _render_line(question, template, show_invalid=False),
+        dict(fmt=template[:3]),
+        default=default,
+        max_retries=max_retries,
+        on_exhausted=on_exhausted,
+        prompt_id=prompt_id,
+        io=io,
+        timeout=timeout,
+        on_timeout=on_timeout,
+        countdown=countdown,
+    )
+
+
+def confirm(
+    question: str,
+    default: Optional[str] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+) -> bool:
+    """
+    Prompt the user to confirm with [y|yes] or [n|no].
+
+    :param question: Question to ask.
+    :param default: Add default value.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
     :param fmt_question: Define a template for displaying the question.
     :param fmt_default: Define a template for displaying the default value.
     :param fmt_prompt: Define a template for displaying the prompt line.
     """
-    return _string_base(
-        question=question,
+    return _run(
+        _confirm(
+            question=question,
+            default=default,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+def _parse_list_of_string(answer: str, blacklist: Optional[list]) -> Any:
+    return_val = [item.strip() for item in answer.split(",")]
+
+    if blacklist:
+        for item in return_val:
+            if item in blacklist:
+                return _INVALID
+
+    return return_val
+
+
+def _list_of_string(
+    question: str,
+    default: Optional[Union[list, str]] = None,
+    blacklist: Optional[list] = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    template: _Template = _DEFAULT_TEMPLATE,
+) -> _Flow:
+    if isinstance(default, (list, tuple)):
+        default = ", ".join(default)
+
+    def parse(answer):
+        return _parse_list_of_string(answer, blacklist)
+
+    return _prompt(
+        "list_of_string",
+        question,
+        parse,
+        _render_line(question, template),
+        dict(blacklist=blacklist, fmt=template[:3]),
         default=default,
-        blacklist=blacklist,
-        open_editor=False,
-        multiline=multiline,
-        fmt=fmt,
-        fmt_question=fmt_question,
-        fmt_default=fmt_default,
-        fmt_prompt=fmt_prompt,
+        max_retries=max_retries,
+        on_exhausted=on_exhausted,
+        prompt_id=prompt_id,
+        io=io,
+        timeout=timeout,
+        on_timeout=on_timeout,
+        countdown=countdown,
+    )
+
+
+def list_of_string(
+    question: str,
+    default: Optional[Union[list, str]] = None,
+    blacklist: Optional[list] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+) -> list:
+    """
+    Prompt the user for a list of strings. Values are seperated with commas.
+
+    :param question: Question to ask.
+    :param default: Add default value.
+    :param blacklist: Retry if user input is found in 'blacklist'.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
+    :param fmt_question: Define a template for displaying the question.
+    :param fmt_default: Define a template for displaying the default value.
+    :param fmt_prompt: Define a template for displaying the prompt line.
+    """
+    return _run(
+        _list_of_string(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+def _selected_key(selected: Tuple[Union[int, str], Any]) -> str:
+    return str(selected[0])
+
+
+def _default_key(default: Any) -> str:
+    # No answer and no default selects nothing, also not an option named "None".
+    return "" if default is None else str(default)
+
+
+# Answers that turn the page of a paged 'select'.
+PAGE_NEXT = ">"
+PAGE_PREVIOUS = "<"
+
+# Answer of 'select' that sorts a 'Table', followed by a column number or title.
+SORT = "^"
+
+
+def _option_source(options: Any) -> Any:
+    """
+    Return 'options' if its options can be looked up by key, an 'OptionStream'
+    for an async iterable, otherwise a 'LazySequence' that reads the iterable
+    as far as it is used.
+    """
+    if isinstance(options, (list, tuple, dict)) or hasattr(options, "__getitem__"):
+        return options
+
+    if hasattr(options, "__aiter__"):
+        from prmt.options import OptionStream
+
+        return OptionStream(options)
+
+    from prmt.options import LazySequence
+
+    return LazySequence(options)
+
+
+def _paged(options: Any) -> bool:
+    """
+    Whether the options are shown a page at a time if no 'page_size' is set.
+    """
+    return hasattr(options, "wait") or not isinstance(
+        options, (list, tuple, dict, Mapping)
     )
 
 
-def integer(
-    question: str,
-    default: Optional[str] = None,
-    blacklist: Optional[List[int]] = None,
-    fmt=["\n{}\n", "[{}]", "> {}\n"],
-    fmt_question=None,
-    fmt_default=None,
-    fmt_prompt=None,
-) -> Union[int, None]:
-    """
-    Prompt the user for an integer.
+def _streaming(options: Any) -> bool:
+    """
+    Whether options still arrive, from an 'OptionStream'.
+    """
+    return hasattr(options, "wait") and not options.complete
+
+
+def _stop(options: Any) -> None:
+    """
+    Stop an 'OptionStream' when its prompt ends.
+    """
+    cancel = getattr(options, "cancel", None)
+
+    if cancel is not None:
+        cancel()
+
+
+def _page_size(io: PromptIO) -> int:
+    """
+    The number of options that fit on the terminal with the question and prompt.
+    """
+    return max(io.terminal.size()[1] - 6, 5)
+
+
+class _Pages:
+    """
+    Render the options of a 'select', all at once or a page at a time.
+    Options are only converted to text when their page is rendered.
+    """
+
+    def __init__(self, options: Any, page_size: Optional[int]):
+        self.options = options
+        self.page_size = page_size
+        self.page = 0
+        self._headers: Dict[int, str] = {}
+
+        # An 'OptionSet' keeps its rendered options, a 'Table' has titles.
+        self._option_lines = None
+        self._header_line = None
+        if not isinstance(options, (list, tuple, dict)):
+            self._option_lines = getattr(options, "option_lines", None)
+            self._header_line = getattr(options, "header_line", None)
+
+    def _items(self, start: int, stop: Optional[int]) -> List[Tuple[Any, Any]]:
+        options = self.options
+
+        if isinstance(options, (list, tuple)):
+            return list(enumerate(options[start:stop], start))
+
+        if isinstance(options, (dict, Mapping)):
+            import itertools
+
+            return list(itertools.islice(options.items(), start, stop))
+
+        items = []
+
+        for key in range(start, stop):
+            try:
+                items.append((key, options[key]))
+            except IndexError:
+                break
+
+        return items
+
+    def _pages(self) -> Any:
+        # A 'LazySequence' only knows its length once it read all items.
+        if not getattr(self.options, "complete", True):
+            return "?"
+
+        return max(-(-len(self.options) // self.page_size), 1)
+
+    def header(self, template: _SelectTemplate, question: str) -> str:
+        """
+        Render the question and the options of the current page. Rendered pages
+        are kept, they are shown again for each retry and when the user returns.
+        """
+        header = self._headers.get(self.page)
+
+        if header is not None:
+            return header
+
+        _, rows = self.rows(template)
+        lines = [template.question.format(question)]
+
+        title = self.title(template)
+        if title is not None:
+            lines.append(title)
+
+        lines.extend(rows)
+
+        if self.page_size is not None:
+            lines.append(self.page_line(template))
 
-    :param question: Question to ask.
-    :param default: Add default value.
-    :param blacklist: Retry if user input is found in 'blacklist'.
-    :param fmt_question: Define a template for displaying the question.
-    :param fmt_default: Define a template for displaying the default value.
-    :param fmt_prompt: Define a template for displaying the prompt line.
-    """
-    fmt = fmt or [None, None, None]
-    fmt_question = fmt_question or fmt[0] or "\n{}\n"
-    fmt_default = fmt_default or fmt[1] or "[{}]"
-    fmt_prompt = fmt_prompt or fmt[2] or "> {}\n"
-    fmt_prompt_start = fmt_prompt.split("{}")[0]
-    fmt_prompt_end = fmt_prompt.split("{}")[1]
+        lines.append("")
 
-    if default:
-        prompt = (
-            fmt_question.format(question)
-            + fmt_default.format(default)
-            + fmt_prompt_start
-        )
-    else:
-        prompt = fmt_question.format(question) + fmt_prompt_start
+        header = "\n".join(lines)
 
-    answer: str = input(prompt) or default or ""
+        # The page of a stream changes while options arrive.
+        if not _streaming(self.options):
+            self._headers[self.page] = header
 
-    print(fmt_prompt_end, end="")
+        return header
 
-    retry = False
-    return_val: Union[int, None] = None
+    def rows(self, template: _SelectTemplate) -> Tuple[Sequence[int], List[str]]:
+        """
+        Return the positions of the options of the current page and the
+        rendered options. A sorted 'Table' shows its rows in its order.
+        """
+        size = self.page_size
+        start = 0 if size is None else self.page * size
+        stop = None if size is None else start + size
+
+        if self._option_lines is not None:
+            rows = self._option_lines(template.option)[start:stop]
+            order = getattr(self.options, "order", None)
+            if order is not None:
+                return order[start:stop], rows
+        else:
+            rows = [
+                template.option.format(key, str(option))
+                for key, option in self._items(start, stop)
+            ]
 
-    if answer:
-        try:
-            return_val = int(answer)
-        except ValueError:
-            retry = True
-    else:
-        return_val = None
+        return range(start, start + len(rows)), rows
 
-    if not retry and blacklist:
-        if return_val in blacklist:
-            retry = True
+    def title(self, template: _SelectTemplate) -> Optional[str]:
+        """
+        The titles of the columns of a 'Table', or None.
+        """
+        if self._header_line is None:
+            return None
 
-    if retry:
-        print("Invalid input." + fmt_prompt_end)
+        return self._header_line(template.option)
 
-        return_val = integer(
-            question=question,
-            default=default,
-            blacklist=blacklist,
-            fmt=fmt,
-            fmt_question=fmt_question,
-            fmt_default=fmt_default,
-            fmt_prompt=fmt_prompt,
+    def page_line(self, template: _SelectTemplate) -> str:
+        return template.page.format(
+            self.page + 1, self._pages(), PAGE_NEXT, PAGE_PREVIOUS
         )
 
-    return return_val
+    def turn(self, answer: str) -> bool:
+        """
+        Turn the page if 'answer' is a page command, or sort a 'Table' if it is a
+        sort command. Return False if it is neither. A key of the options that
+        looks like a command selects its option.
+        """
+        if answer.startswith(SORT) and hasattr(self.options, "sort"):
+            return self._sort(answer[len(SORT) :])
 
+        if self.page_size is None or answer not in (PAGE_NEXT, PAGE_PREVIOUS):
+            return False
 
-def confirm(
-    question: str,
-    default: Optional[str] = None,
-    fmt=["\n{}\n", "[{}]", "> {}\n"],
-    fmt_question=None,
-    fmt_default=None,
-    fmt_prompt=None,
-) -> bool:
-    """
-    Prompt the user to confirm with [y|yes] or [n|no].
+        if isinstance(self.options, (dict, Mapping)) and answer in self.options:
+            return False
 
-    :param question: Question to ask.
-    :param default: Add default value.
-    :param fmt_question: Define a template for displaying the question.
-    :param fmt_default: Define a template for displaying the default value.
-    :param fmt_prompt: Define a template for displaying the prompt line.
-    """
-    fmt = fmt or [None, None, None]
-    fmt_question = fmt_question or fmt[0] or "\n{}\n"
-    fmt_default = fmt_default or fmt[1] or "[{}]"
-    fmt_prompt = fmt_prompt or fmt[2] or "> {}\n"
-    fmt_prompt_start = fmt_prompt.split("{}")[0]
-    fmt_prompt_end = fmt_prompt.split("{}")[1]
+        if answer == PAGE_PREVIOUS:
+            self.page = max(self.page - 1, 0)
+        else:
+            start = (self.page + 1) * self.page_size
+            if self._items(start, start + 1):
+                self.page += 1
 
-    if default:
-        prompt = (
-            fmt_question.format(question)
-            + fmt_default.format(default)
-            + fmt_prompt_start
-        )
-    else:
-        prompt = fmt_question.format(question) + fmt_prompt_start
+        return True
 
-    return_val = None
+    def _sort(self, column: str) -> bool:
+        if SORT + column in self.options:
+            return False
 
-    answer: str = input(prompt) or default or ""
+        try:
+            # Columns are numbered from 1 for the user.
+            self.options.sort(int(column) - 1 if column.isdigit() else column)
+        except KeyError:
+            return False
 
-    print(fmt_prompt_end, end="")
+        self.page = 0
+        self._headers.clear()
 
-    if answer and answer.lower() in ["y", "yes", "true", "1"]:
-        return_val = True
+        return True
 
-    elif answer and answer.lower() in ["n", "no", "false", "0"]:
-        return_val = False
 
-    else:
-        return_val = confirm(
-            question=question,
-            default=default,
-            fmt=fmt,
-            fmt_question=fmt_question,
-            fmt_default=fmt_default,
-            fmt_prompt=fmt_prompt,
-        )
+def _parse_select(
+    selected_key: str,
+    options: Union[dict, list, tuple],
+) -> Any:
+    if isinstance(options, dict):
+        return _parse_select_key(selected_key, options)
 
-    return return_val
+    if isinstance(options, (list, tuple)):
+        return _parse_select_index(selected_key, options)
 
+    if hasattr(options, "lookup"):
+        # An 'OptionSet' has its own index.
+        selected = options.lookup(selected_key)
+        return _INVALID if selected is None else selected
 
-def list_of_string(
+    if isinstance(options, Mapping):
+        return _parse_select_key(selected_key, options)
+
+    return _parse_select_index(selected_key, options)
+
+
+def _parse_select_index(selected_key: str, options: Any) -> Any:
+    try:
+        key = int(selected_key)
+        return key, options[key]
+    except (ValueError, IndexError):
+        pass
+
+    return _INVALID
+
+
+def _parse_select_key(selected_key: str, options: Mapping) -> Any:
+    try:
+        return selected_key, options[selected_key]
+    except KeyError:
+        try:
+            key = int(selected_key)
+            return key, options[key]
+        except ValueError:
+            pass
+        except KeyError:
+            pass
+
+    return _INVALID
+
+
+def _select(
     question: str,
-    default: Optional[Union[list, str]] = None,
-    blacklist: Optional[list] = None,
-    fmt=["\n{}\n", "[{}]", "> {}\n"],
-    fmt_question=None,
-    fmt_default=None,
-    fmt_prompt=None,
-) -> list:
+    options: Union[dict, list, tuple],
+    default: Optional[Union[str, int]] = None,
+    custom_key: Optional[Union[str, int]] = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    page_size: Optional[int] = None,
+    filter: bool = False,
+    arrow_keys: bool = False,
+    template: _SelectTemplate = _DEFAULT_SELECT_TEMPLATE,
+    live: bool = True,
+) -> _Flow:
     """
-    Prompt the user for a list of strings. Values are seperated with commas.
-
-    :param question: Question to ask.
-    :param default: Add default value.
-    :param blacklist: Retry if user input is found in 'blacklist'.
-    :param fmt_question: Define a template for displaying the question.
-    :param fmt_default: Define a template for displaying the default value.
-    :param fmt_prompt: Define a template for displaying the prompt line.
+    The flow of 'select'. Without 'live', the user can not filter or move
+    through the options with the arrow keys, they are read key by key.
     """
-    fmt = fmt or [None, None, None]
-    fmt_question = fmt_question or fmt[0] or "\n{}\n"
-    fmt_default = fmt_default or fmt[1] or "[{}]"
-    fmt_prompt = fmt_prompt or fmt[2] or "> {}\n"
-    fmt_prompt_end = fmt_prompt.split("{}")[1]
+    deadline = _deadline(timeout)
+    options = _option_source(options)
+
+    def parse(answer):
+        return _parse_select(answer, options)
+
+    def parse_arrived(answer, parse):
+        count = len(options)
+        selected = parse(answer)
+        while selected is _INVALID and _streaming(options):
+            # The option may not have arrived yet.
+            arrived = yield _Read(None, options.wait, (_time_left(deadline), count))
+            if not arrived:
+                break
+            count = len(options)
+            selected = parse(answer)
+        return selected
+
+    def custom(selected):
+        if custom_key and str(selected[0]) == str(custom_key):
+            text = yield from _string_base(
+                question=selected[1],
+                prompt_id=prompt_id and f"{prompt_id}.custom",
+                io=io,
+                timeout=_time_left(deadline),
+                # A timeout is handled by the select prompt.
+                on_timeout="raise",
+                countdown=countdown,
+                template=template.custom,
+            )
+            return selected[0], text
+        return selected
+
+    def preset(answer, parse):
+        selected = yield from parse_arrived(answer, parse)
+        _stop(options)
+        if selected is _INVALID:
+            return selected
+        return (yield from custom(selected))
+
+    def render(context):
+        nonlocal page_size
+
+        io = context.io
+        prompt = template.render(context.default) if io.renders else ""
+        fmt_prompt_end = template.prompt_end
+
+        # A stream is shown in a live mode on a terminal, to show options as
+        # they arrive.
+        filtering = filter and live and io.interactive
+        navigating = (arrow_keys or _streaming(options)) and live and io.interactive
+        navigating = navigating and not filtering
+
+        if filtering:
+            from prmt._filter import filter_select
+
+            page_size = page_size or _page_size(io)
+
+        elif navigating:
+            from prmt._live import navigate_select
+
+            page_size = page_size or _page_size(io)
+
+        elif page_size is None and _paged(options):
+            page_size = _page_size(io)
+
+        pages = _Pages(options, page_size)
+
+        if io.renders and not (filtering or navigating):
+            pages.header(template, question)
+
+        def choose():
+            if navigating:
+                return navigate_select(
+                    io,
+                    question,
+                    options,
+                    template,
+                    prompt,
+                    page_size,
+                    context.parse,
+                    context.default,
+                    deadline,
+                )
+
+            selected = filter_select(
+                io,
+                question,
+                options,
+                template,
+                prompt,
+                page_size,
+                context.default is not None,
+                deadline,
+            )
+            return context.parse("") if selected is None else selected
 
-    if isinstance(default, (list, tuple)):
-        default = ", ".join(default)
+        def attempt():
+            # Let User Choose Option
 
-    answer = string(
-        question=question,
-        default=default,
-        blacklist=None,
-        fmt=fmt,
-        fmt_question=fmt_question,
-        fmt_default=fmt_default,
-        fmt_prompt=fmt_prompt,
-    )
+            if filtering or navigating:
+                selected = choose()
+                if selected is not _INVALID:
+                    selected = yield from custom(selected)
+                io.write(fmt_prompt_end)
+                return selected
 
-    retry = False
+            while True:
+                if io.renders:
+                    io.write(pages.header(template, question))
 
-    return_val = [item.strip() for item in answer.split(",")]
+                answer = yield context.read("readline", prompt)
 
-    if blacklist:
-        for item in return_val:
-            if item in blacklist:
-                retry = True
+                if not pages.turn(answer):
+                    break
 
-    if retry:
-        print("Invalid input." + fmt_prompt_end)
+                io.write(fmt_prompt_end)
 
-        return_val = list_of_string(
-            question=question,
-            default=default,
-            blacklist=blacklist,
-            fmt=fmt,
-            fmt_question=fmt_question,
-            fmt_default=fmt_default,
-            fmt_prompt=fmt_prompt,
-        )
+            selected = yield from parse_arrived(answer, context.parse)
 
-    return return_val
+            if selected is not _INVALID:
+                selected = yield from custom(selected)
+
+            io.write(fmt_prompt_end)
+
+            return selected
+
+        return attempt
+
+    def fallback(context):
+        return parse_arrived("", context.parse)
+
+    try:
+        return (
+            yield from _prompt(
+                "select",
+                question,
+                parse,
+                render,
+                dict(
+                    options=options,
+                    custom_key=custom_key,
+                    page_size=page_size,
+                    filter=filter,
+                    arrow_keys=arrow_keys,
+                    fmt=template[:5],
+                    fmt_custom=template.custom[:3],
+                    fmt_page=template.page,
+                ),
+                default=default,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io,
+                timeout=timeout,
+                on_timeout=on_timeout,
+                countdown=countdown,
+                deadline=deadline,
+                preset=preset,
+                fallback=fallback,
+                remember=_selected_key,
+                # An option of a stream may not have arrived yet.
+                check_cached=not _streaming(options),
+            )
+        )
+    finally:
+        _stop(options)
 
 
 def select(
@@ -455,14 +2694,36 @@ def select(
     fmt_custom_question=None,
     fmt_custom_default=None,
     fmt_custom_propmt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    page_size: Optional[int] = None,
+    filter: bool = False,
+    arrow_keys: bool = False,
+    fmt_page=None,
 ) -> Tuple[Union[int, str], Any]:
     """
     Prompt the user to select an option from a list of options.
 
     :param question: Question to ask.
-    :param options: The options which the user can choose from.
+    :param options: The options which the user can choose from. A dict, list or tuple, an 'OptionSet', a 'Table' (the user sorts it with SORT and a column, e.g. "^2"), a sequence like 'LineFile', or any iterable. An 'OptionStream' or an async iterable is shown while its options arrive.
     :param default: Add default value.
     :param custom_key: If the user selects this key, s/he can type in a custom value.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default option, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
+    :param page_size: Show this many options at a time. The user turns the page with PAGE_NEXT (">") and PAGE_PREVIOUS ("<"). Defaults to all options for dicts, lists and tuples, and to the terminal height for other sources.
+    :param filter: On an interactive terminal, let the user type to filter the options and pick a match with the arrow keys and enter. 'page_size' matches are shown, the terminal height by default. An 'OptionSet' keeps its search index for the next prompts.
+    :param arrow_keys: On an interactive terminal, let the user move through the options with the arrow keys, page up, page down, home and end and select one with enter. 'page_size' options are shown, the terminal height by default. An 'OptionStream' is always shown this way on a terminal, unless 'filter' is set.
     :param fmt_question: Define a template for displaying the question.
     :param fmt_option: Define a template for displaying the each option.
     :param fmt_options_end: Use this to display something behind the option list.
@@ -471,96 +2732,324 @@ def select(
     :param fmt_custom_question: Define a template for displaying the question of the custom string input.
     :param fmt_custom_default: Define a template for displaying the default value of the custom string input.
     :param fmt_custom_prompt: Define a template for displaying the prompt line of the custom string input.
+    :param fmt_page: Define a template for displaying the page line. It gets the page, the number of pages and the page commands.
+    """
+    return _run(
+        _select(
+            question=question,
+            options=options,
+            default=default,
+            custom_key=custom_key,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            page_size=page_size,
+            filter=filter,
+            arrow_keys=arrow_keys,
+            template=_select_template(
+                fmt,
+                fmt_question,
+                fmt_option,
+                fmt_options_end,
+                fmt_default,
+                fmt_prompt,
+                fmt_custom,
+                fmt_custom_question,
+                fmt_custom_default,
+                fmt_custom_propmt,
+                fmt_page,
+            ),
+        )
+    )
+
+
+# Answers of 'multi_select' that select all options, none or invert the
+# selection, and the marks in front of selected and other options.
+SELECT_ALL = "all"
+SELECT_NONE = "none"
+SELECT_INVERT = "invert"
+CHECKED = "[x]"
+UNCHECKED = "[ ]"
+
+
+def _new_selection(options: Any) -> "Selection":
+    """
+    An empty 'Selection' for the options of a 'multi_select'.
+    """
+    from prmt.options import Selection
+
+    if isinstance(options, (list, tuple)) or not isinstance(options, Mapping):
+        return Selection(options, len(options))
+
+    keys = list(options)
+    return Selection(options, len(keys), keys)
+
+
+def _parse_multi_select(
+    answer: str,
+    options: Any,
+    selection: "Selection",
+    positions: Callable[[], dict],
+) -> Any:
+    """
+    Apply the keys, ranges ("3-250") and commands in 'answer' to a copy of
+    'selection'. Keys and ranges toggle their options. Return the copy, or
+    '_INVALID' if a part of the answer is not valid.
     """
-    fmt = fmt or [None, None, None, None, None]
-    fmt_question = fmt_question or fmt[0] or "\n{}\n"
-    fmt_option = fmt_option or fmt[1] or "  {}: {}"
-    fmt_options_end = fmt_options_end or fmt[2] or "\n"
-    fmt_default = fmt_default or fmt[3] or "[{}]"
-    fmt_prompt = fmt_prompt or fmt[4] or "> {}\n"
-    fmt_prompt_start = fmt_prompt.split("{}")[0]
-    fmt_prompt_end = fmt_prompt.split("{}")[1]
 
-    fmt_custom = fmt_custom or [None, None, None]
-    fmt_custom_question = fmt_custom_question or fmt_custom[0] or "\n{}\n"
-    fmt_custom_default = fmt_custom_default or fmt_custom[1] or "[{}]"
-    fmt_custom_propmt = fmt_custom_propmt or fmt_custom[2] or "> {}\n"
+    def position(key: str) -> Optional[int]:
+        selected = _parse_select(key, options)
+
+        if selected is _INVALID:
+            return None
+
+        if selection._keys is None:
+            return selected[0] % selection.size
+
+        return positions().get(selected[0])
+
+    selection = selection.copy()
+
+    for part in answer.replace(",", " ").split():
+        command = part.casefold()
+
+        if command == SELECT_ALL:
+            selection.select_all()
+            continue
+
+        if command == SELECT_NONE:
+            selection.clear()
+            continue
+
+        if command == SELECT_INVERT:
+            selection.invert()
+            continue
+
+        start = position(part)
+
+        if start is not None:
+            selection.toggle(start)
+            continue
+
+        # A range. Keys may contain "-" themselves.
+        for i, char in enumerate(part):
+            if char == "-" and i:
+                start = position(part[:i])
+                stop = position(part[i + 1 :])
+                if start is not None and stop is not None:
+                    start, stop = sorted((start, stop))
+                    selection.toggle(start, stop + 1)
+                    break
+        else:
+            return _INVALID
+
+    return selection
+
+
+def _multi_select(
+    question: str,
+    options: Union[dict, list, tuple],
+    default: Optional[list] = None,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    page_size: Optional[int] = None,
+    template: _SelectTemplate = _DEFAULT_SELECT_TEMPLATE,
+) -> _Flow:
+    deadline = _deadline(timeout)
+    options = _option_source(options)
+
+    if _streaming(options):
+        # A 'Selection' has a bit for each option, it needs all of them. The
+        # wait is part of the timeout.
+        yield _Read(None, options.wait, (_time_left(deadline),))
+        _stop(options)
+
+    initial = _new_selection(options)
+    index: dict = {}
+
+    def positions() -> dict:
+        # Positions of the keys of a mapping, built on first use.
+        if not index:
+            index.update((key, p) for p, key in enumerate(initial._keys))
+        return index
 
     if default:
-        prompt = fmt_options_end + fmt_default.format(default) + fmt_prompt_start
-    else:
-        prompt = fmt_options_end + fmt_prompt_start
+        initial = _parse_multi_select(
+            " ".join(str(key) for key in default), options, initial, positions
+        )
+        if initial is _INVALID:
+            raise ValueError(f"Invalid default keys: {default!r}")
 
-    print(fmt_question.format(question))
+    # The selection so far. Answers are applied to it, it is kept when an
+    # answer is not valid.
+    current = initial
 
-    # Print Options
+    def parse(answer):
+        return _parse_multi_select(answer, options, current, positions)
 
-    if isinstance(options, (list, tuple)):
-        for key, option in enumerate(options):
-            print(fmt_option.format(key, str(option)))
+    def render(context):
+        io = context.io
+        size = page_size
 
-    elif isinstance(options, dict):
-        for key, option in options.items():
-            print("  {}: {}".format(key, str(option)))
+        if size is None and _paged(options):
+            size = _page_size(io)
 
-    # Let User Choose Option
+        pages = _Pages(options, size)
+        fmt_prompt_end = template.prompt_end
 
-    selected_key: Union[int, str] = input(prompt) or str(default)
+        def draw() -> Tuple[str, str]:
+            positions, rows = pages.rows(template)
+            lines = [template.question.format(question)]
 
-    # Validate Input
-    retry = True
-    selected_value = ""
+            title = pages.title(template)
+            if title is not None:
+                lines.append(" " * len(UNCHECKED) + title)
 
-    if isinstance(options, (list, tuple)):
-        try:
-            selected_key = int(selected_key)
-            selected_value = options[int(selected_key)]
-            retry = False
-        except (ValueError, IndexError):
-            pass
+            for position, row in zip(positions, rows):
+                lines.append(f"{CHECKED if position in current else UNCHECKED}{row}")
 
-    elif isinstance(options, dict):
-        try:
-            selected_value = options[selected_key]
-            retry = False
-        except KeyError:
-            try:
-                selected_key = int(selected_key)
-                selected_value = options[selected_key]
-                retry = False
-            except ValueError:
-                pass
-            except KeyError:
-                pass
+            if size is not None:
+                lines.append(pages.page_line(template))
 
-    if not retry and custom_key and str(selected_key) == str(custom_key):
-        selected_value = string(
-            selected_value,
-            fmt_question=fmt_custom_question,
-            fmt_default=fmt_custom_default,
-            fmt_prompt=fmt_custom_propmt,
+            lines.append("")
+
+            return "\n".join(lines), template.render(f"{len(current)} selected")
+
+        def attempt():
+            nonlocal current
+
+            while True:
+                prompt = ""
+
+                if io.renders:
+                    header, prompt = draw()
+                    io.write(header)
+
+                answer = yield context.read("readline", prompt)
+                io.write(fmt_prompt_end)
+
+                if not answer:
+                    return current
+
+                if pages.turn(answer):
+                    continue
+
+                selection = context.parse(answer)
+
+                if selection is _INVALID:
+                    return _INVALID
+
+                current = selection
+
+        return attempt
+
+    return (
+        yield from _prompt(
+            "multi_select",
+            question,
+            parse,
+            render,
+            dict(
+                options=options,
+                default=list(initial.keys()),
+                page_size=page_size,
+                fmt=template[:5],
+                fmt_page=template.page,
+            ),
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            deadline=deadline,
+            fallback=lambda context: _result(initial),
+            remember=None,
         )
+    )
+
+
+def multi_select(
+    question: str,
+    options: Union[dict, list, tuple],
+    default: Optional[list] = None,
+    fmt=["\n{}\n", "  {}: {}", "\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_option=None,
+    fmt_options_end=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    countdown: bool = False,
+    page_size: Optional[int] = None,
+    fmt_page=None,
+) -> "Selection":
+    """
+    Prompt the user to select any number of options. Each answer toggles the
+    options of its keys and ranges of keys (e.g. "1, 3-250"), SELECT_ALL
+    ("all"), SELECT_NONE ("none") and SELECT_INVERT ("invert") change all
+    options. An empty answer ends the prompt.
 
-    # If Input Invalid, recurse.
-    print(fmt_prompt_end, end="")
+    Returns a 'Selection'. Iterate it for the chosen (key, option) pairs.
 
-    if retry:
-        selected_key, selected_value = select(
+    :param question: Question to ask.
+    :param options: The options which the user can choose from. A dict, list or tuple, an 'OptionSet', a 'Table' (the user sorts it with SORT and a column, e.g. "^2"), a sequence like 'LineFile', or any iterable. An 'OptionStream' is read to its end first.
+    :param default: Keys of the options that are selected at the start.
+    :param max_retries: Stop asking again after this many invalid answers.
+    :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default selection, "none" returns None.
+    :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source.
+    :param io: A PromptIO to use instead of stdin/stdout; see PromptIO.
+    :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it.
+    :param on_timeout: What to do when 'timeout' passes. "default" returns the default selection, "raise" raises 'PromptTimeout'.
+    :param countdown: Show the seconds that are left above the prompt line.
+    :param page_size: Show this many options at a time. The user turns the page with PAGE_NEXT (">") and PAGE_PREVIOUS ("<"). Defaults to all options for dicts, lists and tuples, and to the terminal height for other sources.
+    :param fmt_question: Define a template for displaying the question.
+    :param fmt_option: Define a template for displaying the each option. It follows the CHECKED or UNCHECKED mark.
+    :param fmt_options_end: Use this to display something behind the option list.
+    :param fmt_default: Define a template for displaying the number of selected options.
+    :param fmt_prompt: Define a template for displaying the prompt line.
+    :param fmt_page: Define a template for displaying the page line. It gets the page, the number of pages and the page commands.
+    """
+    return _run(
+        _multi_select(
             question=question,
             options=options,
             default=default,
-            custom_key=custom_key,
-            fmt_question=fmt_question,
-            fmt_option=fmt_option,
-            fmt_options_end=fmt_options_end,
-            fmt_default=fmt_default,
-            fmt_prompt=fmt_prompt,
-            fmt_custom_question=fmt_custom_question,
-            fmt_custom_default=fmt_custom_default,
-            fmt_custom_propmt=fmt_custom_propmt,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            countdown=countdown,
+            page_size=page_size,
+            template=_select_template(
+                fmt,
+                fmt_question,
+                fmt_option,
+                fmt_options_end,
+                fmt_default,
+                fmt_prompt,
+                fmt_page=fmt_page,
+            ),
         )
-
-    return selected_key, selected_value
+    )
 
 
 class Prompt:
@@ -598,7 +3087,18 @@ class Prompt:
         fmt_select_custom_question=None,
         fmt_select_custom_default=None,
         fmt_select_custom_prompt=None,
+        fmt_select_page=None,
+        #
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: str = "default",
+        countdown: bool = False,
     ):
+        self.io = io
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.countdown = countdown
+
         self.fmt_question = fmt_question
         self.fmt_default = fmt_default
         self.fmt_prompt = fmt_prompt
@@ -623,14 +3123,55 @@ class Prompt:
         self.fmt_list_of_string_default = fmt_list_of_string_default
         self.fmt_list_of_string_prompt = fmt_list_of_string_prompt
 
-        self.fmt_select_question = (fmt_select_question,)
-        self.fmt_select_option = (fmt_select_option,)
-        self.fmt_select_options_end = (fmt_select_options_end,)
-        self.fmt_select_default = (fmt_select_default,)
-        self.fmt_select_prompt = (fmt_select_prompt,)
-        self.fmt_select_custom_question = (fmt_select_custom_question,)
+        self.fmt_select_question = fmt_select_question
+        self.fmt_select_option = fmt_select_option
+        self.fmt_select_options_end = fmt_select_options_end
+        self.fmt_select_default = fmt_select_default
+        self.fmt_select_prompt = fmt_select_prompt
+        self.fmt_select_custom_question = fmt_select_custom_question
         self.fmt_select_custom_default = fmt_select_custom_default
-        self.fmt_select_custom_prompt = (fmt_select_custom_prompt,)
+        self.fmt_select_custom_prompt = fmt_select_custom_prompt
+        self.fmt_select_page = fmt_select_page
+
+        # The templates are compiled once here, changing the attributes above
+        # later on has no effect.
+
+        self._string_from_editor_template = _template(
+            fmt_question=fmt_string_from_editor_question or fmt_question,
+            fmt_default=fmt_string_from_editor_default or fmt_default,
+            fmt_prompt=fmt_string_from_editor_prompt or fmt_prompt,
+        )
+        self._string_template = _template(
+            fmt_question=fmt_string_question or fmt_question,
+            fmt_default=fmt_string_default or fmt_default,
+            fmt_prompt=fmt_string_prompt or fmt_prompt,
+        )
+        self._integer_template = _template(
+            fmt_question=fmt_integer_question or fmt_question,
+            fmt_default=fmt_integer_default or fmt_default,
+            fmt_prompt=fmt_integer_prompt or fmt_prompt,
+        )
+        self._confirm_template = _template(
+            fmt_question=fmt_confirm_question or fmt_question,
+            fmt_default=fmt_confirm_default or fmt_default,
+            fmt_prompt=fmt_confirm_prompt or fmt_prompt,
+        )
+        self._list_of_string_template = _template(
+            fmt_question=fmt_list_of_string_question or fmt_question,
+            fmt_default=fmt_list_of_string_default or fmt_default,
+            fmt_prompt=fmt_list_of_string_prompt or fmt_prompt,
+        )
+        self._select_template = _select_template(
+            fmt_question=fmt_select_question or fmt_question,
+            fmt_option=fmt_select_option,
+            fmt_options_end=fmt_select_options_end,
+            fmt_default=fmt_select_default or fmt_default,
+            fmt_prompt=fmt_select_prompt or fmt_prompt,
+            fmt_custom_question=fmt_select_custom_question or fmt_question,
+            fmt_custom_default=fmt_select_custom_default or fmt_default,
+            fmt_custom_prompt=fmt_select_custom_prompt or fmt_prompt,
+            fmt_page=fmt_select_page,
+        )
 
     def string_from_editor(
         self,
@@ -644,7 +3185,18 @@ class Prompt:
         fmt_question=None,
         fmt_default=None,
         fmt_prompt=None,
-    ) -> str:
+        *,
+        max_bytes: Optional[int] = None,
+        overflow: str = "reject",
+        answer_buffer=AnswerBuffer,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
+    ) -> Union[str, IO[str]]:
         """
         Prompt the user for a string in a new editor window.
 
@@ -654,34 +3206,48 @@ class Prompt:
         :param instruction: A commented text that appears in the editor window to give the user instructions
         :param file_type: Specify a file type for the editor window. This can be useful for syntax highligting etc.
         :param remove_comments: Lines starting with a `#` will be removed from the user's input text.
+        :param max_bytes: Limit the size of the answer in bytes.
+        :param overflow: What to do with answers bigger than 'max_bytes'. "reject" asks again, "spill" returns the answer as a temporary file object.
+        :param answer_buffer: A subclass of 'AnswerBuffer' that collects the answer.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. The editor itself is not stopped. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_default: Define a template for displaying the default value.
         :param fmt_prompt: Define a template for displaying the prompt line.
         """
-        fmt_question = (
-            fmt_question
-            or fmt[0]
-            or self.fmt_string_from_editor_question
-            or self.fmt_question
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default
-            or fmt[1]
-            or self.fmt_string_from_editor_default
-            or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt
-            or fmt[2]
-            or self.fmt_string_from_editor_prompt
-            or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return string_from_editor(**args)
+        return _run(
+            _string_base(
+                question=question,
+                default=default,
+                blacklist=blacklist,
+                open_editor=True,
+                editor_instruction=instruction,
+                editor_file_type=file_type,
+                editor_remove_comments=remove_comments,
+                max_bytes=max_bytes,
+                overflow=overflow,
+                answer_buffer=answer_buffer,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                template=_template(
+                    fmt,
+                    fmt_question,
+                    fmt_default,
+                    fmt_prompt,
+                    base=self._string_from_editor_template,
+                ),
+            )
+        )
 
     def string(
         self,
@@ -692,32 +3258,65 @@ class Prompt:
         fmt_question=None,
         fmt_default=None,
         fmt_prompt=None,
-    ) -> str:
+        *,
+        multiline: bool = False,
+        max_bytes: Optional[int] = None,
+        overflow: str = "reject",
+        answer_buffer=AnswerBuffer,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
+    ) -> Union[str, IO[str]]:
         """
         Prompt the user for a string.
 
         :param question: Question to ask.
         :param default: Define a default value.
         :param blacklist: Retry if user input is found in 'blacklist'.
+        :param multiline: Allow multiline answers. Use ctrl+d or ctrl+c to send.
+        :param max_bytes: Limit the size of multiline answers in bytes.
+        :param overflow: What to do with multiline answers bigger than 'max_bytes'. "reject" asks again, "spill" returns the answer as a temporary file object.
+        :param answer_buffer: A subclass of 'AnswerBuffer' that collects multiline answers.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_default: Define a template for displaying the default value.
         :param fmt_prompt: Define a template for displaying the prompt line.
         """
-        fmt_question = (
-            fmt_question or fmt[0] or self.fmt_string_question or self.fmt_question
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default or fmt[1] or self.fmt_string_default or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt or fmt[2] or self.fmt_string_prompt or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return string(**args)
+        return _run(
+            _string_base(
+                question=question,
+                default=default,
+                blacklist=blacklist,
+                multiline=multiline,
+                max_bytes=max_bytes,
+                overflow=overflow,
+                answer_buffer=answer_buffer,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                template=_template(
+                    fmt,
+                    fmt_question,
+                    fmt_default,
+                    fmt_prompt,
+                    base=self._string_template,
+                ),
+            )
+        )
 
     def integer(
         self,
@@ -728,6 +3327,14 @@ class Prompt:
         fmt_question=None,
         fmt_default=None,
         fmt_prompt=None,
+        *,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
     ) -> Union[int, None]:
         """
         Prompt the user for an integer.
@@ -735,25 +3342,38 @@ class Prompt:
         :param question: Question to ask.
         :param default: Add default value.
         :param blacklist: Retry if user input is found in 'blacklist'.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_default: Define a template for displaying the default value.
         :param fmt_prompt: Define a template for displaying the prompt line.
         """
-        fmt_question = (
-            fmt_question or fmt[0] or self.fmt_integer_question or self.fmt_question
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default or fmt[1] or self.fmt_integer_default or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt or fmt[2] or self.fmt_integer_prompt or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return integer(**args)
+        return _run(
+            _integer(
+                question=question,
+                default=default,
+                blacklist=blacklist,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                template=_template(
+                    fmt,
+                    fmt_question,
+                    fmt_default,
+                    fmt_prompt,
+                    base=self._integer_template,
+                ),
+            )
+        )
 
     def confirm(
         self,
@@ -763,31 +3383,51 @@ class Prompt:
         fmt_question=None,
         fmt_default=None,
         fmt_prompt=None,
+        *,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
     ) -> bool:
         """
         Prompt the user to confirm with [y|yes] or [n|no].
 
         :param question: Question to ask.
         :param default: Add default value.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_default: Define a template for displaying the default value.
         :param fmt_prompt: Define a template for displaying the prompt line.
         """
-        fmt_question = (
-            fmt_question or fmt[0] or self.fmt_confirm_question or self.fmt_question
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default or fmt[1] or self.fmt_confirm_default or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt or fmt[2] or self.fmt_confirm_prompt or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return confirm(**args)
+        return _run(
+            _confirm(
+                question=question,
+                default=default,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                template=_template(
+                    fmt,
+                    fmt_question,
+                    fmt_default,
+                    fmt_prompt,
+                    base=self._confirm_template,
+                ),
+            )
+        )
 
     def list_of_string(
         self,
@@ -798,6 +3438,14 @@ class Prompt:
         fmt_question=None,
         fmt_default=None,
         fmt_prompt=None,
+        *,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
     ) -> list:
         """
         Prompt the user for a list of strings. Values are seperated with commas.
@@ -805,28 +3453,38 @@ class Prompt:
         :param question: Question to ask.
         :param default: Add default value.
         :param blacklist: Retry if user input is found in 'blacklist'.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_default: Define a template for displaying the default value.
         :param fmt_prompt: Define a template for displaying the prompt line.
         """
-        fmt_question = (
-            fmt_question
-            or fmt[0]
-            or self.fmt_list_of_string_question
-            or self.fmt_question
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default or fmt[1] or self.fmt_list_of_string_default or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt or fmt[2] or self.fmt_list_of_string_prompt or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return list_of_string(**args)
+        return _run(
+            _list_of_string(
+                question=question,
+                default=default,
+                blacklist=blacklist,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                template=_template(
+                    fmt,
+                    fmt_question,
+                    fmt_default,
+                    fmt_prompt,
+                    base=self._list_of_string_template,
+                ),
+            )
+        )
 
     def select(
         self,
@@ -844,14 +3502,36 @@ class Prompt:
         fmt_custom_question=None,
         fmt_custom_default=None,
         fmt_custom_prompt=None,
+        *,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
+        page_size: Optional[int] = None,
+        filter: bool = False,
+        arrow_keys: bool = False,
+        fmt_page=None,
     ) -> Tuple[Union[int, str], Any]:
         """
         Prompt the user to select an option from a list of options.
 
         :param question: Question to ask.
-        :param options: The options which the user can choose from.
+        :param options: The options which the user can choose from. A dict, list or tuple, an 'OptionSet', a 'Table' (the user sorts it with SORT and a column, e.g. "^2"), a sequence like 'LineFile', or any iterable. An 'OptionStream' or an async iterable is shown while its options arrive.
         :param default: Add default value.
         :param custom_key: If the user selects this key, s/he can type in a custom value.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default value, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source and the answer cache.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default value, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
+        :param page_size: Show this many options at a time. The user turns the page with PAGE_NEXT (">") and PAGE_PREVIOUS ("<"). Defaults to all options for dicts, lists and tuples, and to the terminal height for other sources.
+        :param filter: On an interactive terminal, let the user type to filter the options and pick a match with the arrow keys and enter. 'page_size' matches are shown, the terminal height by default. An 'OptionSet' keeps its search index for the next prompts.
+        :param arrow_keys: On an interactive terminal, let the user move through the options with the arrow keys, page up, page down, home and end and select one with enter. 'page_size' options are shown, the terminal height by default. An 'OptionStream' is always shown this way on a terminal, unless 'filter' is set.
         :param fmt_question: Define a template for displaying the question.
         :param fmt_option: Define a template for displaying the each option.
         :param fmt_options_end: Use this to display something behind the option list.
@@ -860,42 +3540,107 @@ class Prompt:
         :param fmt_custom_question: Define a template for displaying the question of the custom string input.
         :param fmt_custom_default: Define a template for displaying the default value of the custom string input.
         :param fmt_custom_prompt: Define a template for displaying the prompt line of the custom string input.
+        :param fmt_page: Define a template for displaying the page line. It gets the page, the number of pages and the page commands.
+        """
+        return _run(
+            _select(
+                question=question,
+                options=options,
+                default=default,
+                custom_key=custom_key,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                page_size=page_size,
+                filter=filter,
+                arrow_keys=arrow_keys,
+                template=_select_template(
+                    fmt,
+                    fmt_question,
+                    fmt_option,
+                    fmt_options_end,
+                    fmt_default,
+                    fmt_prompt,
+                    fmt_custom,
+                    fmt_custom_question,
+                    fmt_custom_default,
+                    fmt_custom_prompt,
+                    fmt_page,
+                    base=self._select_template,
+                ),
+            )
+        )
+
+    def multi_select(
+        self,
+        question: str,
+        options: Union[dict, list, tuple],
+        default: Optional[list] = None,
+        fmt=[None, None, None, None, None],
+        fmt_question=None,
+        fmt_option=None,
+        fmt_options_end=None,
+        fmt_default=None,
+        fmt_prompt=None,
+        *,
+        max_retries: Optional[int] = None,
+        on_exhausted: str = "raise",
+        prompt_id: Optional[str] = None,
+        io: Optional[PromptIO] = None,
+        timeout: Optional[float] = None,
+        on_timeout: Optional[str] = None,
+        countdown: Optional[bool] = None,
+        page_size: Optional[int] = None,
+        fmt_page=None,
+    ) -> "Selection":
+        """
+        Prompt the user to select any number of options. Uses the select
+        formats of this 'Prompt'.
+
+        :param question: Question to ask.
+        :param options: The options which the user can choose from. A dict, list or tuple, an 'OptionSet', a 'Table' (the user sorts it with SORT and a column, e.g. "^2"), a sequence like 'LineFile', or any iterable. An 'OptionStream' is read to its end first.
+        :param default: Keys of the options that are selected at the start.
+        :param max_retries: Stop asking again after this many invalid answers.
+        :param on_exhausted: What to do when 'max_retries' is exceeded. "raise" raises 'RetriesExhausted', "default" returns the default selection, "none" returns None.
+        :param prompt_id: A stable id for this prompt. Used to look up answers in the answers source.
+        :param io: A PromptIO to use instead of stdin/stdout; see PromptIO. Defaults to the io of the 'Prompt'.
+        :param timeout: Stop waiting for an answer after this many seconds. Retries do not extend it. Defaults to the timeout of the 'Prompt'.
+        :param on_timeout: What to do when 'timeout' passes. "default" returns the default selection, "raise" raises 'PromptTimeout'. Defaults to the setting of the 'Prompt'.
+        :param countdown: Show the seconds that are left above the prompt line. Defaults to the setting of the 'Prompt'.
+        :param page_size: Show this many options at a time. The user turns the page with PAGE_NEXT (">") and PAGE_PREVIOUS ("<"). Defaults to all options for dicts, lists and tuples, and to the terminal height for other sources.
+        :param fmt_question: Define a template for displaying the question.
+        :param fmt_option: Define a template for displaying the each option. It follows the CHECKED or UNCHECKED mark.
+        :param fmt_options_end: Use this to display something behind the option list.
+        :param fmt_default: Define a template for displaying the number of selected options.
+        :param fmt_prompt: Define a template for displaying the prompt line.
+        :param fmt_page: Define a template for displaying the page line. It gets the page, the number of pages and the page commands.
         """
-        fmt_question = (
-            fmt_question or fmt[0] or self.fmt_select_question or self.fmt_question
-        )  # yapf: disable
-        fmt_option = fmt_option or fmt[1] or self.fmt_select_option  # yapf: disable
-        fmt_options_end = (
-            fmt_options_end or fmt[2] or self.fmt_select_options_end
-        )  # yapf: disable
-        fmt_default = (
-            fmt_default or fmt[3] or self.fmt_select_default or self.fmt_default
-        )  # yapf: disable
-        fmt_prompt = (
-            fmt_prompt or fmt[4] or self.fmt_select_prompt or self.fmt_prompt
-        )  # yapf: disable
-
-        fmt_custom_question = (
-            fmt_custom_question
-            or fmt_custom[0]
-            or self.fmt_select_custom_question
-            or self.fmt_question
-        )  # yapf: disable
-        fmt_custom_default = (
-            fmt_custom_default
-            or fmt_custom[1]
-            or self.fmt_select_custom_default
-            or self.fmt_default
-        )  # yapf: disable
-        fmt_custom_prompt = (
-            fmt_custom_prompt
-            or fmt_custom[2]
-            or self.fmt_select_custom_prompt
-            or self.fmt_prompt
-        )  # yapf: disable
-
-        args = locals()
-        del args["self"]
-        del args["fmt"]
-
-        return select(**args)
+        return _run(
+            _multi_select(
+                question=question,
+                options=options,
+                default=default,
+                max_retries=max_retries,
+                on_exhausted=on_exhausted,
+                prompt_id=prompt_id,
+                io=io or self.io,
+                timeout=self.timeout if timeout is None else timeout,
+                on_timeout=on_timeout or self.on_timeout,
+                countdown=self.countdown if countdown is None else countdown,
+                page_size=page_size,
+                template=_select_template(
+                    fmt,
+                    fmt_question,
+                    fmt_option,
+                    fmt_options_end,
+                    fmt_default,
+                    fmt_prompt,
+                    fmt_page=fmt_page,
+                    base=self._select_template,
+                ),
+            )
+        )
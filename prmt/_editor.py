@@ -0,0 +1,96 @@
+"""
+Read an answer from the user's text editor. Imported on first use, so scripts
+that never open an editor do not pay for 'subprocess' and 'tempfile'.
+"""
+from typing import List, Optional, Union, IO
+import os
+import subprocess as sp
+import tempfile
+
+from prmt import AnswerBuffer
+
+
+def _initial_text(instruction=None, default=None, remove_comments=True) -> str:
+    """
+    The text the editor starts with: the default value and the instructions.
+    """
+    if default:
+        q = f"{default}\n"
+    else:
+        q = "\n"
+
+    if instruction is None and remove_comments == True:
+        q += "# Lines starting with '#' will be ignored.\n"
+    elif isinstance(instruction, str):
+        for line in instruction.splitlines():
+            q += f"# {line}\n"
+
+    return q
+
+
+def _editor_command(path: str, file_type=None) -> List[str]:
+    editor = os.environ.get("EDITOR") or "vi"
+
+    if editor in ["vi", "vim"] and file_type:
+        return [editor, "-c", f"set filetype={file_type}", path]
+    else:
+        return [editor, path]
+
+
+def _read_answer(tmp_file: IO[str], q: str, buffer: AnswerBuffer) -> None:
+    """
+    Copy the edited text from 'tmp_file' into 'buffer', without the template
+    'q', wherever the user left it.
+    """
+    tmp_file.seek(0)
+
+    # The text is copied in chunks, so big answers are never held in memory
+    # twice. The end of a chunk that could be the start of the template is
+    # kept for the next one.
+    keep = len(q) - 1
+    rest = ""
+
+    for chunk in iter(lambda: tmp_file.read(65536), ""):
+        text = rest + chunk
+        start = 0
+        found = text.find(q)
+
+        while found != -1:
+            buffer.write(text[start:found])
+            start = found + len(q)
+            found = text.find(q, start)
+
+        end = max(start, len(text) - keep)
+        buffer.write(text[start:end])
+        rest = text[end:]
+
+    buffer.write(rest)
+
+
+def get_input_from_texteditor(
+    instruction=None,
+    default=None,
+    file_type=None,
+    remove_comments=True,
+    buffer: Optional[AnswerBuffer] = None,
+    echo: bool = True,
+) -> Union[str, IO[str]]:
+    q = _initial_text(instruction, default, remove_comments)
+
+    if buffer is None:
+        buffer = AnswerBuffer()
+
+    with tempfile.NamedTemporaryFile(suffix=file_type or "", mode="w+") as tmp_file:
+        tmp_file.write(q)
+        tmp_file.flush()
+
+        sp.run(_editor_command(tmp_file.name, file_type))
+
+        _read_answer(tmp_file, q, buffer)
+
+    user_input_clean = buffer.getvalue()
+
+    if echo and isinstance(user_input_clean, str):
+        print(user_input_clean)
+
+    return user_input_clean
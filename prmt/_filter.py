@@ -0,0 +1,135 @@
+"""
+The type-to-filter mode of 'select'. Imported on first use.
+
+Each key narrows the options through a 'FuzzyIndex'. The matches are shown
+in a 'LiveList', so only the rows that changed are drawn again.
+"""
+from typing import Any, List, Optional, Tuple
+
+from prmt import PromptIO, _SelectTemplate
+from prmt._live import (
+    KEYS_BACKSPACE,
+    KEYS_CLEAR,
+    KEYS_DOWN,
+    KEYS_ENTER,
+    KEYS_UP,
+    LOADING_STATUS,
+    STATUS_FMT,
+    LiveList,
+    Source,
+    option_line,
+    streaming,
+    title,
+    wake_fd,
+)
+from prmt._terminal import KEY_WAKE
+from prmt.options import FuzzyIndex
+
+
+def filter_select(
+    io: PromptIO,
+    question: str,
+    options: Any,
+    template: _SelectTemplate,
+    prompt: str,
+    rows: int,
+    has_default: bool = False,
+    deadline: Optional[float] = None,
+) -> Optional[Tuple[Any, Any]]:
+    """
+    Let the user type a filter and pick one of the matching options with the
+    arrow keys and enter. Return the (key, option) pair. Return None if the
+    user pressed enter without a filter and there is a default. Options of an
+    'OptionStream' are matched as they arrive.
+
+    :param rows: Height of the result window.
+    """
+    # All options are matched.
+    source = Source(options)
+    count = source.fetch()
+    index = fuzzy_index(options, source)
+
+    if not streaming(options):
+        rows = min(rows, count)
+    line = option_line(options, template.option)
+
+    live = LiveList(io, question, template, prompt, rows, title(options, template))
+
+    def frame(query: str, cursor: int) -> Tuple[List[int], List[str]]:
+        positions, matches = index.search(query, rows)
+        texts = [line(*source[p], p) for p in positions]
+        status = STATUS_FMT.format(matches, count)
+
+        if streaming(options):
+            status += LOADING_STATUS
+
+        return positions, live.lines(texts, cursor, status)
+
+    query = ""
+    cursor = 0
+    positions, lines = frame(query, cursor)
+
+    keys = io.read_keys(lambda: live.draw(lines), deadline, wake_fd(options))
+
+    for key in keys:
+        if key == KEY_WAKE:
+            # Match the options that arrived.
+            count = source.update()
+            index.extend(options.labels[len(index.texts) : count])
+            positions, lines = frame(query, cursor)
+            live.update(lines, query)
+            continue
+
+        if key in KEYS_ENTER:
+            if not query and has_default:
+                return None
+            if positions:
+                selected = source[positions[cursor]]
+                live.finish(str(selected[0]))
+                return selected
+            continue
+
+        if key == "\x03":
+            raise KeyboardInterrupt
+
+        if key == "\x04":
+            raise EOFError
+
+        if key in KEYS_UP:
+            cursor = max(cursor - 1, 0)
+        elif key in KEYS_DOWN:
+            cursor = max(min(cursor + 1, len(positions) - 1), 0)
+        elif key in KEYS_BACKSPACE:
+            query = query[:-1]
+            cursor = 0
+        elif key in KEYS_CLEAR:
+            query = ""
+            cursor = 0
+        elif key.isprintable():
+            query += key
+            cursor = 0
+        else:
+            continue
+
+        positions, lines = frame(query, cursor)
+        live.update(lines, query)
+
+    raise EOFError
+
+
+def fuzzy_index(options: Any, source: Source) -> FuzzyIndex:
+    """
+    The 'FuzzyIndex' of the option texts. An 'OptionSet', 'LineFile' or
+    'LazySequence' keeps its own for the next prompts. Lists, tuples and
+    mappings may change between prompts, they are indexed for each prompt.
+    """
+    own = getattr(options, "fuzzy_index", None)
+
+    if own is not None:
+        return own()
+
+    if hasattr(options, "wait"):
+        # The labels of a stream may have grown since the options were counted.
+        return FuzzyIndex(options.labels[: source.count])
+
+    return FuzzyIndex([str(source[p][1]) for p in range(source.count)])
@@ -0,0 +1,383 @@
+"""
+Interactive 'select' modes that redraw the options while keys are typed.
+Imported on first use.
+
+The options are shown in a window of fixed height above the prompt line. It
+is written once and then updated in place: only the rows that changed are
+written again, with cursor movement escapes, in a single write per key.
+"""
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from prmt import PromptIO, _INVALID, _SelectTemplate
+from prmt._terminal import KEY_WAKE
+from prmt.options import _truncate
+
+KEYS_ENTER = ("\r", "\n")
+KEYS_UP = ("\x1b[A", "\x1bOA", "\x10")  # ctrl+p
+KEYS_DOWN = ("\x1b[B", "\x1bOB", "\x0e")  # ctrl+n
+KEYS_PAGE_UP = ("\x1b[5~",)
+KEYS_PAGE_DOWN = ("\x1b[6~",)
+KEYS_HOME = ("\x1b[H", "\x1bOH", "\x1b[1~")
+KEYS_END = ("\x1b[F", "\x1bOF", "\x1b[4~")
+KEYS_BACKSPACE = ("\x7f", "\b")
+KEYS_CLEAR = ("\x1b", "\x15")  # ctrl+u
+KEYS_SORT = ("\t",)
+
+# The line below the options. It gets a position or the number of matches,
+# and the number of options.
+STATUS_FMT = "  {} of {}"
+
+# Added to the status line of a sorted 'Table'. It gets the column title or
+# number, and SORT_ASCENDING or SORT_DESCENDING.
+SORTED_FMT = ", sorted by {} {}"
+SORT_ASCENDING = "\u2191"
+SORT_DESCENDING = "\u2193"
+
+# Added to the status line while options of an 'OptionStream' arrive.
+LOADING_STATUS = ", loading\u2026"
+
+# The highlighted row is shown in reverse video.
+HIGHLIGHT_FMT = "\x1b[7m{}\x1b[0m"
+
+
+class Source:
+    """
+    The (key, option) pairs of the options by position. The options of a
+    'LineFile' or an unfinished 'LazySequence' are counted as far as they are
+    read, and they are only read as far as they are shown.
+    """
+
+    def __init__(self, options: Any):
+        self.options = options
+        # Looks up the pair at a position, for an 'OptionSet' or 'OptionStream'.
+        self._item: Optional[Callable[[int], Tuple[Any, Any]]] = getattr(
+            options, "_item", None
+        )
+        # The keys by position, or None if the positions are the keys.
+        self._keys: Optional[Sequence[Any]] = None
+
+        if self._item is not None:
+            self._keys = getattr(options, "_keys", None)
+        elif isinstance(options, Mapping):
+            self._keys = list(options)
+
+        self.count = 0
+        self.complete = False
+        self.update()
+
+    def update(self) -> int:
+        """
+        Count the options that arrived, of an 'OptionStream'. Return the
+        number of options that are known.
+        """
+        options = self.options
+
+        if isinstance(options, (list, tuple, Mapping)) or getattr(
+            options, "complete", False
+        ):
+            self.count = len(options)
+            self.complete = True
+
+        return self.count
+
+    def fetch(self, stop: Optional[int] = None) -> int:
+        """
+        Read the options until 'stop' of them are known, or all of them.
+        Return the number of options that are known.
+        """
+        if stop is None and not self.complete:
+            self.count = len(self.options)
+            self.complete = True
+
+        while not self.complete and self.count < stop:
+            try:
+                self.options[self.count]
+            except IndexError:
+                self.complete = True
+            else:
+                self.count += 1
+
+        return self.count
+
+    def position(self, key: Any) -> Optional[int]:
+        """
+        The position of the option with 'key', or None.
+        """
+        if self._keys is None:
+            return key if isinstance(key, int) and key >= 0 else None
+
+        try:
+            return self._keys.index(key)
+        except ValueError:
+            return None
+
+    def __getitem__(self, position: int) -> Tuple[Any, Any]:
+        if self._item is not None:
+            return self._item(position)
+
+        if self._keys is not None:
+            key = self._keys[position]
+            return key, self.options[key]
+
+        return position, self.options[position]
+
+
+def option_line(options: Any, fmt_option: str) -> Callable[[Any, Any, int], str]:
+    """
+    A function that renders the option at a position from its key and option.
+    A 'Table' renders its rows with aligned columns.
+    """
+    table_line = getattr(options, "option_line", None)
+
+    if table_line is not None:
+        return lambda key, option, position: table_line(fmt_option, position)
+
+    return lambda key, option, position: fmt_option.format(key, str(option))
+
+
+def title(options: Any, template: _SelectTemplate) -> Optional[str]:
+    """
+    The titles of the columns of a 'Table', or None.
+    """
+    header_line = getattr(options, "header_line", None)
+
+    return None if header_line is None else header_line(template.option)
+
+
+def streaming(options: Any) -> bool:
+    """
+    Whether options of an 'OptionStream' still arrive.
+    """
+    return hasattr(options, "wait") and not options.complete
+
+
+def wake_fd(options: Any) -> Optional[int]:
+    """
+    The file descriptor that wakes up 'read_keys' when options arrive.
+    """
+    return options.fileno() if streaming(options) else None
+
+
+def sorted_status(options: Any) -> str:
+    """
+    The addition to the status line for the column a 'Table' is sorted by.
+    """
+    sorted_by = getattr(options, "sorted_by", None)
+
+    if sorted_by is None:
+        return ""
+
+    column, descending = sorted_by
+    titles = options.columns or ()
+    name = titles[column] if column < len(titles) else column + 1
+
+    return SORTED_FMT.format(name, SORT_DESCENDING if descending else SORT_ASCENDING)
+
+
+class LiveList:
+    """
+    The question, a window of 'rows' rows and a status line above the prompt
+    line. The cursor stays at the end of the prompt line.
+    """
+
+    def __init__(
+        self,
+        io: PromptIO,
+        question: str,
+        template: _SelectTemplate,
+        prompt: str,
+        rows: int,
+        title: Optional[str] = None,
+    ):
+        self.io = io
+        self.question = template.question.format(question)
+        self.title = title
+        self.prompt = prompt
+        self.prompt_line = prompt[prompt.rfind("\n") + 1 :]
+        self.rows = rows
+        # Lines from the first row to the prompt line.
+        self.height = rows + 1 + prompt.count("\n")
+        self.shown: List[str] = []
+
+    def lines(self, texts: List[str], highlight: int, status: str) -> List[str]:
+        """
+        The lines of the window for the texts of the visible options.
+        """
+        # A row that wraps would move the rows below it. Wide characters
+        # take two columns.
+        width = self.io.terminal.size()[0] - 1
+        lines = [_truncate(text, width) for text in texts]
+
+        if 0 <= highlight < len(lines):
+            lines[highlight] = HIGHLIGHT_FMT.format(lines[highlight])
+
+        lines.extend([""] * (self.rows - len(lines)))
+        lines.append(status)
+
+        return lines
+
+    def draw(self, lines: List[str]) -> None:
+        """
+        Write the whole frame.
+        """
+        self.shown = lines
+        header = [self.question] if self.title is None else [self.question, self.title]
+        self.io.write("\n".join(header + lines + [""]) + self.prompt, flush=True)
+
+    def update(self, lines: List[str], text: str) -> None:
+        """
+        Rewrite the rows that changed and the prompt line with 'text'.
+        """
+        out = ["\x1b7"]
+
+        for row, (old, new) in enumerate(zip(self.shown, lines)):
+            if old != new:
+                out.append(f"\x1b8\x1b[{self.height - row}A\r{new}\x1b[K")
+
+        out.append(f"\x1b8\r{self.prompt_line}{text}\x1b[K")
+        self.io.write("".join(out), flush=True)
+        self.shown = lines
+
+    def finish(self, text: str) -> None:
+        """
+        Show 'text' on the prompt line, e.g. the selected key.
+        """
+        self.io.write(f"\r{self.prompt_line}{text}\x1b[K")
+
+
+def navigate_select(
+    io: PromptIO,
+    question: str,
+    options: Any,
+    template: _SelectTemplate,
+    prompt: str,
+    rows: int,
+    parse: Callable[[str], Any],
+    default: Any = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Let the user move the highlight with the arrow keys, page up, page down,
+    home and end, and select the highlighted option with enter. A key can be
+    typed instead, it is parsed with 'parse' on enter. Return the (key,
+    option) pair or '_INVALID'. Tab sorts a 'Table' by its next column, after
+    the last column its rows are shown in their own order again. Options of
+    an 'OptionStream' are added as they arrive.
+
+    :param rows: Height of the window.
+    :param default: The option that is highlighted first.
+    """
+    source = Source(options)
+    line = option_line(options, template.option)
+
+    # The positions of the options in the order they are shown, or None for
+    # their own order.
+    order = getattr(options, "order", None)
+
+    cursor = 0
+
+    if default is not None:
+        selected = parse(str(default))
+        if selected is not _INVALID:
+            position = source.position(selected[0])
+            if position is not None:
+                cursor = position if order is None else order.index(position)
+
+    count = source.fetch(cursor + rows)
+
+    if not streaming(options):
+        rows = max(min(rows, count), 1)
+
+    live = LiveList(io, question, template, prompt, rows, title(options, template))
+
+    cursor = max(min(cursor, count - 1), 0)
+    top = max(min(cursor - rows // 2, count - rows), 0)
+    typed = ""
+
+    def shown(index: int) -> int:
+        return index if order is None else order[index]
+
+    def frame() -> List[str]:
+        stop = min(top + rows, count)
+        texts = [line(*source[p], p) for p in map(shown, range(top, stop))]
+        total = count if source.complete else "?"
+        status = STATUS_FMT.format(cursor + 1 if count else 0, total)
+
+        if streaming(options):
+            status += LOADING_STATUS
+
+        return live.lines(texts, cursor - top, status + sorted_status(options))
+
+    keys = io.read_keys(lambda: live.draw(frame()), deadline, wake_fd(options))
+
+    for key in keys:
+        if key == KEY_WAKE:
+            # Show the options that arrived.
+            count = source.update()
+            live.update(frame(), typed)
+            continue
+
+        if key in KEYS_ENTER:
+            if typed:
+                selected = parse(typed)
+            elif count:
+                selected = source[shown(cursor)]
+            else:
+                continue
+            if selected is not _INVALID:
+                live.finish(str(selected[0]))
+            return selected
+
+        if key == "\x03":
+            raise KeyboardInterrupt
+
+        if key == "\x04":
+            raise EOFError
+
+        if key in KEYS_UP:
+            cursor -= 1
+        elif key in KEYS_DOWN:
+            cursor += 1
+        elif key in KEYS_PAGE_UP:
+            cursor -= rows
+            top -= rows
+        elif key in KEYS_PAGE_DOWN:
+            cursor += rows
+            top += rows
+        elif key in KEYS_HOME:
+            cursor = 0
+        elif key in KEYS_END:
+            cursor = source.fetch() - 1
+        elif key in KEYS_BACKSPACE:
+            typed = typed[:-1]
+        elif key in KEYS_CLEAR:
+            typed = ""
+        elif key in KEYS_SORT and order is not None and count:
+            # The highlight stays on the same option.
+            highlighted = shown(cursor)
+            options.sort(_next_column(options))
+            order = options.order
+            cursor = order.index(highlighted)
+        elif key.isprintable():
+            typed += key
+        else:
+            continue
+
+        # Read the options up to the end of the window, and keep the
+        # highlight in it.
+        count = source.fetch(max(cursor, top) + rows)
+        cursor = max(min(cursor, count - 1), 0)
+        top = max(min(top, cursor, count - rows), cursor - rows + 1, 0)
+
+        live.update(frame(), typed)
+
+    raise EOFError
+
+
+def _next_column(table: Any) -> Optional[int]:
+    if table.sorted_by is None:
+        return 0
+
+    column = table.sorted_by[0] + 1
+
+    return column if column < len(table.widths) else None
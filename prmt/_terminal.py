@@ -0,0 +1,537 @@
+"""
+Raw mode input from the terminal. Imported on first use, so scripts that only
+read line by line do not pay for 'termios', 'signal' and 'select'.
+"""
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from select import select as _wait_readable
+import codecs
+import contextlib
+import os
+import signal
+import sys
+import threading
+import time
+
+from prmt import AnswerBuffer
+
+# The platform is detected once, when this module is imported.
+WINDOWS = sys.platform == "win32"
+
+if WINDOWS:
+    import msvcrt
+else:
+    import termios
+
+
+def read_stdin_non_blocking_windows():
+    """
+    TODO: This is not tested...
+    """
+    if msvcrt.kbhit():
+        return msvcrt.getch().decode("utf-8")
+    else:
+        return None
+
+
+def read_stdin_non_blocking_unix():
+    fd = sys.stdin.fileno()
+    orig = termios.tcgetattr(fd)
+
+    new = termios.tcgetattr(fd)
+    new[3] = new[3] & ~termios.ICANON
+    new[6][termios.VMIN] = 1
+    new[6][termios.VTIME] = 0
+
+    try:
+        termios.tcsetattr(fd, termios.TCSAFLUSH, new)
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSAFLUSH, orig)
+
+
+def read_stdin_non_blocking():
+    if WINDOWS:
+        return read_stdin_non_blocking_windows()
+    else:
+        return read_stdin_non_blocking_unix()
+
+
+def _seconds_left(deadline: float) -> int:
+    left = deadline - time.monotonic()
+    return int(left) + (left % 1 > 0)
+
+
+def wait_readable(
+    fd: int,
+    deadline: float,
+    on_tick: Optional[Callable[[int], None]] = None,
+) -> bool:
+    """
+    Wait until 'fd' has input or 'deadline' (a 'time.monotonic()' value)
+    passes. Return False if the deadline passed.
+
+    'on_tick' is called with the whole seconds that are left, first right away
+    and then each time the number changes, e.g. to show a countdown.
+
+    On Windows only the console is waited on. Other input is reported as ready.
+    """
+    shown = None
+
+    while True:
+        left = deadline - time.monotonic()
+
+        if left <= 0:
+            return False
+
+        wait = left
+
+        if on_tick is not None:
+            seconds = _seconds_left(deadline)
+            # Wake up when the next whole second starts.
+            wait = left - (seconds - 1)
+            if seconds != shown:
+                on_tick(seconds)
+                shown = seconds
+
+        if WINDOWS:
+            if not os.isatty(fd) or msvcrt.kbhit():
+                return True
+            time.sleep(min(wait, 0.05))
+        elif _wait_readable([fd], [], [], wait)[0]:
+            return True
+
+
+# Counts SIGWINCH signals. A terminal size that was read in an older generation
+# is read again.
+size_generation = 0
+
+
+def _on_resize(signum, frame):
+    global size_generation
+    size_generation += 1
+
+
+def watch_size() -> bool:
+    """
+    Count terminal resizes in 'size_generation', so terminal sizes can be
+    cached. The SIGWINCH handler is installed on the first call from the main
+    thread. Return False if resizes are not counted: on Windows, or if the
+    program handles SIGWINCH itself.
+    """
+    signum = getattr(signal, "SIGWINCH", None)
+
+    if signum is None:
+        return False
+
+    handler = signal.getsignal(signum)
+
+    if handler is _on_resize:
+        return True
+
+    if handler not in (signal.SIG_DFL, signal.SIG_IGN):
+        return False
+
+    if threading.current_thread() is not threading.main_thread():
+        return False
+
+    signal.signal(signum, _on_resize)
+    return True
+
+
+# Signals that terminate the process by default. While the terminal is in
+# non-canonical mode they are turned into exceptions, so the terminal settings
+# are restored before the process exits.
+_RESTORE_ON_SIGNALS = ("SIGTERM", "SIGHUP")
+
+
+def _raise_system_exit(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+@contextlib.contextmanager
+def _noncanonical_mode(fd: int, echo: bool = True):
+    """
+    Switch the terminal behind 'fd' to non-canonical mode for the duration of
+    the block and restore the original settings exactly once afterwards.
+    With 'echo' False, typed keys are not echoed.
+
+    TCSANOW is used in both directions so that input which was typed ahead is
+    kept in the input queue. NOFLSH keeps it there when a signal is sent.
+
+    ctrl+c does not send SIGINT but is read as "\\x03", in order with the
+    other input. A KeyboardInterrupt could otherwise arrive after a chunk was
+    read but before it was stored.
+    """
+    orig = termios.tcgetattr(fd)
+
+    new = termios.tcgetattr(fd)
+    new[3] = (new[3] & ~termios.ICANON) | termios.NOFLSH
+    if not echo:
+        new[3] &= ~termios.ECHO
+    new[6][termios.VMIN] = 1
+    new[6][termios.VTIME] = 0
+    new[6][termios.VINTR] = bytes([os.fpathconf(fd, "PC_VDISABLE")])
+
+    prev_handlers = {}
+
+    if threading.current_thread() is threading.main_thread():
+        for name in _RESTORE_ON_SIGNALS:
+            signum = getattr(signal, name, None)
+            if signum is not None and signal.getsignal(signum) == signal.SIG_DFL:
+                prev_handlers[signum] = signal.signal(signum, _raise_system_exit)
+
+    try:
+        termios.tcsetattr(fd, termios.TCSANOW, new)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSANOW, orig)
+        for signum, handler in prev_handlers.items():
+            signal.signal(signum, handler)
+
+
+def _find_end(data: Union[bytes, str]) -> int:
+    """
+    Return the position of the first ctrl+d or ctrl+c in 'data' or -1.
+    'data' is read bytes or decoded text.
+    """
+    eot, etx = (b"\x04", b"\x03") if isinstance(data, bytes) else ("\x04", "\x03")
+    end = data.find(eot)
+    interrupt = data.find(etx, 0, None if end == -1 else end)
+
+    return end if interrupt == -1 else interrupt
+
+
+def read_stdin_multiline_unix(
+    buffer: Optional[AnswerBuffer] = None,
+    chunk_size: int = 65536,
+    fd: Optional[int] = None,
+    on_ready: Optional[Callable[[], None]] = None,
+    deadline: Optional[float] = None,
+    on_tick: Optional[Callable[[int, int], None]] = None,
+    typed: str = "",
+    on_rest: Optional[Callable[[str], None]] = None,
+) -> AnswerBuffer:
+    """
+    Read from stdin into 'buffer' until the user sends ctrl+d or ctrl+c.
+
+    The terminal is put into non-canonical mode once for the whole answer and
+    stdin is read in chunks, so pasting large texts stays fast.
+    'typed' is text that was read from stdin before, it is used first. Input
+    that follows ctrl+d or ctrl+c within the same chunk is passed to
+    'on_rest', e.g. to keep it for the next prompt.
+    If stdin is not a terminal, it is read until its end.
+    Pass 'fd' to read from another file descriptor than stdin.
+    'on_ready' is called once the terminal is in non-canonical mode, e.g. to
+    show the prompt, so keys typed after it are never read in canonical mode.
+
+    If the answer is not complete at 'deadline' (a 'time.monotonic()' value),
+    raise TimeoutError. 'on_tick' is called with the whole seconds that are
+    left and the number of lines typed so far.
+    """
+    if fd is None:
+        fd = sys.stdin.fileno()
+
+    encoding = sys.stdin.encoding or "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    if buffer is None:
+        buffer = AnswerBuffer()
+
+    mode = _noncanonical_mode(fd) if os.isatty(fd) else contextlib.nullcontext()
+
+    lines = 0
+    rest = None
+
+    def tick(seconds: int) -> None:
+        on_tick(seconds, lines)
+
+    def read() -> bytes:
+        if deadline is not None and not wait_readable(
+            fd, deadline, None if on_tick is None else tick
+        ):
+            raise TimeoutError
+
+        return os.read(fd, chunk_size)
+
+    def write(data: bytes) -> bool:
+        """
+        Write 'data' to the buffer. Return False at the end of the answer.
+        """
+        nonlocal lines, rest
+
+        if not data:
+            return False
+
+        end = _find_end(data)
+
+        if end != -1:
+            lines += data.count(b"\n", 0, end)
+            buffer.write(decoder.decode(data[:end]))
+            rest = decoder.decode(data[end + 1 :])
+            return False
+
+        lines += data.count(b"\n")
+
+        buffer.write(decoder.decode(data))
+        return True
+
+    with mode:
+        try:
+            if on_ready is not None:
+                on_ready()
+
+            if not typed or write(typed.encode(encoding, "replace")):
+                while write(read()):
+                    pass
+        except KeyboardInterrupt:
+            # SIGINT sent from elsewhere ends the answer like ctrl+c. Keep what
+            # was typed before it, even if it was not read yet.
+            while _wait_readable([fd], [], [], 0)[0] and write(os.read(fd, chunk_size)):
+                pass
+
+    if rest is None:
+        buffer.write(decoder.decode(b"", final=True))
+    elif on_rest is not None:
+        on_rest(rest + decoder.decode(b"", final=True))
+
+    return buffer
+
+
+# The keys that end a multiline answer on the Windows console: ctrl+z, ctrl+d
+# and ctrl+c.
+_WINDOWS_END = ("\x1a", "\x04", "\x03")
+
+
+def read_stdin_multiline_windows(
+    buffer: Optional[AnswerBuffer] = None,
+    deadline: Optional[float] = None,
+) -> AnswerBuffer:
+    """
+    Read from the console into 'buffer' with 'msvcrt' until the user sends
+    ctrl+z, ctrl+d or ctrl+c. Enter adds a newline. The typed text is echoed,
+    special keys like the arrow keys are dropped.
+
+    If the answer is not complete at 'deadline' (a 'time.monotonic()' value),
+    raise TimeoutError. The text typed so far stays in 'buffer'.
+    """
+    if buffer is None:
+        buffer = AnswerBuffer()
+
+    while True:
+        if deadline is not None and not wait_readable(0, deadline):
+            raise TimeoutError
+
+        char = msvcrt.getwch()
+
+        if char in _WINDOWS_END:
+            msvcrt.putwch("\r")
+            msvcrt.putwch("\n")
+            return buffer
+
+        if char in ("\x00", "\xe0"):
+            # The second half of a special key.
+            msvcrt.getwch()
+            continue
+
+        if char == "\r":
+            char = "\n"
+            msvcrt.putwch("\r")
+
+        msvcrt.putwch(char)
+        buffer.write(char)
+
+
+# Read instead of a key when the reader was woken up, see 'read_keys_unix'.
+KEY_WAKE = ""
+
+
+def split_keys(text: str) -> Tuple[List[str], str]:
+    """
+    Split typed text into keys. An escape sequence (e.g. "\\x1b[A" for the up
+    arrow) is one key. Return the keys and the rest of an escape sequence
+    that is not complete yet.
+    """
+    keys = []
+    i = 0
+    end = len(text)
+
+    while i < end:
+        char = text[i]
+
+        if char != "\x1b":
+            keys.append(char)
+            i += 1
+            continue
+
+        if i + 1 >= end:
+            break
+
+        if text[i + 1] not in "[O":
+            # Escape on its own, e.g. alt+key.
+            keys.append(char)
+            i += 1
+            continue
+
+        j = i + 2
+        while j < end and not ("@" <= text[j] <= "~"):
+            j += 1
+
+        if j >= end:
+            break
+
+        keys.append(text[i : j + 1])
+        i = j + 1
+
+    return keys, text[i:]
+
+
+def read_keys_unix(
+    fd: int,
+    on_ready: Optional[Callable[[], None]] = None,
+    deadline: Optional[float] = None,
+    wake_fd: Optional[int] = None,
+) -> Iterator[List[str]]:
+    """
+    Read keys from the terminal behind 'fd' in non-canonical mode, without
+    echo, and yield the keys of each read. An empty list is yielded once the
+    terminal is in non-canonical mode and 'on_ready' was called.
+
+    ctrl+c is read as "\\x03". Raise EOFError at the end of the input and
+    TimeoutError if no key arrives before 'deadline'.
+
+    If 'wake_fd' becomes readable, it is read empty and KEY_WAKE is yielded,
+    e.g. to show options that arrived.
+    """
+    decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")(
+        errors="replace"
+    )
+
+    with _noncanonical_mode(fd, echo=False):
+        if on_ready is not None:
+            on_ready()
+
+        yield []
+
+        rest = ""
+
+        while True:
+            if wake_fd is not None:
+                if not _wait_for_key(fd, wake_fd, deadline):
+                    _drain(wake_fd)
+                    yield [KEY_WAKE]
+                    continue
+            elif deadline is not None and not wait_readable(fd, deadline):
+                raise TimeoutError
+
+            data = os.read(fd, 1024)
+
+            if not data:
+                raise EOFError
+
+            keys, rest = split_keys(rest + decoder.decode(data))
+
+            # An escape key on its own is not followed by the rest of a sequence.
+            if rest == "\x1b" and not _wait_readable([fd], [], [], 0.05)[0]:
+                keys.append(rest)
+                rest = ""
+
+            yield keys
+
+
+def _wait_for_key(fd: int, wake_fd: int, deadline: Optional[float]) -> bool:
+    """
+    Wait until 'fd' or 'wake_fd' is readable. Return True for 'fd' and False
+    for 'wake_fd'. Raise TimeoutError if 'deadline' passes.
+    """
+    timeout = None
+
+    if deadline is not None:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise TimeoutError
+
+    ready = _wait_readable([fd, wake_fd], [], [], timeout)[0]
+
+    if not ready:
+        raise TimeoutError
+
+    return fd in ready
+
+
+def _drain(fd: int) -> None:
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+
+
+# The second character that Windows sends after "\xe0" for the arrow keys.
+_WINDOWS_ARROWS = {"H": "\x1b[A", "P": "\x1b[B", "M": "\x1b[C", "K": "\x1b[D"}
+
+
+def read_keys_windows(
+    on_ready: Optional[Callable[[], None]] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[List[str]]:
+    """
+    Like 'read_keys_unix', from the console with 'msvcrt'. The arrow keys are
+    translated to the escape sequences of a terminal, other special keys are
+    dropped. Options that arrive cannot wake up the reader.
+    """
+    if on_ready is not None:
+        on_ready()
+
+    yield []
+
+    while True:
+        if deadline is not None and not wait_readable(0, deadline):
+            raise TimeoutError
+
+        key = msvcrt.getwch()
+
+        if key in ("\x00", "\xe0"):
+            key = _WINDOWS_ARROWS.get(msvcrt.getwch(), "")
+
+        if key:
+            yield [key]
+
+
+def read_keys(
+    fd: int,
+    on_ready: Optional[Callable[[], None]] = None,
+    deadline: Optional[float] = None,
+    wake_fd: Optional[int] = None,
+) -> Iterator[List[str]]:
+    if WINDOWS:
+        return read_keys_windows(on_ready, deadline)
+    else:
+        return read_keys_unix(fd, on_ready, deadline, wake_fd)
+
+
+def read_stdin_multiline(
+    buffer: Optional[AnswerBuffer] = None,
+    fd: Optional[int] = None,
+    on_ready: Optional[Callable[[], None]] = None,
+    deadline: Optional[float] = None,
+    on_tick: Optional[Callable[[int, int], None]] = None,
+    typed: str = "",
+    on_rest: Optional[Callable[[str], None]] = None,
+) -> AnswerBuffer:
+    if WINDOWS:
+        if on_ready is not None:
+            on_ready()
+        if typed:
+            buffer = buffer or AnswerBuffer()
+            buffer.write(typed)
+        return read_stdin_multiline_windows(buffer, deadline=deadline)
+    else:
+        return read_stdin_multiline_unix(
+            buffer,
+            fd=fd,
+            on_ready=on_ready,
+            deadline=deadline,
+            on_tick=on_tick,
+            typed=typed,
+            on_rest=on_rest,
+        )
@@ -0,0 +1,656 @@
+"""
+Prompts as coroutines, for programs that run an asyncio event loop.
+
+    answer = await prmt.aio.confirm("Deploy?")
+
+The prompts are the ones of 'prmt', only their reads are awaited. Answers are
+read with 'loop.add_reader', so other tasks keep running while a prompt waits
+for the user. Prompts can be cancelled, e.g. by 'asyncio.wait_for'. The editor
+runs in 'asyncio.create_subprocess_exec'. Other waits, like forwarding to a
+'PromptBroker', run in a thread.
+
+Input that was read from stdin but not used yet is kept for the next async
+prompt. Blocking prompts do not see it, so do not mix both on the same stdin.
+"""
+from typing import Any, Dict, IO, List, Optional, Tuple, Union
+import asyncio
+import codecs
+import functools
+import os
+import stat
+import time
+import weakref
+
+from prmt import (
+    AnswerBuffer,
+    MULTILINE_END,
+    PromptIO,
+    _DEFAULT_SELECT_TEMPLATE,
+    _DEFAULT_TEMPLATE,
+    _Flow,
+    _SelectTemplate,
+    _Template,
+    _TimedIO,
+    _confirm,
+    _integer,
+    _list_of_string,
+    _select,
+    _select_template,
+    _string_base,
+    _template,
+    _time_left,
+)
+from prmt._terminal import _find_end
+
+
+class _Reader:
+    """
+    Read text from a file descriptor without blocking the event loop.
+    """
+
+    def __init__(self, fd: int, encoding: str):
+        self.fd = fd
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        # The text that was read, the part before '_pos' was used.
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _read_chunk(self) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def ready():
+            if not future.done():
+                try:
+                    future.set_result(os.read(self.fd, 65536))
+                except OSError as e:
+                    future.set_exception(e)
+
+        try:
+            loop.add_reader(self.fd, ready)
+        except NotImplementedError:
+            # The loop cannot watch file descriptors (e.g. the proactor loop
+            # on Windows).
+            return await loop.run_in_executor(None, os.read, self.fd, 65536)
+
+        try:
+            return await future
+        finally:
+            loop.remove_reader(self.fd)
+
+    async def _fill(self) -> bool:
+        """
+        Read the next chunk. Return False at the end of the input.
+        """
+        if self._eof:
+            return False
+
+        data = await self._read_chunk()
+
+        # Only the text that was not used yet is kept.
+        self._text = self._text[self._pos :] + self._decoder.decode(
+            data, final=not data
+        )
+        self._pos = 0
+        self._eof = not data
+
+        return not self._eof
+
+    def _take(self, end: int) -> str:
+        text = self._text[self._pos : end]
+        self._pos = end
+        return text
+
+    async def readline(self) -> str:
+        """
+        Return the next line, including the newline. "" at the end of the input.
+        """
+        start = self._pos
+
+        while True:
+            end = self._text.find("\n", start)
+
+            if end != -1:
+                return self._take(end + 1)
+
+            # Only the new text is searched.
+            start = len(self._text) - self._pos
+
+            if not await self._fill():
+                return self._take(len(self._text))
+
+    async def read(self) -> str:
+        """
+        Return the text that is available, wait for more if there is none.
+        "" at the end of the input.
+        """
+        if self._pos == len(self._text):
+            await self._fill()
+
+        return self._take(len(self._text))
+
+    def unread(self, text: str) -> None:
+        self._text = text + self._text[self._pos :]
+        self._pos = 0
+
+
+# The reader of each input stream. It keeps the text that was read ahead.
+_readers: "weakref.WeakKeyDictionary[Any, _Reader]" = weakref.WeakKeyDictionary()
+
+
+def _reader(io: PromptIO) -> Optional[_Reader]:
+    """
+    Get the reader for the input of 'io'. Streams without a file descriptor
+    (e.g. in tests) and regular files never block, so they get None and are
+    read with 'io' itself.
+    """
+    stream = io._in()
+
+    try:
+        fd = stream.fileno()
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    try:
+        reader = _readers.get(stream)
+    except TypeError:
+        reader = None
+
+    if reader is None or reader.fd != fd:
+        reader = _Reader(fd, getattr(stream, "encoding", None) or "utf-8")
+        try:
+            _readers[stream] = reader
+        except TypeError:
+            pass
+
+    return reader
+
+
+async def _edit(
+    buffer: AnswerBuffer,
+    instruction=None,
+    default=None,
+    file_type=None,
+    remove_comments=True,
+) -> None:
+    import tempfile
+
+    from prmt._editor import _editor_command, _initial_text, _read_answer
+
+    q = _initial_text(instruction, default, remove_comments)
+
+    with tempfile.NamedTemporaryFile(suffix=file_type or "", mode="w+") as tmp_file:
+        tmp_file.write(q)
+        tmp_file.flush()
+
+        process = await asyncio.create_subprocess_exec(
+            *_editor_command(tmp_file.name, file_type)
+        )
+
+        try:
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+
+        _read_answer(tmp_file, q, buffer)
+
+
+class _AsyncIO:
+    """
+    Read the answers for a 'PromptIO' without blocking the event loop. The
+    reads take the same arguments as the reads of the 'PromptIO', the deadline
+    is awaited, a countdown is not shown.
+    """
+
+    def __init__(self, io: Any):
+        # The time spent reading is added to the recorder of a '_TimedIO'.
+        self.rec = io._recorder if isinstance(io, _TimedIO) else None
+        self.timed_io = io
+        self.io: PromptIO = io._io if self.rec is not None else io
+        self.renders = io.renders
+        self.reader = _reader(self.io)
+
+    async def readline(self, prompt: str, *timed) -> str:
+        if self.reader is None:
+            return self.timed_io.readline(prompt, *timed)
+
+        start = time.perf_counter_ns()
+
+        try:
+            if self.renders:
+                self.io.write(prompt, flush=True)
+
+            line = await _until(self.reader.readline(), timed)
+
+            if not line:
+                raise EOFError
+
+            return line[:-1] if line[-1] == "\n" else line
+        finally:
+            if self.rec is not None:
+                self.rec.wait_ns += time.perf_counter_ns() - start
+
+    async def read_multiline(
+        self, prompt: str, buffer: AnswerBuffer, *timed
+    ) -> AnswerBuffer:
+        if self.reader is None:
+            return self.timed_io.read_multiline(prompt, buffer, *timed)
+
+        start = time.perf_counter_ns()
+
+        try:
+            return await _until(self._read_multiline(prompt, buffer), timed)
+        finally:
+            if self.rec is not None:
+                self.rec.wait_ns += time.perf_counter_ns() - start
+
+    async def _read_multiline(self, prompt: str, buffer: AnswerBuffer) -> AnswerBuffer:
+        io = self.io
+        reader = self.reader
+        fd = io.terminal.fd
+
+        if io.interactive and fd is not None and os.isatty(fd):
+            from prmt._terminal import _noncanonical_mode
+
+            with _noncanonical_mode(fd):
+                io.write(prompt, flush=True)
+
+                while True:
+                    text = await reader.read()
+
+                    if not text:
+                        break
+
+                    end = _find_end(text)
+
+                    if end != -1:
+                        buffer.write(text[:end])
+                        reader.unread(text[end + 1 :])
+                        break
+
+                    buffer.write(text)
+
+            return buffer
+
+        if self.renders:
+            io.write(prompt, flush=True)
+
+        while True:
+            line = await reader.readline()
+
+            if io.interactive:
+                end = line.find("\x04")
+                if end != -1:
+                    buffer.write(line[:end])
+                    break
+            elif line == MULTILINE_END + "\n" or line == MULTILINE_END:
+                break
+
+            if not line:
+                break
+
+            buffer.write(line)
+
+        return buffer
+
+    async def read_editor(
+        self,
+        prompt: str,
+        buffer: AnswerBuffer,
+        *timed,
+        **editor_args,
+    ) -> AnswerBuffer:
+        io = self.io
+        rec = self.rec
+
+        if type(io).read_editor is not PromptIO.read_editor:
+            # E.g. 'prmt.testing.ScriptedIO' answers without an editor.
+            return self.timed_io.read_editor(prompt, buffer, *timed, **editor_args)
+
+        if not io.interactive:
+            return await self.read_multiline(prompt, buffer, *timed)
+
+        # As in 'PromptIO.read_editor', the deadline is not checked while the
+        # editor runs.
+        if timed and time.monotonic() >= timed[0]:
+            raise TimeoutError
+
+        start = time.perf_counter_ns()
+        io.write(prompt, flush=True)
+
+        if rec is not None:
+            rec.editor_spawn_ns = time.time_ns()
+
+        try:
+            await _edit(buffer, **editor_args)
+        finally:
+            if rec is not None:
+                rec.editor_exit_ns = time.time_ns()
+                rec.wait_ns += time.perf_counter_ns() - start
+
+        answer = buffer.getvalue()
+
+        if isinstance(answer, str):
+            io.write(answer + "\n")
+
+        return buffer
+
+
+async def _until(read: Any, timed: tuple) -> Any:
+    """
+    Await 'read' until the deadline in 'timed', if there is one.
+    """
+    if not timed:
+        return await read
+
+    try:
+        return await asyncio.wait_for(read, _time_left(timed[0]))
+    except asyncio.TimeoutError:
+        raise TimeoutError from None
+
+
+async def _run(flow: _Flow) -> Any:
+    """
+    Run a prompt flow of 'prmt' in the event loop, like 'prmt._run'. Reads of
+    a 'PromptIO' are awaited, other reads block in a thread. Errors, also
+    cancelling, are raised inside the flow.
+    """
+    loop = asyncio.get_running_loop()
+    ios: Dict[int, _AsyncIO] = {}
+    send = flow.send
+    result: Any = None
+
+    while True:
+        try:
+            read = send(result)
+        except StopIteration as stop:
+            return stop.value
+
+        kwargs = read.kwargs or {}
+
+        try:
+            if read.io is None:
+                result = await loop.run_in_executor(
+                    None, functools.partial(read.method, *read.args, **kwargs)
+                )
+            else:
+                # The io is kept in its '_AsyncIO', so its id is not reused.
+                aio = ios.get(id(read.io))
+                if aio is None:
+                    aio = ios[id(read.io)] = _AsyncIO(read.io)
+                result = await getattr(aio, read.method)(*read.args, **kwargs)
+            send = flow.send
+        except BaseException as e:
+            result = e
+            send = flow.throw
+
+
+async def string_from_editor(
+    question: str,
+    default: Optional[str] = None,
+    blacklist: Optional[list] = None,
+    instruction: Optional[str] = None,
+    file_type=None,
+    remove_comments=True,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_bytes: Optional[int] = None,
+    overflow: str = "reject",
+    answer_buffer=AnswerBuffer,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+) -> Union[str, IO[str]]:
+    """
+    Prompt the user for a string in a new editor window.
+    Takes the same arguments as 'prmt.string_from_editor', except 'countdown'.
+    """
+    return await _run(
+        _string_base(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            open_editor=True,
+            editor_instruction=instruction,
+            editor_file_type=file_type,
+            editor_remove_comments=remove_comments,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+async def string(
+    question: str,
+    default: Optional[str] = None,
+    blacklist: Optional[list] = None,
+    multiline: bool = False,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_bytes: Optional[int] = None,
+    overflow: str = "reject",
+    answer_buffer=AnswerBuffer,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+) -> Union[str, IO[str]]:
+    """
+    Prompt the user for a string.
+    Takes the same arguments as 'prmt.string', except 'countdown'.
+    """
+    return await _run(
+        _string_base(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            multiline=multiline,
+            max_bytes=max_bytes,
+            overflow=overflow,
+            answer_buffer=answer_buffer,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+async def integer(
+    question: str,
+    default: Optional[str] = None,
+    blacklist: Optional[List[int]] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+) -> Union[int, None]:
+    """
+    Prompt the user for an integer.
+    Takes the same arguments as 'prmt.integer', except 'countdown'.
+    """
+    return await _run(
+        _integer(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+async def confirm(
+    question: str,
+    default: Optional[str] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+) -> bool:
+    """
+    Prompt the user to confirm with [y|yes] or [n|no].
+    Takes the same arguments as 'prmt.confirm', except 'countdown'.
+    """
+    return await _run(
+        _confirm(
+            question=question,
+            default=default,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+async def list_of_string(
+    question: str,
+    default: Optional[Union[list, str]] = None,
+    blacklist: Optional[list] = None,
+    fmt=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+) -> list:
+    """
+    Prompt the user for a list of strings. Values are seperated with commas.
+    Takes the same arguments as 'prmt.list_of_string', except 'countdown'.
+    """
+    return await _run(
+        _list_of_string(
+            question=question,
+            default=default,
+            blacklist=blacklist,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            template=_template(fmt, fmt_question, fmt_default, fmt_prompt),
+        )
+    )
+
+
+async def select(
+    question: str,
+    options: Union[dict, list, tuple],
+    default: Optional[Union[str, int]] = None,
+    custom_key: Optional[Union[str, int]] = None,
+    fmt=["\n{}\n", "  {}: {}", "\n", "[{}]", "> {}\n"],
+    fmt_question=None,
+    fmt_option=None,
+    fmt_options_end=None,
+    fmt_default=None,
+    fmt_prompt=None,
+    fmt_custom=["\n{}\n", "[{}]", "> {}\n"],
+    fmt_custom_question=None,
+    fmt_custom_default=None,
+    fmt_custom_propmt=None,
+    *,
+    max_retries: Optional[int] = None,
+    on_exhausted: str = "raise",
+    prompt_id: Optional[str] = None,
+    io: Optional[PromptIO] = None,
+    timeout: Optional[float] = None,
+    on_timeout: str = "default",
+    page_size: Optional[int] = None,
+    fmt_page=None,
+) -> Tuple[Union[int, str], Any]:
+    """
+    Prompt the user to select an option from a list of options.
+    Takes the same arguments as 'prmt.select', except 'countdown', 'filter' and 'arrow_keys'.
+    """
+    if hasattr(options, "__aiter__"):
+        from prmt.options import OptionStream
+
+        # Read by a task of this event loop, not in a loop of its own.
+        options = OptionStream(options, start=False)
+        options.start_task()
+
+    return await _run(
+        _select(
+            question=question,
+            options=options,
+            default=default,
+            custom_key=custom_key,
+            max_retries=max_retries,
+            on_exhausted=on_exhausted,
+            prompt_id=prompt_id,
+            io=io,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            page_size=page_size,
+            template=_select_template(
+                fmt,
+                fmt_question,
+                fmt_option,
+                fmt_options_end,
+                fmt_default,
+                fmt_prompt,
+                fmt_custom,
+                fmt_custom_question,
+                fmt_custom_default,
+                fmt_custom_propmt,
+                fmt_page,
+            ),
+            # Keys are read one by one with the blocking reads only.
+            live=False,
+        )
+    )
@@ -0,0 +1,430 @@
+"""
+Answer the prompts of child processes on the terminal of the parent.
+
+    with prmt.PromptBroker():
+        with multiprocessing.Pool(8) as pool:
+            pool.map(work, items)  # 'work' may call prmt.confirm() etc.
+
+The broker listens on a Unix domain socket and puts its path into the
+environment variable PRMT_BROKER, so child processes find it. Prompts in a
+child that do not pass their own 'io' are sent to the broker, shown one at a
+time on the real terminal and validated there. Each child process keeps one
+connection open for all of its prompts.
+
+Wire protocol: every message is a JSON object, UTF-8 encoded and prefixed with
+its length as a 4 byte unsigned big-endian integer. A request is
+{"v": 1, "type": <prompt function>, "question": ..., "args": {...}}. The reply
+is {"value": ...} or {"error": <exception name>, "message": ..., "args": {...}}.
+Options are sent as [key, label] pairs, a 'LineFile' as its path, which the
+broker opens itself. Options that are read lazily are not sent.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+import json
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+
+import prmt
+from prmt import (
+    PromptIO,
+    PromptTimeout,
+    RetriesExhausted,
+    _MISSING,
+    _get_io,
+    _new_selection,
+    _page_size,
+    _paged,
+)
+
+ENV = "PRMT_BROKER"
+
+PROTOCOL_VERSION = 1
+
+_HEADER = struct.Struct("!I")
+
+# The prompt functions that can be forwarded.
+_PROMPTS = (
+    "string",
+    "string_from_editor",
+    "integer",
+    "confirm",
+    "list_of_string",
+    "select",
+    "multi_select",
+)
+
+
+class BrokerError(RuntimeError):
+    """
+    Raised in a child process if the broker could not answer a prompt.
+    """
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise EOFError
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size).decode("utf-8"))
+
+
+class PromptBroker:
+    """
+    Serve the prompts of child processes. Prompts are shown one at a time
+    through a 'PromptCoordinator', so the parent's own threads can share it.
+
+    :param io: The PromptIO the prompts are shown on. Defaults to stdin and stdout.
+    :param path: Path of the socket. A private temporary directory by default.
+    :param coordinator: A 'PromptCoordinator' to show the prompts with.
+    """
+
+    def __init__(
+        self,
+        io: Optional[PromptIO] = None,
+        path: Optional[str] = None,
+        coordinator: Optional["prmt.PromptCoordinator"] = None,
+    ):
+        self._dir = None if path else tempfile.mkdtemp(prefix="prmt-broker-")
+        self.path = path or os.path.join(self._dir, "socket")
+        self.coordinator = coordinator or prmt.PromptCoordinator(io=io)
+        self.connections = 0
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._prev_env: Optional[str] = None
+
+    def __enter__(self) -> "PromptBroker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Listen for child processes and set PRMT_BROKER for the children that
+        are started from now on.
+        """
+        global _server_pid
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        sock.listen(128)
+        self._sock = sock
+
+        self._thread = threading.Thread(
+            target=self._accept, name="prmt-broker", daemon=True
+        )
+        self._thread.start()
+
+        self._prev_env = os.environ.get(ENV)
+        os.environ[ENV] = self.path
+        _server_pid = os.getpid()
+
+    def close(self) -> None:
+        global _server_pid
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            clients = list(self._clients)
+
+        if os.environ.get(ENV) == self.path:
+            if self._prev_env is None:
+                del os.environ[ENV]
+            else:
+                os.environ[ENV] = self._prev_env
+
+        _server_pid = None
+
+        if self._sock is not None:
+            # Wake up accept().
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as wake:
+                    wake.connect(self.path)
+            except OSError:
+                pass
+            self._thread.join()
+            self._sock.close()
+
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        self.coordinator.close(cancel=True)
+
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+        elif os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accept(self) -> None:
+        while True:
+            client, _ = self._sock.accept()
+
+            with self._lock:
+                if self._closed:
+                    client.close()
+                    return
+                self.connections += 1
+                self._clients.append(client)
+
+            threading.Thread(
+                target=self._serve,
+                args=(client,),
+                name="prmt-broker-client",
+                daemon=True,
+            ).start()
+
+    def _serve(self, client: socket.socket) -> None:
+        try:
+            with client:
+                while True:
+                    try:
+                        request = _recv(client)
+                    except (EOFError, OSError):
+                        return
+
+                    _send(client, self._answer(request))
+        finally:
+            with self._lock:
+                self._clients.remove(client)
+
+    def _answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get("v") != PROTOCOL_VERSION:
+            return _error(BrokerError(f"Unsupported protocol: {request.get('v')!r}"))
+
+        type = request.get("type")
+
+        if type not in _PROMPTS:
+            return _error(BrokerError(f"Unknown prompt: {type!r}"))
+
+        args = dict(request["args"])
+        line_file = args.pop("line_file", None)
+
+        if line_file is not None:
+            from prmt.options import LineFile
+
+            try:
+                args["options"] = LineFile(*line_file)
+            except OSError as e:
+                return _error(e)
+
+        try:
+            return self._ask(type, request["question"], args)
+        finally:
+            if line_file is not None:
+                args["options"].close()
+
+    def _ask(self, type: str, question: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        custom_key = args.get("custom_key")
+
+        # A 'LineFile' is already open, other options come as [key, label] pairs.
+        if type in ("select", "multi_select") and isinstance(args["options"], list):
+            pairs = args.pop("options")
+            if args.pop("mapping"):
+                args["options"] = {key: label for key, label in pairs}
+            else:
+                args["options"] = [label for _, label in pairs]
+
+            table = args.pop("table", False)
+            columns = args.pop("columns", None)
+
+            if args.pop("option_set"):
+                from prmt.options import OptionSet, Table
+
+                if table:
+                    args["options"] = Table(args["options"], columns)
+                else:
+                    args["options"] = OptionSet(args["options"])
+
+            if args.pop("paged") and args.get("page_size") is None:
+                # Page like the source in the child, by the size of this terminal.
+                args["page_size"] = _page_size(self.coordinator.io or _get_io())
+
+        try:
+            value = self.coordinator.ask(getattr(prmt, type), question, **args)
+        except Exception as e:
+            return _error(e)
+
+        if hasattr(value, "read"):
+            # A spilled answer. Send its text.
+            with value:
+                value = value.read()
+
+        if type == "select" and value is not None:
+            return {"value": list(value), "custom": _is_custom(value[0], custom_key)}
+
+        if type == "multi_select" and value is not None:
+            return {"value": list(value.positions())}
+
+        return {"value": value}
+
+
+def _is_custom(key: Any, custom_key: Any) -> bool:
+    return bool(custom_key) and str(key) == str(custom_key)
+
+
+def _error(e: Exception) -> Dict[str, Any]:
+    args: Dict[str, Any] = {}
+
+    if isinstance(e, RetriesExhausted):
+        args = {"question": e.question, "retries": e.retries}
+    elif isinstance(e, PromptTimeout):
+        args = {"question": e.question, "timeout": e.timeout}
+
+    return {"error": type(e).__name__, "message": str(e), "args": args}
+
+
+def _raise(reply: Dict[str, Any]) -> None:
+    name = reply["error"]
+
+    if name == "RetriesExhausted":
+        raise RetriesExhausted(**reply["args"])
+
+    if name == "PromptTimeout":
+        raise PromptTimeout(**reply["args"])
+
+    if name == "EOFError":
+        raise EOFError(reply["message"])
+
+    raise BrokerError(f"{name}: {reply['message']}")
+
+
+# The pid of the process that runs a broker. Its own prompts are not forwarded.
+_server_pid: Optional[int] = None
+
+_conn: Optional[socket.socket] = None
+_conn_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    global _conn, _conn_lock
+
+    # The connection of the parent must not be shared.
+    _conn = None
+    _conn_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def forward(type: str, question: str, args: Dict[str, Any]) -> Any:
+    """
+    Ask the broker named in PRMT_BROKER. Return '_MISSING' if there is no
+    broker or this process runs it.
+    """
+    global _conn
+
+    path = os.environ.get(ENV)
+
+    if not path or _server_pid == os.getpid():
+        return _MISSING
+
+    options = None
+    args = dict(args)
+    # The answer is buffered again in this process, with the class of the
+    # prompt. A spilled answer comes back as text and spills here as well.
+    answer_buffer = args.pop("answer_buffer", None)
+
+    if type in ("select", "multi_select"):
+        from prmt.options import LineFile
+
+        options = args["options"]
+
+        if hasattr(options, "wait"):
+            # The broker gets all options of a stream.
+            options.wait()
+
+        if isinstance(options, LineFile):
+            # The broker opens the file itself and reads the lines it shows.
+            args["options"] = None
+            args["line_file"] = [os.path.abspath(options.path), options.encoding]
+        elif not getattr(options, "complete", True):
+            raise BrokerError(
+                f"The options of {question!r} are read lazily and cannot be sent"
+                " to the broker. Pass a list or a 'LineFile'."
+            )
+        elif isinstance(options, Mapping):
+            args["options"] = [[key, str(label)] for key, label in options.items()]
+            args["mapping"] = True
+        else:
+            args["options"] = [[key, str(label)] for key, label in enumerate(options)]
+            args["mapping"] = False
+        if args["options"] is not None:
+            # Sources that are paged in this process are paged by the broker.
+            args["paged"] = _paged(options)
+            args["option_set"] = hasattr(options, "lookup")
+
+        if hasattr(options, "header_line"):
+            # A 'Table' sends the text of its cells.
+            args["options"] = [
+                [key, list(row)] for key, row in zip(options, options.cells)
+            ]
+            args["table"] = True
+            args["columns"] = options.columns
+
+    request = {"v": PROTOCOL_VERSION, "type": type, "question": question, "args": args}
+
+    with _conn_lock:
+        try:
+            if _conn is None:
+                _conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                _conn.connect(path)
+            _send(_conn, request)
+            reply = _recv(_conn)
+        except (OSError, EOFError) as e:
+            if _conn is not None:
+                _conn.close()
+                _conn = None
+            raise BrokerError(f"Lost the connection to the broker at {path}") from e
+
+    if "error" in reply:
+        _raise(reply)
+
+    value = reply["value"]
+
+    if type == "select" and value is not None:
+        key, label = value
+        return (key, label) if reply["custom"] else (key, options[key])
+
+    if type == "multi_select" and value is not None:
+        selection = _new_selection(options)
+        for position in value:
+            selection.toggle(position)
+        return selection
+
+    if answer_buffer is not None and args.get("max_bytes") is not None:
+        if isinstance(value, str):
+            buffer = answer_buffer(
+                max_bytes=args["max_bytes"], overflow=args["overflow"]
+            )
+            buffer.write(value)
+            value = buffer.getvalue()
+
+    return value
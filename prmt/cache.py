@@ -0,0 +1,192 @@
+"""
+Remember answers between runs.
+
+    prmt.set_answer_cache(prmt.AnswerCache())
+
+    hosts = prmt.list_of_string("Hosts?", prompt_id="deploy.hosts")
+
+Prompts with a 'prompt_id' and without a 'default' get their last answer as
+the default. Answers are kept in a JSON file that is read once, on the first
+prompt that needs it, and replaced as a whole after every answer, so a crash
+never leaves half a file behind. The file only holds the last 'max_answers'
+answers of the 'max_prompts' prompts that were used last, in at most
+'max_bytes' bytes.
+"""
+from collections import OrderedDict
+from typing import Any, List, Optional, Union
+import json
+import os
+import threading
+
+# Version of the file format.
+FORMAT = 1
+
+
+def default_path() -> str:
+    """
+    answers.json in $XDG_CACHE_HOME/prmt, or ~/.cache/prmt.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "prmt", "answers.json")
+
+
+class AnswerCache:
+    """
+    The last answers of prompts by 'prompt_id', most recent first.
+
+    The prompts that were used least recently are dropped first when there
+    are more than 'max_prompts' or the file would get bigger than 'max_bytes'.
+    An unreadable file is treated as empty. The file is created only readable
+    by its owner. If several processes use the same file, the last one that
+    writes it wins.
+
+    :param path: The JSON file. Defaults to 'default_path()'.
+    :param max_answers: Answers that are kept per prompt.
+    :param max_prompts: Prompts that are kept.
+    :param max_bytes: Size limit of the file. Answers that do not fit are not kept.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, "os.PathLike"]] = None,
+        max_answers: int = 5,
+        max_prompts: int = 200,
+        max_bytes: int = 256 * 1024,
+    ):
+        self.path = os.fspath(path) if path is not None else default_path()
+        self.max_answers = max_answers
+        self.max_prompts = max_prompts
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # prompt_id -> answers, least recently used first. None until loaded.
+        self._prompts: Optional["OrderedDict[str, List[str]]"] = None
+        # prompt_id -> size of its entry in the file.
+        self._sizes = {}
+
+    def _load(self) -> "OrderedDict[str, List[str]]":
+        if self._prompts is not None:
+            return self._prompts
+
+        self._prompts = OrderedDict()
+
+        try:
+            with open(self.path, "rb") as f:
+                data = json.loads(f.read())
+            prompts = data["prompts"] if data.get("version") == FORMAT else {}
+        except (OSError, ValueError, TypeError, AttributeError, KeyError):
+            prompts = {}
+
+        if not isinstance(prompts, dict):
+            prompts = {}
+
+        for prompt_id, answers in prompts.items():
+            if isinstance(answers, list):
+                answers = [a for a in answers if isinstance(a, str)]
+                self._set(prompt_id, answers[: self.max_answers])
+
+        self._evict()
+
+        return self._prompts
+
+    def _set(self, prompt_id: str, answers: List[str]) -> bool:
+        # The oldest answers are dropped until the entry fits in the file.
+        while answers:
+            # The size of '"id":[...],' in the file.
+            size = len(_encode({prompt_id: answers})) - 1
+            if size <= self.max_bytes:
+                break
+            answers = answers[:-1]
+        else:
+            return False
+
+        self._prompts[prompt_id] = answers
+        self._prompts.move_to_end(prompt_id)
+        self._sizes[prompt_id] = size
+
+        return True
+
+    def _evict(self) -> None:
+        prompts = self._prompts
+        sizes = self._sizes
+        size = sum(sizes.values())
+
+        while prompts and (len(prompts) > self.max_prompts or size > self.max_bytes):
+            prompt_id, _ = prompts.popitem(last=False)
+            size -= sizes.pop(prompt_id)
+
+    def get(self, prompt_id: str) -> Optional[str]:
+        """
+        The last answer of a prompt, or None.
+        """
+        answers = self.answers(prompt_id)
+
+        return answers[0] if answers else None
+
+    def answers(self, prompt_id: str) -> List[str]:
+        """
+        The kept answers of a prompt, most recent first.
+        """
+        with self._lock:
+            prompts = self._load()
+            answers = prompts.get(prompt_id)
+            if answers is None:
+                return []
+            prompts.move_to_end(prompt_id)
+            return list(answers)
+
+    def put(self, prompt_id: str, answer: str) -> None:
+        """
+        Keep 'answer' as the last answer of a prompt and write the file.
+        """
+        with self._lock:
+            prompts = self._load()
+            answers = [a for a in prompts.get(prompt_id, ()) if a != answer]
+            answers.insert(0, answer)
+            if self._set(prompt_id, answers[: self.max_answers]):
+                self._evict()
+                self.save()
+
+    def forget(self, prompt_id: Optional[str] = None) -> None:
+        """
+        Drop the answers of a prompt, or of all prompts, and write the file.
+        """
+        with self._lock:
+            prompts = self._load()
+            if prompt_id is None:
+                prompts.clear()
+                self._sizes.clear()
+            elif prompts.pop(prompt_id, None) is not None:
+                del self._sizes[prompt_id]
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the file. It is written to a temporary file in the same
+        directory first, which then replaces it.
+        """
+        import tempfile
+
+        data = _encode({"version": FORMAT, "prompts": self._load()})
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".answers-")
+
+        try:
+            with open(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def __repr__(self) -> str:
+        return f"AnswerCache({self.path!r})"
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
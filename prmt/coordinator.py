@@ -0,0 +1,208 @@
+"""
+Share one terminal between the threads of a worker pool.
+
+    with prmt.PromptCoordinator() as prompts:
+
+        def migrate(db):
+            if prompts.confirm(f"Migrate {db}?"):
+                ...
+
+        with ThreadPoolExecutor(8) as pool:
+            pool.map(migrate, databases)
+
+Prompt requests from any thread are queued and shown one at a time on the
+coordinator's thread, highest priority first. Each caller gets its answer
+through a future, so answers never go to the wrong thread.
+"""
+from concurrent.futures import Future
+from typing import Any, Callable, NamedTuple, Optional
+import itertools
+import queue
+import threading
+import time
+
+import prmt
+from prmt import PromptIO
+
+
+class CoordinatorStats(NamedTuple):
+    """
+    :param queued: Requests that wait to be shown.
+    :param served: Requests that were shown.
+    :param wait_ns_total: Time the served requests waited in the queue, in nanoseconds.
+    :param wait_ns_max: The longest time a served request waited in the queue.
+    """
+
+    queued: int
+    served: int
+    wait_ns_total: int
+    wait_ns_max: int
+
+    @property
+    def wait_ns_mean(self) -> float:
+        return self.wait_ns_total / self.served if self.served else 0.0
+
+
+# Sorts after every request, so closing serves the queued requests first.
+_STOP = float("inf")
+
+
+class PromptCoordinator:
+    """
+    Run prompts from many threads one at a time.
+
+    The prompt methods take the same arguments as the functions in 'prmt', and
+    a 'priority'. They block until the answer is there.
+
+    :param io: The PromptIO for all prompts that do not pass their own. Defaults to stdin and stdout.
+    """
+
+    def __init__(self, io: Optional[PromptIO] = None):
+        self.io = io
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._queued = 0
+        self._served = 0
+        self._wait_ns_total = 0
+        self._wait_ns_max = 0
+
+    def __enter__(self) -> "PromptCoordinator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        priority: int = 0,
+        **kwargs,
+    ) -> "Future[Any]":
+        """
+        Queue a call of 'func', e.g. 'prmt.confirm', and return a future for
+        its result. Requests with a higher 'priority' are shown first, requests
+        with the same priority in the order they came in.
+        """
+        future: "Future[Any]" = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The coordinator is closed.")
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._serve, name="prmt-coordinator", daemon=True
+                )
+                self._thread.start()
+
+            self._queued += 1
+            request = (func, args, kwargs, future, time.perf_counter_ns())
+            self._queue.put((-priority, next(self._seq), request))
+
+        return future
+
+    def ask(self, func: Callable[..., Any], *args, priority: int = 0, **kwargs) -> Any:
+        """
+        Call the prompt function 'func' on the coordinator's thread and wait for
+        the answer. It gets the coordinator's 'io', unless it is passed. Prompts
+        that are asked from the coordinator's thread itself (e.g. from a hook)
+        run right away.
+        """
+        if self.io is not None:
+            kwargs.setdefault("io", self.io)
+
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)
+
+        return self.submit(func, *args, priority=priority, **kwargs).result()
+
+    def string(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.string, *args, priority=priority, **kwargs)
+
+    def string_from_editor(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.string_from_editor, *args, priority=priority, **kwargs)
+
+    def integer(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.integer, *args, priority=priority, **kwargs)
+
+    def confirm(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.confirm, *args, priority=priority, **kwargs)
+
+    def list_of_string(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.list_of_string, *args, priority=priority, **kwargs)
+
+    def select(self, *args, priority: int = 0, **kwargs):
+        return self.ask(prmt.select, *args, priority=priority, **kwargs)
+
+    def stats(self) -> CoordinatorStats:
+        with self._lock:
+            return CoordinatorStats(
+                self._queued, self._served, self._wait_ns_total, self._wait_ns_max
+            )
+
+    def close(self, cancel: bool = False, wait: bool = True) -> None:
+        """
+        Stop taking requests. The queued requests are still shown, unless
+        'cancel' is set, then their futures are cancelled.
+
+        :param wait: Wait until the coordinator's thread is done.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put((_STOP, next(self._seq), None))
+
+        if cancel:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                request = item[2]
+
+                if request is None:
+                    self._queue.put(item)
+                    break
+
+                with self._lock:
+                    self._queued -= 1
+                request[3].cancel()
+
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _serve(self) -> None:
+        while True:
+            _, _, request = self._queue.get()
+
+            if request is None:
+                return
+
+            func, args, kwargs, future, submitted = request
+            wait_ns = time.perf_counter_ns() - submitted
+
+            with self._lock:
+                self._queued -= 1
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self._served += 1
+                self._wait_ns_total += wait_ns
+                self._wait_ns_max = max(self._wait_ns_max, wait_ns)
+
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
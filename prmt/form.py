@@ -0,0 +1,323 @@
+"""
+Forms: a series of prompts that is declared once and asked many times.
+
+    form = prmt.Form("deploy")
+    form.select("env", "Environment?", ["dev", "staging", "prod"])
+    form.confirm("sure", "Deploy to production?", when=lambda env: env[0] == 2)
+    form.list_of_string("hosts", "Hosts?", default=lambda env: f"{env[1]}-1")
+
+    answers = form.run()
+    deploy(answers.env[1], answers.hosts)
+
+The condition 'when' and the question, options, default and blacklist of a
+prompt can be functions of earlier answers. The names of their parameters
+are the names of the questions they depend on, and a question is asked after
+the questions it depends on. A question is skipped if its condition is false
+or a question it depends on was skipped, unless the parameter has a default
+value. Nothing of a skipped question is evaluated.
+
+The order of the questions is worked out once, on the first run, and reused
+by later runs.
+"""
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+import heapq
+import inspect
+
+import prmt
+
+# Arguments of a prompt that can be functions of earlier answers.
+DYNAMIC = ("question", "options", "default", "blacklist")
+
+
+class _Question(NamedTuple):
+    type: str
+    name: str
+    when: Any
+    args: Dict[str, Any]
+
+
+class _Call(NamedTuple):
+    # The argument the result is passed as, or "when".
+    arg: str
+    function: Callable[..., Any]
+    # (question name, required) pairs of its parameters.
+    params: Tuple[Tuple[str, bool], ...]
+
+
+class _Step(NamedTuple):
+    type: str
+    name: str
+    args: Dict[str, Any]
+    calls: Tuple[_Call, ...]
+    # Questions that must be answered to ask this one.
+    requires: Tuple[str, ...]
+
+
+class FormAnswers(Mapping):
+    """
+    The answers of a form by question name, in the order they were asked.
+    Each answer is what its prompt returned, e.g. an int for 'integer'.
+    Skipped questions are not in it but in 'skipped'. Answers can also be
+    read as attributes, a skipped question is None then.
+    """
+
+    def __init__(self, values: Dict[str, Any], skipped: Tuple[str, ...]):
+        self._values = values
+        self.skipped = skipped
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getattr__(self, name: str) -> Any:
+        if not name.startswith("_"):
+            if name in self._values:
+                return self._values[name]
+            if name in self.skipped:
+                return None
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"FormAnswers({self._values!r})"
+
+
+class Form:
+    """
+    Questions with conditions and dependencies, see the module docstring.
+
+    :param id: Prefix of the prompt ids. Each prompt gets the id "<id>.<name>",
+        or its name without an id, so forms can be answered by the answers
+        source and remembered by the answer cache.
+    """
+
+    def __init__(self, id: Optional[str] = None):
+        self.id = id
+        self._questions: List[_Question] = []
+        self._plan: Optional[Tuple[_Step, ...]] = None
+
+    def _add(self, type: str, name: str, when: Any, args: Dict[str, Any]) -> "Form":
+        if any(q.name == name for q in self._questions):
+            raise ValueError(f"The form already has a question {name!r}")
+
+        self._questions.append(_Question(type, name, when, args))
+        self._plan = None
+
+        return self
+
+    def string(self, name: str, question: Any, when: Any = None, **args) -> "Form":
+        """
+        Add a 'string' prompt. Returns the form.
+
+        :param name: The name of the answer.
+        :param when: Ask only if this is true. A bool or a function of earlier answers.
+        :param args: The other arguments of 'string'.
+        """
+        return self._add("string", name, when, dict(args, question=question))
+
+    def string_from_editor(
+        self, name: str, question: Any, when: Any = None, **args
+    ) -> "Form":
+        """
+        Add a 'string_from_editor' prompt. Returns the form.
+        """
+        return self._add(
+            "string_from_editor", name, when, dict(args, question=question)
+        )
+
+    def integer(self, name: str, question: Any, when: Any = None, **args) -> "Form":
+        """
+        Add an 'integer' prompt. Returns the form.
+        """
+        return self._add("integer", name, when, dict(args, question=question))
+
+    def confirm(self, name: str, question: Any, when: Any = None, **args) -> "Form":
+        """
+        Add a 'confirm' prompt. Returns the form.
+        """
+        return self._add("confirm", name, when, dict(args, question=question))
+
+    def list_of_string(
+        self, name: str, question: Any, when: Any = None, **args
+    ) -> "Form":
+        """
+        Add a 'list_of_string' prompt. Returns the form.
+        """
+        return self._add("list_of_string", name, when, dict(args, question=question))
+
+    def select(
+        self, name: str, question: Any, options: Any, when: Any = None, **args
+    ) -> "Form":
+        """
+        Add a 'select' prompt. Returns the form.
+        """
+        return self._add(
+            "select", name, when, dict(args, question=question, options=options)
+        )
+
+    def multi_select(
+        self, name: str, question: Any, options: Any, when: Any = None, **args
+    ) -> "Form":
+        """
+        Add a 'multi_select' prompt. Returns the form.
+        """
+        return self._add(
+            "multi_select", name, when, dict(args, question=question, options=options)
+        )
+
+    def compile(self) -> Tuple[_Step, ...]:
+        """
+        The questions in the order they are asked. Raises ValueError if a
+        function depends on a question the form does not have, or questions
+        depend on each other.
+        """
+        if self._plan is not None:
+            return self._plan
+
+        index = {q.name: i for i, q in enumerate(self._questions)}
+        steps: List[Optional[_Step]] = []
+        after: List[List[int]] = [[] for _ in self._questions]
+        waiting = []
+
+        for i, question in enumerate(self._questions):
+            if not callable(question.when) and question.when is not None:
+                if not question.when:
+                    # Never asked, but the questions after it still wait for it.
+                    steps.append(None)
+                    waiting.append(0)
+                    continue
+
+            dynamic = [("when", question.when)]
+            dynamic.extend((arg, question.args.get(arg)) for arg in DYNAMIC)
+            calls = tuple(
+                _call(question.name, arg, value, index)
+                for arg, value in dynamic
+                if callable(value)
+            )
+            depends = {name for call in calls for name, _ in call.params}
+
+            for name in depends:
+                after[index[name]].append(i)
+
+            args = {
+                arg: value
+                for arg, value in question.args.items()
+                if not (arg in DYNAMIC and callable(value))
+            }
+            if self.id is not None:
+                args.setdefault("prompt_id", f"{self.id}.{question.name}")
+            else:
+                args.setdefault("prompt_id", question.name)
+
+            requires = {
+                name for call in calls for name, required in call.params if required
+            }
+            steps.append(
+                _Step(question.type, question.name, args, calls, tuple(requires))
+            )
+            waiting.append(len(depends))
+
+        # The questions in the order they were added, as far as their
+        # dependencies allow.
+        ready = [i for i, count in enumerate(waiting) if not count]
+        heapq.heapify(ready)
+        order = []
+
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for j in after[i]:
+                waiting[j] -= 1
+                if not waiting[j]:
+                    heapq.heappush(ready, j)
+
+        if len(order) < len(steps):
+            names = ", ".join(
+                q.name for i, q in enumerate(self._questions) if waiting[i]
+            )
+            raise ValueError(f"The questions depend on each other: {names}")
+
+        self._plan = tuple(steps[i] for i in order if steps[i] is not None)
+
+        return self._plan
+
+    def run(self, prompt: Optional["prmt.Prompt"] = None) -> FormAnswers:
+        """
+        Ask the questions that apply.
+
+        :param prompt: A 'Prompt' whose formats, io and timeout are used.
+            Defaults to the prompt functions of 'prmt'.
+        """
+        ask = prmt if prompt is None else prompt
+        values: Dict[str, Any] = {}
+
+        for step in self.compile():
+            _run_step(step, ask, values)
+
+        skipped = tuple(q.name for q in self._questions if q.name not in values)
+
+        return FormAnswers(values, skipped)
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def __repr__(self) -> str:
+        names = ", ".join(q.name for q in self._questions)
+        return f"Form({self.id!r}, [{names}])"
+
+
+def _call(question: str, arg: str, function: Any, index: Dict[str, int]) -> _Call:
+    params = []
+
+    for param in inspect.signature(function).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        if param.name not in index:
+            raise ValueError(
+                f"{arg!r} of {question!r} depends on {param.name!r}, which is "
+                "not a question of the form"
+            )
+        if param.name == question:
+            raise ValueError(f"{arg!r} of {question!r} depends on itself")
+        params.append((param.name, param.default is param.empty))
+
+    return _Call(arg, function, tuple(params))
+
+
+def _run_step(step: _Step, ask: Any, values: Dict[str, Any]) -> bool:
+    """
+    Ask the question of 'step' if it applies and add the answer to 'values'.
+    Return False if it was skipped.
+    """
+    for name in step.requires:
+        if name not in values:
+            return False
+
+    args = dict(step.args)
+
+    for call in step.calls:
+        value = call.function(
+            **{name: values[name] for name, _ in call.params if name in values}
+        )
+        if call.arg != "when":
+            args[call.arg] = value
+        elif not value:
+            return False
+
+    values[step.name] = getattr(ask, step.type)(**args)
+
+    return True
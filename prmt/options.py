@@ -0,0 +1,1234 @@
+"""
+Option sources for 'select'.
+
+    with prmt.LineFile("hosts.txt") as hosts:
+        key, host = prmt.select("Host?", hosts, page_size=20)
+
+'select' shows sources that are not lists, tuples or dicts a page at a time
+and only converts the options of the visible page to text. Iterables are read
+as far as the pages and keys that are used.
+
+    colors = prmt.OptionSet(["red", "green", "blue"])
+    while prmt.confirm("Another one?"):
+        key, color = prmt.select("Color?", colors)  # "gr" selects "green"
+
+Options that come from a slow discovery can be shown while they arrive:
+
+    with prmt.OptionStream(scan_cluster()) as hosts:
+        key, host = prmt.select("Host?", hosts)
+
+An 'OptionSet' indexes its options once, for menus that are shown many times.
+A 'Table' is an 'OptionSet' of rows that are shown as aligned columns.
+A 'FuzzyIndex' finds the options that match a filter while the user types it.
+A 'Selection' holds the options chosen in 'multi_select', one bit per option.
+"""
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from array import array
+from bisect import bisect_left
+import heapq
+import mmap
+import os
+import threading
+import unicodedata
+import weakref
+
+
+class LineFile:
+    """
+    The lines of a text file as a read-only sequence, without reading the file
+    into memory. The file is mapped with 'mmap' and the start of each line is
+    kept in an offset array, which is built as far as lines are used.
+
+    :param path: Path of the file. Each line is one option, the line number is its key.
+    :param encoding: Encoding of the file.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike"], encoding: str = "utf-8"):
+        self.path = os.fspath(path)
+        self.encoding = encoding
+        self._file = open(self.path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+
+        # An empty file cannot be mapped.
+        self._map: Any = b""
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The start of each indexed line and of the line after it. A last line
+        # without a newline ends at the end of the file, as if it had one.
+        self._offsets = array("Q", [0])
+        self._complete = self._size == 0
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    def __enter__(self) -> "LineFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def _index(self, line: Optional[int] = None) -> None:
+        """
+        Extend the offsets until 'line' is indexed, or to the end of the file.
+        """
+        offsets = self._offsets
+        find = self._map.find
+        size = self._size
+
+        while not self._complete and (line is None or len(offsets) <= line + 1):
+            end = find(b"\n", offsets[-1])
+
+            if end == -1:
+                offsets.append(size + 1)
+                self._complete = True
+            else:
+                offsets.append(end + 1)
+                self._complete = end + 1 >= size
+
+    def __len__(self) -> int:
+        self._index()
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+            if index < 0:
+                raise IndexError("line index out of range")
+
+        self._index(index)
+
+        if index >= len(self._offsets) - 1:
+            raise IndexError("line index out of range")
+
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - 1
+
+        if end > start and self._map[end - 1 : end] == b"\r":
+            end -= 1
+
+        return self._map[start:end].decode(self.encoding, "replace")
+
+    def __iter__(self) -> Iterator[str]:
+        index = 0
+        while True:
+            try:
+                yield self[index]
+            except IndexError:
+                return
+            index += 1
+
+    def fuzzy_index(self) -> "FuzzyIndex":
+        """
+        The 'FuzzyIndex' of the lines. It is built on first use.
+        """
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self)
+        return self._fuzzy
+
+    def __repr__(self) -> str:
+        return f"LineFile({self.path!r})"
+
+
+class LazySequence:
+    """
+    The items of an iterable as a sequence. Items are taken from the iterable
+    as far as they are used and kept.
+
+    :param iterable: The options. Their position is their key.
+    """
+
+    def __init__(self, iterable: Iterable[Any]):
+        self._iterator = iter(iterable)
+        self._items: List[Any] = []
+        self.complete = False
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    def _pull(self, index: Optional[int] = None) -> None:
+        """
+        Take items until 'index' is there, or all items.
+        """
+        items = self._items
+
+        if self.complete or (index is not None and index < len(items)):
+            return
+
+        if index is None:
+            items.extend(self._iterator)
+            self.complete = True
+            return
+
+        for item in self._iterator:
+            items.append(item)
+            if len(items) > index:
+                return
+
+        self.complete = True
+
+    def __len__(self) -> int:
+        self._pull()
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            self._pull()
+        else:
+            self._pull(index)
+
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        index = 0
+        while True:
+            try:
+                yield self[index]
+            except IndexError:
+                return
+            index += 1
+
+    def fuzzy_index(self) -> "FuzzyIndex":
+        """
+        The 'FuzzyIndex' of the texts of the items. It reads all items and is
+        built on first use.
+        """
+        if self._fuzzy is None:
+            self._pull()
+            self._fuzzy = FuzzyIndex([str(item) for item in self._items])
+        return self._fuzzy
+
+
+class OptionStream(Mapping):
+    """
+    Options that arrive while the prompt is already shown, e.g. from a slow
+    discovery. A thread takes them from 'source', an iterable or an async
+    iterable. 'select' shows the options that arrived and the user can pick
+    one of them before the source is done. Answers are looked up in an index
+    that grows with each option: its key and its text, ignoring case.
+
+    'select' stops the stream when the prompt ends. A generator is closed once
+    it produced its current option, an async iterable is cancelled right away.
+    The options that arrived are kept.
+
+    'select' wraps an async iterable in an 'OptionStream'. In 'prmt.aio' it is
+    read by a task of the running event loop, otherwise the thread runs it in
+    an event loop of its own. If the source raises, the stream ends and the
+    exception is kept in 'error'.
+
+    :param source: The options, their positions are their keys. Or (key, option) pairs, if 'keyed' is set.
+    :param keyed: The source yields (key, option) pairs. Later pairs with a key that arrived already are ignored.
+    :param start: Start reading 'source' in a thread. Otherwise call 'start' or 'start_task'.
+    """
+
+    def __init__(self, source: Any, keyed: bool = False, start: bool = True):
+        self._source = source
+        self._keyed = keyed
+        self._items: List[Any] = []
+        self._keys: Optional[List[Any]] = [] if keyed else None
+        self._positions: Dict[Any, int] = {}
+        self.labels: List[str] = []
+
+        # Option texts and string keys, ignoring case. -1 if more than one
+        # option has the text.
+        self._by_text: Dict[str, int] = {}
+
+        self.complete = False
+        self.error: Optional[BaseException] = None
+
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._loop: Any = None
+        self._task: Any = None
+
+        # A byte is written to the pipe for each change, to wake up a prompt
+        # that waits for keys. Prompts on Windows cannot wait for a pipe.
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+
+        if os.name != "nt":
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+
+        self._closed = weakref.finalize(self, _close_fds, self._wake_r, self._wake_w)
+
+        if start:
+            self.start()
+
+    def start(self) -> None:
+        """
+        Read the source in a daemon thread.
+        """
+        threading.Thread(target=self._run, name="prmt-options", daemon=True).start()
+
+    def start_task(self) -> Any:
+        """
+        Read an async source in a task of the running event loop. Return the
+        task.
+        """
+        import asyncio
+
+        return asyncio.ensure_future(self._consume_async())
+
+    def _run(self) -> None:
+        if hasattr(self._source, "__aiter__"):
+            import asyncio
+
+            asyncio.run(self._consume_async())
+            return
+
+        iterator = iter(self._source)
+
+        try:
+            for item in iterator:
+                if self._stop.is_set():
+                    break
+                self._add(item)
+        except Exception as e:
+            self.error = e
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            self._finish()
+
+    async def _consume_async(self) -> None:
+        import asyncio
+
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        iterator = self._source.__aiter__()
+
+        try:
+            if not self._stop.is_set():
+                async for item in iterator:
+                    self._add(item)
+                    if self._stop.is_set():
+                        break
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            self._finish()
+
+    def _add(self, item: Any) -> None:
+        if self._keyed:
+            key, option = item
+        else:
+            key, option = None, item
+
+        with self._changed:
+            if self._keys is not None:
+                if key in self._positions:
+                    return
+                self._positions[key] = len(self._items)
+                self._keys.append(key)
+
+            position = len(self._items)
+            label = str(option)
+
+            self._index(label, position)
+            if isinstance(key, str) and key.casefold() != label.casefold():
+                self._index(key, position)
+
+            self._items.append(option)
+            self.labels.append(label)
+
+            self._changed.notify_all()
+
+        self._wake()
+
+    def _index(self, text: str, position: int) -> None:
+        text = text.casefold()
+        self._by_text[text] = -1 if text in self._by_text else position
+
+    def _finish(self) -> None:
+        with self._changed:
+            self.complete = True
+            self._changed.notify_all()
+
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._changed:
+            if self._wake_w is None:
+                return
+
+            try:
+                os.write(self._wake_w, b"\0")
+            except BlockingIOError:
+                # The pipe is full, there is a wake up pending anyway.
+                pass
+
+    def fileno(self) -> Optional[int]:
+        """
+        A file descriptor that is readable when options arrived or the stream
+        ended, or None on Windows. Read it empty before waiting again.
+        """
+        return self._wake_r
+
+    def wait(
+        self, timeout: Optional[float] = None, count: Optional[int] = None
+    ) -> bool:
+        """
+        Wait until the stream ended, or more than 'count' options arrived. Wait
+        at most 'timeout' seconds. Return whether that happened.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.complete or (count is not None and len(self) > count),
+                timeout,
+            )
+
+    def cancel(self) -> None:
+        """
+        Stop reading the source.
+        """
+        self._stop.set()
+
+        if self._task is not None and not self.complete:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                # The event loop is closed.
+                pass
+
+    def close(self) -> None:
+        """
+        Stop reading the source and close the wake up pipe.
+        """
+        self.cancel()
+
+        with self._changed:
+            self._wake_r = self._wake_w = None
+            self._closed()
+
+    def __enter__(self) -> "OptionStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _item(self, position: int) -> Tuple[Any, Any]:
+        if self._keys is None:
+            return position, self._items[position]
+        return self._keys[position], self._items[position]
+
+    def lookup(self, answer: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Return the (key, option) pair that 'answer' selects among the options
+        that arrived, or None. An answer selects by key, or by the text of an
+        option or a string key, ignoring case.
+        """
+        with self._changed:
+            if self._keys is not None and answer in self._positions:
+                return self._item(self._positions[answer])
+
+            try:
+                number = int(answer)
+            except ValueError:
+                pass
+            else:
+                if self._keys is None:
+                    if 0 <= number < len(self._items):
+                        return self._item(number)
+                elif number in self._positions:
+                    return self._item(self._positions[number])
+
+            position = self._by_text.get(answer.casefold(), -1) if answer else -1
+
+            return None if position < 0 else self._item(position)
+
+    def items(self) -> Any:
+        """
+        The (key, option) pairs that arrived.
+        """
+        with self._changed:
+            if self._keys is None:
+                return list(enumerate(self._items))
+            return list(zip(self._keys, self._items))
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._keys is not None:
+            return self._items[self._positions[key]]
+
+        if not isinstance(key, int) or isinstance(key, bool) or key < 0:
+            raise KeyError(key)
+
+        try:
+            return self._items[key]
+        except IndexError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter([key for key, _ in self.items()])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        state = "complete" if self.complete else "streaming"
+        return f"<OptionStream of {len(self)} options, {state}>"
+
+
+def _close_fds(*fds: Optional[int]) -> None:
+    for fd in fds:
+        if fd is not None:
+            os.close(fd)
+
+
+class OptionSet(Mapping):
+    """
+    The options of a 'select', indexed once. Answers are looked up without
+    scanning the options: a key, the number of an integer key, the text of an
+    option or a unique prefix of a key or an option text. Texts and prefixes
+    are matched ignoring case. Pass the same 'OptionSet' to many prompts to
+    not rebuild the index or the rendered options.
+
+    The options are converted to text once, when the set is built. Use a
+    'LineFile' or an iterable instead for sources that are too big for that.
+
+    :param options: A dict, or a list, tuple or other iterable whose positions are the keys.
+    """
+
+    def __init__(self, options: Union[Mapping, Iterable[Any]]):
+        if isinstance(options, Mapping):
+            self._options: Any = dict(options)
+            self._keys: Optional[List[Any]] = list(self._options)
+            values = self._options.values()
+        else:
+            self._options = list(options)
+            self._keys = None
+            values = self._options
+
+        self.labels = self._labels(values)
+
+        # Keys as they are typed. A string key wins over an integer key with
+        # the same text, like for dicts.
+        self._by_text: Dict[str, Any] = {}
+        self._by_int: Dict[int, Any] = {}
+
+        for key in self._keys or ():
+            if isinstance(key, str):
+                self._by_text[key] = key
+            elif isinstance(key, int) and not isinstance(key, bool):
+                self._by_int[key] = key
+
+        # Option texts and string keys, ignoring case, sorted for prefix lookup.
+        names: List[Tuple[str, int]] = []
+
+        for position, label in enumerate(self.labels):
+            names.append((label.casefold(), position))
+
+            if self._keys is not None and isinstance(self._keys[position], str):
+                names.append((self._keys[position].casefold(), position))
+
+        names.sort()
+        self._names = [name for name, _ in names]
+        self._positions = array("L", [position for _, position in names])
+
+        self._reverse: Optional[Dict[Any, Any]] = None
+        self._lines: Dict[str, List[str]] = {}
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    def _labels(self, options: Iterable[Any]) -> List[str]:
+        return [str(option) for option in options]
+
+    def _item(self, position: int) -> Tuple[Any, Any]:
+        if self._keys is None:
+            return position, self._options[position]
+
+        key = self._keys[position]
+        return key, self._options[key]
+
+    def lookup(self, answer: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Return the (key, option) pair that 'answer' selects, or None if it
+        selects no option or more than one.
+        """
+        key = self._by_text.get(answer, _NONE)
+
+        if key is not _NONE:
+            return key, self._options[key]
+
+        try:
+            number = int(answer)
+        except ValueError:
+            pass
+        else:
+            if self._keys is None:
+                if -len(self._options) <= number < len(self._options):
+                    return self._item(number % len(self._options))
+            elif number in self._by_int:
+                return number, self._options[number]
+
+        if not answer:
+            return None
+
+        text = answer.casefold()
+        names = self._names
+        i = bisect_left(names, text)
+
+        # Exact matches sort before the longer names with the same prefix.
+        exact = i < len(names) and names[i] == text
+        found = None
+
+        while i < len(names) and names[i].startswith(text):
+            if exact and names[i] != text:
+                break
+
+            position = self._positions[i]
+
+            if found is not None and position != found:
+                return None
+
+            found = position
+            i += 1
+
+        return None if found is None else self._item(found)
+
+    def key_of(self, option: Any) -> Any:
+        """
+        Return the key of 'option', or raise KeyError. Equal options return the
+        first key.
+        """
+        if self._reverse is None:
+            reverse: Dict[Any, Any] = {}
+            for key, value in self.items():
+                try:
+                    reverse.setdefault(value, key)
+                except TypeError:
+                    pass
+            self._reverse = reverse
+
+        try:
+            return self._reverse[option]
+        except (KeyError, TypeError):
+            pass
+
+        for key, value in self.items():
+            if value == option:
+                return key
+
+        raise KeyError(option)
+
+    def option_lines(self, fmt_option: str) -> List[str]:
+        """
+        The rendered options. They are rendered once for each format.
+        """
+        lines = self._lines.get(fmt_option)
+
+        if lines is None:
+            keys = self._keys if self._keys is not None else range(len(self.labels))
+            lines = [fmt_option.format(k, text) for k, text in zip(keys, self.labels)]
+            self._lines[fmt_option] = lines
+
+        return lines
+
+    def fuzzy_index(self) -> "FuzzyIndex":
+        """
+        The 'FuzzyIndex' of the option texts. It is built on first use.
+        """
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.labels)
+        return self._fuzzy
+
+    def items(self) -> Any:
+        if self._keys is None:
+            return enumerate(self._options)
+        return self._options.items()
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._keys is None:
+            if not isinstance(key, int) or isinstance(key, bool) or key < 0:
+                raise KeyError(key)
+            try:
+                return self._options[key]
+            except IndexError:
+                raise KeyError(key) from None
+
+        return self._options[key]
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            self[key]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._keys is None:
+            return iter(range(len(self._options)))
+        return iter(self._options)
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    def __repr__(self) -> str:
+        return f"OptionSet({self._options!r})"
+
+
+# Display widths of the characters that were measured.
+_WIDTHS: Dict[str, int] = {}
+
+
+def _char_width(char: str) -> int:
+    char_width = _WIDTHS.get(char)
+
+    if char_width is None:
+        if unicodedata.combining(char) or unicodedata.category(char) in (
+            "Me",
+            "Mn",
+            "Cf",
+        ):
+            char_width = 0
+        elif unicodedata.east_asian_width(char) in ("W", "F"):
+            char_width = 2
+        else:
+            char_width = 1
+        _WIDTHS[char] = char_width
+
+    return char_width
+
+
+def display_width(text: str) -> int:
+    """
+    The number of terminal columns that 'text' takes. East Asian wide and
+    full-width characters take two columns, combining marks and format
+    characters none.
+    """
+    if text.isascii():
+        return len(text)
+
+    return sum(map(_char_width, text))
+
+
+def _truncate(text: str, width: int) -> str:
+    """
+    The start of 'text' that takes at most 'width' columns. A wide character
+    that does not fit is left out, the marks after the last character are kept.
+    """
+    if text.isascii():
+        return text[:width]
+
+    used = 0
+
+    for index, char in enumerate(text):
+        used += _char_width(char)
+        if used > width:
+            return text[:index]
+
+    return text
+
+
+def _pad(text: str, width: int, right: bool = False) -> str:
+    padding = " " * (width - display_width(text))
+    return padding + text if right else text + padding
+
+
+class Table(OptionSet):
+    """
+    An 'OptionSet' of rows, like (host, region, load) tuples or dicts, that
+    'select' shows as aligned columns. The widths of the columns are measured
+    once, when the table is built, and rows are only padded when they are
+    shown. Columns of numbers are aligned to the right.
+
+    A row is selected like an option of an 'OptionSet': by key, or by the text
+    or a unique prefix of its cells, e.g. of the first column.
+
+    The rows can be shown sorted by a column without sorting them: the order
+    for each column is computed on first use and kept. The user sorts with an
+    answer like "^2" or "^load" (SORT and a column number or title) or with
+    tab in the 'arrow_keys' mode.
+
+    :param options: A dict, or a list, tuple or other iterable whose positions are the keys. Each option is a row: a tuple, a list, a dict or a single value.
+    :param columns: The titles of the columns. For dict rows, the keys of the cells. Defaults to the keys of the first row if it is a dict, otherwise no titles are shown.
+    """
+
+    def __init__(
+        self,
+        options: Union[Mapping, Iterable[Any]],
+        columns: Optional[Sequence[str]] = None,
+    ):
+        self.columns = None if columns is None else list(columns)
+        super().__init__(options)
+
+        self._key_width = max((len(str(key)) for key in self), default=0)
+        self._texts: Dict[int, str] = {}
+        self._orders: Dict[Tuple[int, bool], Sequence[int]] = {}
+
+        # The positions in the order that is shown, and the sort column and
+        # whether it is descending.
+        self.order: Sequence[int] = range(len(self))
+        self.sorted_by: Optional[Tuple[int, bool]] = None
+
+    def _labels(self, options: Iterable[Any]) -> List[str]:
+        rows = list(options)
+        fields = self.columns
+
+        if fields is None and rows and isinstance(rows[0], Mapping):
+            fields = self.columns = list(rows[0])
+
+        values: List[Tuple[Any, ...]] = []
+
+        for row in rows:
+            if isinstance(row, Mapping):
+                values.append(tuple(row.get(field) for field in fields or ()))
+            elif isinstance(row, (tuple, list)):
+                values.append(tuple(row))
+            else:
+                values.append((row,))
+
+        count = max((len(row) for row in values), default=0)
+        count = max(count, len(self.columns or ()))
+
+        self._values = values
+        self.cells = [
+            tuple("" if value is None else str(value) for value in row)
+            + ("",) * (count - len(row))
+            for row in values
+        ]
+
+        titles = [str(title) for title in self.columns or ()]
+        titles += [""] * (count - len(titles))
+
+        self.widths: List[int] = []
+        self._numeric: List[bool] = []
+
+        for column in range(count):
+            width = display_width(titles[column])
+            numbers = 0
+
+            for row, cells in zip(values, self.cells):
+                width = max(width, display_width(cells[column]))
+                value = row[column] if column < len(row) else None
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers += 1
+                elif value is not None:
+                    numbers = -len(values)
+
+            self.widths.append(width)
+            self._numeric.append(numbers > 0)
+
+        return [" ".join(cell for cell in row if cell) for row in self.cells]
+
+    def column(self, column: Union[int, str]) -> int:
+        """
+        The index of a column, given by index or title. Raise KeyError if there
+        is no such column.
+        """
+        if isinstance(column, int) and not isinstance(column, bool):
+            if 0 <= column < len(self.widths):
+                return column
+        elif self.columns is not None:
+            titles = [str(title).casefold() for title in self.columns]
+            if str(column).casefold() in titles:
+                return titles.index(str(column).casefold())
+
+        raise KeyError(column)
+
+    def sort(
+        self,
+        column: Optional[Union[int, str]] = None,
+        descending: Optional[bool] = None,
+    ) -> None:
+        """
+        Show the rows sorted by 'column'. Sorting by the column that the rows
+        are sorted by again reverses the order, if 'descending' is not set.
+        Without a column, the rows are shown in their own order.
+        """
+        if column is None:
+            self.order = range(len(self))
+            self.sorted_by = None
+            return
+
+        column = self.column(column)
+
+        if descending is None:
+            descending = self.sorted_by == (column, False)
+
+        order = self._orders.get((column, descending))
+
+        if order is None:
+            ascending = self._orders.get((column, False))
+
+            if ascending is None:
+                ascending = array("L", self._sort(column))
+                self._orders[(column, False)] = ascending
+
+            order = ascending[::-1] if descending else ascending
+            self._orders[(column, descending)] = order
+
+        self.order = order
+        self.sorted_by = (column, descending)
+
+    def _sort(self, column: int) -> List[int]:
+        values = [row[column] if column < len(row) else None for row in self._values]
+        positions = range(len(values))
+
+        try:
+            # Empty cells last.
+            return sorted(positions, key=lambda p: (values[p] is None, values[p]))
+        except TypeError:
+            cells = [row[column].casefold() for row in self.cells]
+            return sorted(positions, key=cells.__getitem__)
+
+    def text(self, position: int) -> str:
+        """
+        The cells of the row at 'position', padded to the widths of their
+        columns.
+        """
+        text = self._texts.get(position)
+
+        if text is None:
+            text = self._line(self.cells[position])
+            self._texts[position] = text
+
+        return text
+
+    def _line(self, cells: Sequence[str]) -> str:
+        return "  ".join(
+            _pad(cell, width, numeric)
+            for cell, width, numeric in zip(cells, self.widths, self._numeric)
+        ).rstrip()
+
+    def option_line(self, fmt_option: str, position: int) -> str:
+        """
+        The row at 'position' rendered with 'fmt_option'. The keys are padded to
+        the same width, so the columns of all rows line up.
+        """
+        key = str(self._item(position)[0])
+
+        if self._keys is None:
+            key = key.rjust(self._key_width)
+        else:
+            key = key.ljust(self._key_width)
+
+        return fmt_option.format(key, self.text(position))
+
+    def option_lines(self, fmt_option: str) -> Sequence[str]:
+        """
+        The rendered rows in the order that is shown. A row is rendered when it
+        is read from the sequence.
+        """
+        return _TableLines(self, fmt_option)
+
+    def header_line(self, fmt_option: str) -> Optional[str]:
+        """
+        The titles of the columns, above the columns of rows rendered with
+        'fmt_option'. None if the table has no titles.
+        """
+        if not self.columns:
+            return None
+
+        prefix = fmt_option.format(" " * self._key_width, "\0").partition("\0")[0]
+        titles = [str(title) for title in self.columns]
+
+        return " " * display_width(prefix) + self._line(titles)
+
+    def __repr__(self) -> str:
+        return f"Table({self._options!r}, columns={self.columns!r})"
+
+
+class _TableLines(Sequence):
+    def __init__(self, table: Table, fmt_option: str):
+        self.table = table
+        self.fmt_option = fmt_option
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [
+                self.table.option_line(self.fmt_option, position)
+                for position in self.table.order[index]
+            ]
+
+        return self.table.option_line(self.fmt_option, self.table.order[index])
+
+    def __len__(self) -> int:
+        return len(self.table.order)
+
+
+class FuzzyIndex:
+    """
+    Find the texts that contain a query as a subsequence, ignoring case, e.g.
+    "fbr" matches "foo bar". Each character has a sorted list of the texts
+    that contain it, so a query of one character is answered from its list
+    and a longer query only looks at the texts in all lists of its
+    characters. The matches of a query are kept: a query that extends
+    the previous one, as while the user types, only checks those matches.
+
+    :param texts: The texts. Results are their positions.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts: List[str] = []
+        self._postings: Dict[str, Any] = {}
+
+        # (query, matches) for the last query and the queries it extends.
+        self._history: List[Tuple[str, List[int]]] = []
+
+        self.extend(texts)
+
+    def extend(self, texts: Iterable[str]) -> None:
+        """
+        Add texts, e.g. options that arrived. The kept matches are updated.
+        """
+        start = len(self.texts)
+        postings = self._postings
+
+        for position, text in enumerate(texts, start):
+            text = text.casefold()
+            self.texts.append(text)
+
+            for char in set(text):
+                positions = postings.get(char)
+                if positions is None:
+                    positions = postings[char] = array("L")
+                positions.append(position)
+
+        for query, found in self._history:
+            found.extend(
+                p
+                for p in range(start, len(self.texts))
+                if _is_subsequence(query, self.texts[p])
+            )
+
+    def matches(self, query: str) -> Sequence[int]:
+        """
+        Return the positions of the texts that match 'query', in order.
+        """
+        query = query.casefold()
+
+        if not query:
+            return range(len(self.texts))
+
+        history = self._history
+
+        while history and not query.startswith(history[-1][0]):
+            history.pop()
+
+        if history and history[-1][0] == query:
+            return history[-1][1]
+
+        if history:
+            candidates: Sequence[int] = history[-1][1]
+        elif len(query) == 1:
+            # The texts with the character are the matches.
+            found = list(self._postings.get(query, ()))
+            history.append((query, found))
+            return found
+        else:
+            candidates = self._candidates(query)
+
+        texts = self.texts
+        found = [p for p in candidates if _is_subsequence(query, texts[p])]
+        history.append((query, found))
+
+        return found
+
+    def _candidates(self, query: str) -> List[int]:
+        """
+        The positions of the texts that contain all characters of 'query',
+        the intersection of their lists, starting with the shortest.
+        """
+        lists = sorted((self._postings.get(char, ()) for char in set(query)), key=len)
+        found = set(lists[0])
+
+        for positions in lists[1:]:
+            if not found:
+                break
+            if len(found) * 16 < len(positions):
+                # Few candidates are looked up in a long list.
+                found = {p for p in found if _contains(positions, p)}
+            else:
+                found.intersection_update(positions)
+
+        return sorted(found)
+
+    def search(self, query: str, limit: int) -> Tuple[List[int], int]:
+        """
+        Return the positions of the best 'limit' matches for 'query' and the
+        number of all matches. Only the best matches are sorted, in a heap
+        of 'limit' entries. Contiguous matches at the start of a text or a
+        word rank first, then shorter texts, then earlier positions.
+        """
+        found = self.matches(query)
+
+        if not query:
+            return list(found[:limit]), len(found)
+
+        query = query.casefold()
+        texts = self.texts
+        best = heapq.nsmallest(
+            limit, found, key=lambda p: (_rank(query, texts[p]), len(texts[p]), p)
+        )
+
+        return best, len(found)
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    """
+    Whether the sorted 'positions' contain 'position'.
+    """
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+def _is_subsequence(query: str, text: str) -> bool:
+    find = text.find
+    position = 0
+
+    for char in query:
+        position = find(char, position) + 1
+        if not position:
+            return False
+
+    return True
+
+
+def _rank(query: str, text: str) -> int:
+    """
+    0 for a match at the start, 1 at the start of a word, 2 within a word,
+    more for each gap of a match that is not contiguous.
+    """
+    index = text.find(query)
+
+    if index == 0:
+        return 0
+
+    if index > 0:
+        return 1 if not text[index - 1].isalnum() else 2
+
+    gaps = 0
+    position = text.find(query[0])
+
+    for char in query[1:]:
+        found = text.find(char, position + 1)
+        gaps += found != position + 1
+        position = found
+
+    return 2 + gaps
+
+
+# Each byte inverted, and the number of bits that are set in each byte.
+_INVERT = bytes(255 - i for i in range(256))
+_POPCOUNT = bytes(bin(i).count("1") for i in range(256))
+
+
+class Selection:
+    """
+    The options chosen in a 'multi_select', as a bitset with one bit per
+    option position in a bytearray. Selecting ranges, all, none and
+    inverting work on whole bytes. Iterating yields the chosen (key, option)
+    pairs, they are looked up as they are used.
+
+    :param options: The options.
+    :param size: The number of options.
+    :param keys: The keys in the order of the positions, if 'options' is a mapping. Otherwise a position is its key.
+    """
+
+    def __init__(self, options: Any, size: int, keys: Optional[Sequence[Any]] = None):
+        self.options = options
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+        self._keys = keys
+
+    def copy(self) -> "Selection":
+        selection = Selection(self.options, self.size, self._keys)
+        selection.bits[:] = self.bits
+        return selection
+
+    def _trim(self) -> None:
+        # Clear the bits behind the last position.
+        if self.size % 8:
+            self.bits[-1] &= (1 << (self.size % 8)) - 1
+
+    def toggle(self, start: int, stop: Optional[int] = None) -> None:
+        """
+        Toggle the positions from 'start' to 'stop' (exclusive), or only 'start'.
+        """
+        if stop is None:
+            stop = start + 1
+
+        bits = self.bits
+        first = (start + 7) // 8
+        last = stop // 8
+        head = min(stop, first * 8)
+
+        for position in range(start, head):
+            bits[position >> 3] ^= 1 << (position & 7)
+
+        if first < last:
+            bits[first:last] = bits[first:last].translate(_INVERT)
+
+        for position in range(max(last * 8, head), stop):
+            bits[position >> 3] ^= 1 << (position & 7)
+
+    def select_all(self) -> None:
+        self.bits[:] = b"\xff" * len(self.bits)
+        self._trim()
+
+    def clear(self) -> None:
+        self.bits[:] = bytes(len(self.bits))
+
+    def invert(self) -> None:
+        self.bits[:] = self.bits.translate(_INVERT)
+        self._trim()
+
+    def __contains__(self, position: int) -> bool:
+        return 0 <= position < self.size and bool(
+            self.bits[position >> 3] & (1 << (position & 7))
+        )
+
+    def __len__(self) -> int:
+        return sum(self.bits.translate(_POPCOUNT))
+
+    def positions(self) -> Iterator[int]:
+        """
+        The chosen positions, in order.
+        """
+        for index, byte in enumerate(self.bits):
+            if byte:
+                start = index * 8
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield start + bit
+
+    def key(self, position: int) -> Any:
+        return position if self._keys is None else self._keys[position]
+
+    def keys(self) -> Iterator[Any]:
+        """
+        The keys of the chosen options, in order.
+        """
+        return (self.key(position) for position in self.positions())
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        options = self.options
+
+        for position in self.positions():
+            key = self.key(position)
+            yield key, options[key]
+
+    def __repr__(self) -> str:
+        return f"Selection({list(self.keys())!r})"
+
+
+_NONE = object()
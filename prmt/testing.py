@@ -0,0 +1,148 @@
+"""
+Drive prompts from tests, without a terminal.
+
+    io = ScriptedIO("joe", "y")
+    assert prmt.string("Name?", io=io) == "joe"
+    assert prmt.confirm("Continue?", io=io) is True
+    assert "Name?" in io.take_output()
+"""
+from typing import Callable, List, Optional, Tuple
+import io as _io
+
+from prmt import AnswerBuffer, PromptIO, Terminal
+
+
+class ScriptInput:
+    """
+    An input stream that is fed with text while it is read.
+    """
+
+    def __init__(self, interactive: bool = True):
+        self._interactive = interactive
+        self._text = ""
+        self._pos = 0
+        self._pending: List[str] = []
+
+    def feed(self, text: str) -> None:
+        self._pending.append(text)
+
+    def _fill(self) -> bool:
+        if not self._pending:
+            return False
+        self._text = self._text[self._pos :] + "".join(self._pending)
+        self._pos = 0
+        self._pending = []
+        return True
+
+    def readline(self) -> str:
+        end = self._text.find("\n", self._pos)
+
+        while end == -1 and self._fill():
+            end = self._text.find("\n", self._pos)
+
+        start = self._pos
+        self._pos = len(self._text) if end == -1 else end + 1
+
+        return self._text[start : self._pos]
+
+    def read(self, size: int = -1) -> str:
+        self._fill()
+
+        start = self._pos
+        self._pos = len(self._text) if size < 0 else min(start + size, len(self._text))
+
+        return self._text[start : self._pos]
+
+    def remaining(self) -> str:
+        self._fill()
+        return self._text[self._pos :]
+
+    def isatty(self) -> bool:
+        return self._interactive
+
+
+class ScriptedIO(PromptIO):
+    """
+    A 'PromptIO' that reads scripted answers and captures the rendered output
+    in memory.
+
+    Prompts with a 'timeout' time out right away when the script has no more
+    answers, as if nobody answered.
+
+    :param answers: Lines that are fed to the prompts, one per answer.
+    :param interactive: Behave like a terminal. If False, behave like a pipe.
+    :param size: Terminal size as (columns, lines).
+    :param editor: Called with the initial editor text instead of opening an editor. Returns the edited text. By default editor answers are read from the script like multiline answers.
+    """
+
+    def __init__(
+        self,
+        *answers: str,
+        interactive: bool = True,
+        size: Tuple[int, int] = (80, 24),
+        editor: Optional[Callable[[str], str]] = None,
+    ):
+        self.script = ScriptInput(interactive)
+        self.editor = editor
+
+        super().__init__(
+            input=self.script,
+            output=_io.StringIO(),
+            terminal=Terminal(interactive=interactive, size=size),
+            echo=None,
+        )
+
+        if not interactive:
+            self.echo = self.output
+            self.renders = True
+
+        self.feed(*answers)
+
+    def feed(self, *answers: str) -> None:
+        """
+        Feed answers. Each answer is sent as a line.
+        """
+        if answers:
+            self.script.feed("\n".join(answers) + "\n")
+
+    def feed_keys(self, keys: str) -> None:
+        """
+        Feed raw keystrokes, e.g. "abc\\n" or "\\x04" (ctrl+d).
+        """
+        self.script.feed(keys)
+
+    def getvalue(self) -> str:
+        """
+        Return the output rendered so far.
+        """
+        return self.output.getvalue()
+
+    def take_output(self) -> str:
+        """
+        Return the output rendered so far and clear it.
+        """
+        output = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate()
+        return output
+
+    def _readline_until(self, deadline: float, on_tick=None) -> str:
+        if not self._pending and not self.script.remaining():
+            raise TimeoutError
+
+        return self._readline()
+
+    def read_editor(
+        self,
+        prompt: str,
+        buffer: AnswerBuffer,
+        *timed,
+        **editor_args,
+    ) -> AnswerBuffer:
+        if self.editor is None:
+            return self.read_multiline(prompt, buffer, *timed)
+
+        self.write(prompt)
+        buffer.write(self.editor(editor_args.get("default") or ""))
+
+        return buffer
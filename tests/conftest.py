@@ -0,0 +1,25 @@
+import io
+import sys
+
+import pytest
+
+
+class TTYStringIO(io.StringIO):
+    def isatty(self):
+        return True
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """
+    Replace stdin with the given lines. By default stdin pretends to be a
+    terminal, so the prompts are rendered.
+    """
+
+    def feed(*lines, tty=True):
+        text = "".join(line + "\n" for line in lines)
+        monkeypatch.setattr(
+            sys, "stdin", TTYStringIO(text) if tty else io.StringIO(text)
+        )
+
+    return feed
@@ -0,0 +1,342 @@
+"""
+Run prompt scenarios under a pseudo-terminal with scripted keystrokes and
+check the rendered screen with a minimal VT100 screen model.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import ast
+import fcntl
+import os
+import pty
+import select
+import signal
+import struct
+import sys
+import tempfile
+import termios
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMEOUT = 10.0
+
+
+class Screen:
+    """
+    A minimal VT100 screen. It understands printable text, CR, LF, BS, TAB,
+    cursor movement (CSI A, B, C, D, G, H, f), saving and restoring the cursor
+    (ESC 7, ESC 8) and erasing (CSI J, K). Other escape sequences are ignored. Lines that scroll off the top are kept in
+    'history'.
+    """
+
+    def __init__(self, columns: int = 80, lines: int = 24):
+        self.columns = columns
+        self.lines = lines
+        self.history: List[str] = []
+        self.grid = [[" "] * columns for _ in range(lines)]
+        self.x = 0
+        self.y = 0
+        self._saved = (0, 0)
+        self._pending = ""
+
+    def _newline(self) -> None:
+        if self.y == self.lines - 1:
+            self.history.append("".join(self.grid.pop(0)).rstrip())
+            self.grid.append([" "] * self.columns)
+        else:
+            self.y += 1
+
+    def _put(self, char: str) -> None:
+        if self.x >= self.columns:
+            self.x = 0
+            self._newline()
+        self.grid[self.y][self.x] = char
+        self.x += 1
+
+    def _csi(self, params: str, final: str) -> None:
+        args = [int(p) if p.isdigit() else 0 for p in params.lstrip("?").split(";")]
+        n = args[0] or 1
+
+        if final == "A":
+            self.y = max(0, self.y - n)
+        elif final == "B":
+            self.y = min(self.lines - 1, self.y + n)
+        elif final == "C":
+            self.x = min(self.columns - 1, self.x + n)
+        elif final == "D":
+            self.x = max(0, self.x - n)
+        elif final == "G":
+            self.x = min(self.columns - 1, n - 1)
+        elif final in "Hf":
+            row = args[0] or 1
+            col = args[1] if len(args) > 1 and args[1] else 1
+            self.y = min(self.lines - 1, row - 1)
+            self.x = min(self.columns - 1, col - 1)
+        elif final == "K":
+            line = self.grid[self.y]
+            if args[0] == 0:
+                line[self.x :] = [" "] * (self.columns - self.x)
+            elif args[0] == 1:
+                line[: self.x + 1] = [" "] * (self.x + 1)
+            else:
+                line[:] = [" "] * self.columns
+        elif final == "J":
+            if args[0] == 0:
+                self._csi("0", "K")
+                for row in range(self.y + 1, self.lines):
+                    self.grid[row] = [" "] * self.columns
+            elif args[0] == 1:
+                self._csi("1", "K")
+                for row in range(0, self.y):
+                    self.grid[row] = [" "] * self.columns
+            else:
+                self.grid = [[" "] * self.columns for _ in range(self.lines)]
+
+    def feed(self, text: str) -> None:
+        text = self._pending + text
+        self._pending = ""
+        i = 0
+        end = len(text)
+
+        while i < end:
+            char = text[i]
+
+            if char == "\x1b":
+                if i + 1 >= end:
+                    self._pending = text[i:]
+                    return
+                if text[i + 1] == "[":
+                    j = i + 2
+                    while j < end and not ("@" <= text[j] <= "~"):
+                        j += 1
+                    if j >= end:
+                        self._pending = text[i:]
+                        return
+                    self._csi(text[i + 2 : j], text[j])
+                    i = j + 1
+                else:
+                    if text[i + 1] == "7":
+                        self._saved = (self.x, self.y)
+                    elif text[i + 1] == "8":
+                        self.x, self.y = self._saved
+                    i += 2
+                continue
+
+            if char == "\r":
+                self.x = 0
+            elif char == "\n":
+                self._newline()
+            elif char == "\b":
+                self.x = max(0, self.x - 1)
+            elif char == "\t":
+                self.x = min(self.columns - 1, (self.x // 8 + 1) * 8)
+            elif char >= " ":
+                self._put(char)
+
+            i += 1
+
+    def display(self) -> List[str]:
+        """
+        The visible lines, without trailing whitespace. On the cursor line the
+        whitespace before the cursor is kept, so prompts like "> " match.
+        """
+        lines = ["".join(line).rstrip() for line in self.grid]
+        cursor_line = lines[self.y]
+
+        if len(cursor_line) < self.x:
+            lines[self.y] = "".join(self.grid[self.y][: self.x])
+
+        return lines
+
+    def text(self) -> str:
+        """
+        The scrolled off lines and the visible lines.
+        """
+        return "\n".join(self.history + self.display()).rstrip("\n")
+
+
+class Session:
+    """
+    A child process that runs on a pseudo-terminal.
+    """
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        env: Optional[Dict[str, str]] = None,
+        size: Tuple[int, int] = (80, 24),
+    ):
+        self.screen = Screen(*size)
+        self.pid, self.fd = pty.fork()
+
+        if self.pid == 0:  # pragma: no cover
+            os.chdir(ROOT)
+            os.execve(argv[0], list(argv), env or os.environ.copy())
+
+        columns, lines = size
+        fcntl.ioctl(
+            self.fd, termios.TIOCSWINSZ, struct.pack("HHHH", lines, columns, 0, 0)
+        )
+        self._decoder = _decoder()
+        self.closed = False
+        self.status: Optional[int] = None
+
+    def _read(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+
+        if not ready:
+            return False
+
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError:
+            data = b""
+
+        if not data:
+            self.closed = True
+            return False
+
+        self.screen.feed(self._decoder.decode(data))
+        return True
+
+    def expect(self, text: str, timeout: float = TIMEOUT) -> None:
+        """
+        Wait until 'text' appears on the screen.
+        """
+        deadline = time.monotonic() + timeout
+
+        while text not in self.screen.text():
+            remaining = deadline - time.monotonic()
+            if self.closed or remaining <= 0:
+                raise AssertionError(
+                    f"Timeout waiting for {text!r}. Screen:\n{self.screen.text()}"
+                )
+            self._read(remaining)
+
+    def send(self, keys: str) -> None:
+        os.write(self.fd, keys.encode())
+
+    def wait(self, timeout: float = TIMEOUT) -> int:
+        """
+        Read the remaining output and wait for the child to exit.
+        """
+        deadline = time.monotonic() + timeout
+
+        while not self.closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.kill()
+                raise AssertionError(f"Timeout. Screen:\n{self.screen.text()}")
+            self._read(remaining)
+
+        _, status = os.waitpid(self.pid, 0)
+        os.close(self.fd)
+        if os.WIFEXITED(status):
+            self.status = os.WEXITSTATUS(status)
+        else:
+            self.status = -os.WTERMSIG(status)
+
+        return self.status
+
+    def kill(self) -> None:
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _decoder():
+    import codecs
+
+    return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+class Scenario(NamedTuple):
+    """
+    A prompt scenario.
+
+    :param name: Unique name.
+    :param code: A Python expression that runs the prompt(s).
+    :param steps: (text, keys) pairs. Wait for 'text' on the screen, then send 'keys'.
+    :param result: The expected value of 'code'.
+    :param screen: Texts that must be on the screen at the end.
+    :param setup: Python statements that run before 'code'.
+    :param env: Additional environment variables.
+    """
+
+    name: str
+    code: str
+    steps: Sequence[Tuple[str, str]]
+    result: Any
+    screen: Sequence[str] = ()
+    setup: str = ""
+    env: Optional[Dict[str, str]] = None
+
+
+CHILD = """\
+import os
+import prmt
+{setup}
+result = {code}
+with open(os.environ["PRMT_TEST_RESULT"], "w") as f:
+    f.write(repr(result))
+"""
+
+EDITOR = """\
+#!/bin/sh
+printf '%s' "$PRMT_TEST_EDITOR_TEXT" >> "$1"
+"""
+
+
+def _stub_editor(directory: str) -> str:
+    path = os.path.join(directory, "editor.sh")
+    with open(path, "w") as f:
+        f.write(EDITOR)
+    os.chmod(path, 0o755)
+    return path
+
+
+def run_scenario(scenario: Scenario) -> Optional[str]:
+    """
+    Run a scenario. Return an error message if it failed, None otherwise.
+    """
+    with tempfile.TemporaryDirectory(prefix="prmt-test-") as tmp:
+        result_file = os.path.join(tmp, "result")
+
+        env = os.environ.copy()
+        env.pop("PRMT_ANSWERS", None)
+        env.update(
+            TERM="vt100",
+            PRMT_TEST_RESULT=result_file,
+            EDITOR=_stub_editor(tmp),
+        )
+        env.update(scenario.env or {})
+
+        code = CHILD.format(setup=scenario.setup, code=scenario.code)
+        session = Session([sys.executable, "-c", code], env=env)
+
+        try:
+            for text, keys in scenario.steps:
+                session.expect(text)
+                session.send(keys)
+
+            status = session.wait()
+        except AssertionError as e:
+            session.kill()
+            return f"{scenario.name}: {e}"
+
+        screen = session.screen.text()
+
+        if status != 0:
+            return f"{scenario.name}: exit status {status}. Screen:\n{screen}"
+
+        with open(result_file) as f:
+            result = ast.literal_eval(f.read())
+
+        if result != scenario.result or type(result) is not type(scenario.result):
+            return f"{scenario.name}: result {result!r} != {scenario.result!r}"
+
+        for text in scenario.screen:
+            if text not in screen:
+                return f"{scenario.name}: {text!r} not on screen:\n{screen}"
+
+    return None
@@ -0,0 +1,361 @@
+"""
+The prompt scenarios that run under a pseudo-terminal.
+"""
+from tests.pty_harness import Scenario
+
+ENTER = "\r"
+CTRL_C = "\x03"
+CTRL_D = "\x04"
+UP = "\x1b[A"
+DOWN = "\x1b[B"
+PAGE_DOWN = "\x1b[6~"
+
+SCENARIOS = [
+    # String
+    Scenario(
+        name="string.simple",
+        code='prmt.string(question="Enter string:")',
+        steps=[("> ", "hello" + ENTER)],
+        result="hello",
+        screen=["Enter string:\n> hello"],
+    ),
+    Scenario(
+        name="string.default",
+        code='prmt.string(question="Enter string:", default="Joe")',
+        steps=[("[Joe]> ", ENTER)],
+        result="Joe",
+    ),
+    Scenario(
+        name="string.short",
+        code='prmt.string(question="Enter string", fmt_question="{} ", fmt_prompt="> {}")',
+        steps=[("Enter string > ", "foo" + ENTER)],
+        result="foo",
+    ),
+    Scenario(
+        name="string.short_default",
+        code=(
+            'prmt.string(question="Enter string", default="James", '
+            'fmt_question="{} ", fmt_default="[{}] ", fmt_prompt="> {}")'
+        ),
+        steps=[("Enter string [James] > ", ENTER)],
+        result="James",
+    ),
+    Scenario(
+        name="string.blacklist",
+        code='prmt.string(question="Enter string:", blacklist=[""])',
+        steps=[("> ", ENTER), ("Invalid input.", "bar" + ENTER)],
+        result="bar",
+    ),
+    Scenario(
+        name="string.multiline_ctrl_d",
+        code='prmt.string(question="Enter text:", multiline=True)',
+        steps=[("> ", "line 1" + ENTER + "line 2" + ENTER + CTRL_D)],
+        result="line 1\nline 2\n",
+        screen=["line 1\nline 2"],
+    ),
+    Scenario(
+        name="string.multiline_ctrl_c",
+        code='prmt.string(question="Enter text:", multiline=True)',
+        steps=[("> ", "line 1" + ENTER), ("line 1", CTRL_C)],
+        result="line 1\n",
+    ),
+    Scenario(
+        name="string.multiline_typeahead",
+        code=(
+            '(prmt.string(question="Enter text:", multiline=True), '
+            'prmt.string(question="Name:"))'
+        ),
+        # Both answers in a single write.
+        steps=[("> ", "abc" + CTRL_D + "second" + ENTER)],
+        result=("abc", "second"),
+    ),
+    Scenario(
+        name="string.multiline_default",
+        code='prmt.string(question="Enter text:", default="none", multiline=True)',
+        steps=[("[none]> ", CTRL_D)],
+        result="none",
+    ),
+    # Editor
+    Scenario(
+        name="editor.simple",
+        code='prmt.string_from_editor(question="Enter string (In editor)")',
+        steps=[],
+        result="edited",
+        env={"PRMT_TEST_EDITOR_TEXT": "edited"},
+        screen=["(In editor)\n> edited"],
+    ),
+    Scenario(
+        name="editor.default",
+        code=(
+            'prmt.string_from_editor(question="Enter string", '
+            'default="default value", instruction="Custom Instruction.")'
+        ),
+        steps=[],
+        result="more",
+        env={"PRMT_TEST_EDITOR_TEXT": "more"},
+    ),
+    Scenario(
+        name="editor.untouched_default",
+        code='prmt.string_from_editor(question="Enter string", default="value")',
+        steps=[],
+        result="value",
+        env={"PRMT_TEST_EDITOR_TEXT": ""},
+    ),
+    # Confirm
+    Scenario(
+        name="confirm.yes",
+        code='prmt.confirm(question="Confirm [y|n]:")',
+        steps=[("> ", "y" + ENTER)],
+        result=True,
+    ),
+    Scenario(
+        name="confirm.retry",
+        code='prmt.confirm(question="Confirm [y|n]:")',
+        steps=[("> ", "maybe" + ENTER), ("maybe", "no" + ENTER)],
+        result=False,
+    ),
+    Scenario(
+        name="confirm.default",
+        code='prmt.confirm(question="Confirm [y|n]:", default="y")',
+        steps=[("[y]> ", ENTER)],
+        result=True,
+    ),
+    # Select
+    Scenario(
+        name="select.list",
+        code='prmt.select(question="Select item:", options=["a", "b", "c"])',
+        steps=[("> ", "2" + ENTER)],
+        result=(2, "c"),
+        screen=["Select item:\n\n  0: a\n  1: b\n  2: c\n\n> 2"],
+    ),
+    Scenario(
+        name="select.list_retry",
+        code='prmt.select(question="Select item:", options=["a", "b"])',
+        steps=[("> ", "7" + ENTER), ("> 7", "0" + ENTER)],
+        result=(0, "a"),
+    ),
+    Scenario(
+        name="select.default",
+        code=(
+            'prmt.select(question="Select item:", '
+            'options=["a", "Enter custom string", "c"], default=1)'
+        ),
+        steps=[("[1]> ", ENTER)],
+        result=(1, "Enter custom string"),
+    ),
+    Scenario(
+        name="select.custom",
+        code=(
+            'prmt.select(question="Select item:", '
+            'options=["a", "Enter custom string", "c"], default=1, custom_key=1)'
+        ),
+        steps=[("[1]> ", ENTER), ("Enter custom string\n> ", "custom" + ENTER)],
+        result=(1, "custom"),
+    ),
+    Scenario(
+        name="select.dict_int_keys",
+        code='prmt.select(question="Select item:", options={0: "a", 1: "b", 2: "c"})',
+        steps=[("> ", "1" + ENTER)],
+        result=(1, "b"),
+    ),
+    Scenario(
+        name="select.dict_str_keys",
+        code=(
+            'prmt.select(question="Select item:", '
+            'options={"0": "a", "1": "b", "2": "c"}, default=1)'
+        ),
+        steps=[("[1]> ", ENTER)],
+        result=("1", "b"),
+    ),
+    Scenario(
+        name="select.word_keys",
+        code=(
+            'prmt.select(question="Select item:", '
+            'options={"foo": 0, "bar": 1, "baz": 2}, default="bar")'
+        ),
+        steps=[("[bar]> ", "baz" + ENTER)],
+        result=("baz", 2),
+        screen=["  foo: 0\n  bar: 1\n  baz: 2"],
+    ),
+    Scenario(
+        name="select.word_keys_custom",
+        code=(
+            'prmt.select(question="Select item:", '
+            'options={"foo": "Enter custom value", "bar": 1}, '
+            'default="foo", custom_key="foo")'
+        ),
+        steps=[("[foo]> ", ENTER), ("Enter custom value\n> ", "mine" + ENTER)],
+        result=("foo", "mine"),
+    ),
+    # List of string
+    Scenario(
+        name="list_of_string.simple",
+        code='prmt.list_of_string(question="Enter values:")',
+        steps=[("> ", "a, b ,c" + ENTER)],
+        result=["a", "b", "c"],
+    ),
+    Scenario(
+        name="list_of_string.default",
+        code='prmt.list_of_string(question="Enter values:", default=["lol", "nice"])',
+        steps=[("[lol, nice]> ", ENTER)],
+        result=["lol", "nice"],
+    ),
+    Scenario(
+        name="list_of_string.blacklist",
+        code=(
+            'prmt.list_of_string(question="Enter values:", '
+            'default="lol, nice", blacklist=["lol"])'
+        ),
+        steps=[("> ", ENTER), ("Invalid input.", "nice" + ENTER)],
+        result=["nice"],
+    ),
+    # Integer
+    Scenario(
+        name="integer.simple",
+        code='prmt.integer(question="Enter int:")',
+        steps=[("> ", "42" + ENTER)],
+        result=42,
+    ),
+    Scenario(
+        name="integer.retry",
+        code='prmt.integer(question="Enter int:", blacklist=[None])',
+        steps=[("> ", "x" + ENTER), ("Invalid input.", ENTER), ("> ", "3" + ENTER)],
+        result=3,
+    ),
+    # Prompt class
+    Scenario(
+        name="prompt.string",
+        setup='prompt = prmt.Prompt(fmt_question="[A]{}[B]", fmt_string_default="[C]{}[D]")',
+        code='prompt.string(question="Enter string:", default="foo")',
+        steps=[("[A]Enter string:[B][C]foo[D]> ", ENTER)],
+        result="foo",
+    ),
+    Scenario(
+        name="prompt.editor",
+        setup='prompt = prmt.Prompt(fmt_question="[A]{}[B]")',
+        code='prompt.string_from_editor(question="Enter string")',
+        steps=[],
+        result="text",
+        env={"PRMT_TEST_EDITOR_TEXT": "text"},
+        screen=["[A]Enter string[B]> text"],
+    ),
+    Scenario(
+        name="prompt.confirm",
+        setup='prompt = prmt.Prompt(fmt_question="{} ", fmt_prompt="? {}")',
+        code='prompt.confirm(question="Confirm")',
+        steps=[("Confirm ? ", "n" + ENTER)],
+        result=False,
+    ),
+    Scenario(
+        name="prompt.select",
+        setup='prompt = prmt.Prompt(fmt_select_option="{}) {}")',
+        code='prompt.select(question="Select item:", options=["a", "b"])',
+        steps=[("1) b", "1" + ENTER)],
+        result=(1, "b"),
+    ),
+    # Async
+    Scenario(
+        name="aio.confirm",
+        setup="import asyncio, prmt.aio",
+        code='asyncio.run(prmt.aio.confirm(question="Continue?"))',
+        steps=[("> ", "maybe" + ENTER), ("> ", "y" + ENTER)],
+        result=True,
+    ),
+    Scenario(
+        name="aio.multiline_ctrl_d",
+        setup="import asyncio, prmt.aio",
+        code='asyncio.run(prmt.aio.string(question="Enter text:", multiline=True))',
+        steps=[("> ", "line 1" + ENTER + "line 2" + ENTER + CTRL_D)],
+        result="line 1\nline 2\n",
+    ),
+    Scenario(
+        name="aio.editor",
+        setup="import asyncio, prmt.aio",
+        code='asyncio.run(prmt.aio.string_from_editor(question="Enter string"))',
+        steps=[],
+        result="edited",
+        env={"PRMT_TEST_EDITOR_TEXT": "edited"},
+        screen=["> edited"],
+    ),
+    # Timeout
+    Scenario(
+        name="timeout.default",
+        code='prmt.string(question="Name:", default="anon", timeout=0.3)',
+        steps=[],
+        result="anon",
+    ),
+    Scenario(
+        name="timeout.countdown",
+        code='prmt.string(question="Name:", timeout=2, countdown=True)',
+        steps=[("1s left", "joe" + ENTER)],
+        result="joe",
+        screen=["Name:\n1s left\n> joe"],
+    ),
+    Scenario(
+        name="timeout.multiline",
+        setup="import termios",
+        code=(
+            '(prmt.string(question="Text:", multiline=True, default="none", '
+            "timeout=0.5), bool(termios.tcgetattr(0)[3] & termios.ICANON))"
+        ),
+        steps=[("> ", "abc")],
+        result=("none", True),
+    ),
+    Scenario(
+        name="timeout.select",
+        code='prmt.select(question="Pick", options=["a", "b"], default=1, timeout=0.3)',
+        steps=[],
+        result=(1, "b"),
+    ),
+    # Filter
+    Scenario(
+        name="select.filter",
+        setup="import termios",
+        code=(
+            'prmt.select(question="Host?", options=["web-1", "web-2", "db-main", '
+            '"db-replica"], filter=True), bool(termios.tcgetattr(0)[3] & termios.ECHO)'
+        ),
+        steps=[("> ", "db"), ("2 of 4", DOWN + DOWN + UP + DOWN + ENTER)],
+        result=((3, "db-replica"), True),
+        screen=["Host?\n\n  2: db-main\n  3: db-replica\n\n\n  2 of 4\n\n> 3"],
+    ),
+    # Arrow keys
+    Scenario(
+        name="select.arrow_keys",
+        code=(
+            'prmt.select(question="Pick", options=[f"option {i}" for i in range(50)], '
+            "arrow_keys=True, page_size=4)"
+        ),
+        steps=[("1 of 50", PAGE_DOWN), ("5 of 50", DOWN + DOWN + ENTER)],
+        result=(6, "option 6"),
+        screen=["  6: option 6\n  7: option 7\n  7 of 50\n\n> 6"],
+    ),
+    # Streams
+    Scenario(
+        name="select.stream",
+        setup=(
+            "import time\n"
+            "def hosts():\n"
+            "    for i in range(1000):\n"
+            "        time.sleep(0.02)\n"
+            "        yield f'host {i}'\n"
+        ),
+        code='prmt.select("Host?", prmt.OptionStream(hosts()), page_size=4)',
+        steps=[("  3: host 3", DOWN + DOWN + ENTER)],
+        result=(2, "host 2"),
+        screen=["loading"],
+    ),
+    Scenario(
+        name="select.stream_async",
+        setup=(
+            "import asyncio\n"
+            "async def hosts():\n"
+            "    for i in range(1000):\n"
+            "        await asyncio.sleep(0.02)\n"
+            "        yield f'host {i}'\n"
+        ),
+        code='prmt.select("Host?", hosts(), filter=True, page_size=4)',
+        steps=[("  1: host 1", "t 1" + ENTER)],
+        result=(1, "host 1"),
+    ),
+]
@@ -0,0 +1,244 @@
+import asyncio
+import multiprocessing
+import os
+import stat
+
+import pytest
+
+import prmt
+import prmt.aio
+from prmt.testing import ScriptedIO
+
+
+def _pipe_io(interactive=False):
+    """
+    A PromptIO that reads from a pipe. Returns the io and the write end.
+    """
+    r, w = os.pipe()
+    io = prmt.PromptIO(
+        input=os.fdopen(r, "r"),
+        output=open(os.devnull, "w"),
+        terminal=prmt.Terminal(interactive=interactive),
+    )
+    return io, w
+
+
+def test_scripted_answers():
+    io = ScriptedIO("joe", "x", "5", "y", "a, b", "1")
+
+    async def main():
+        return [
+            await prmt.aio.string("Name?", io=io),
+            await prmt.aio.integer("Number?", io=io),
+            await prmt.aio.confirm("Continue?", io=io),
+            await prmt.aio.list_of_string("Items?", io=io),
+            await prmt.aio.select("Pick", ["a", "b"], io=io),
+        ]
+
+    assert asyncio.run(main()) == ["joe", 5, True, ["a", "b"], (1, "b")]
+    assert "Invalid input." in io.getvalue()
+
+
+def test_answer_cache(tmp_path):
+    prmt.set_answer_cache(tmp_path / "answers.json")
+
+    async def main(io):
+        return [
+            await prmt.aio.integer("Number?", prompt_id="number", io=io),
+            await prmt.aio.select("Pick", ["a", "b"], prompt_id="pick", io=io),
+        ]
+
+    try:
+        assert asyncio.run(main(ScriptedIO("5", "1"))) == [5, (1, "b")]
+        assert asyncio.run(main(ScriptedIO("", ""))) == [5, (1, "b")]
+    finally:
+        prmt.set_answer_cache(None)
+
+
+def test_prompt_does_not_block_the_loop():
+    io, w = _pipe_io()
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0.001)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        asyncio.get_running_loop().call_later(0.05, os.write, w, b"y\n")
+        answer = await prmt.aio.confirm("Continue?", io=io)
+        task.cancel()
+        return answer
+
+    assert asyncio.run(main()) is True
+    assert len(ticks) > 5
+    os.close(w)
+
+
+def test_wait_for_cancels_the_prompt():
+    io, w = _pipe_io()
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(prmt.aio.string("Name?", io=io), 0.01)
+
+        os.write(w, b"joe\nann\n")
+
+        return [
+            await prmt.aio.string("Name?", io=io),
+            await prmt.aio.string("Name?", io=io),
+        ]
+
+    assert asyncio.run(main()) == ["joe", "ann"]
+    os.close(w)
+
+
+def test_multiline_from_pipe():
+    io, w = _pipe_io()
+    os.write(w, b"a\nb\n.\nnext\n")
+    os.close(w)
+
+    async def main():
+        return [
+            await prmt.aio.string("Text?", multiline=True, io=io),
+            await prmt.aio.string("Next?", io=io),
+        ]
+
+    assert asyncio.run(main()) == ["a\nb\n", "next"]
+
+
+def test_many_buffered_lines(monkeypatch):
+    from prmt.aio import _Reader
+
+    r, w = os.pipe()
+    os.write(w, b"".join(b"line %d\n" % i for i in range(5000)) + b"rest")
+    os.close(w)
+
+    copied = []
+    real_fill = _Reader._fill
+
+    async def fill(self):
+        copied.append(len(self._text) - self._pos)
+        return await real_fill(self)
+
+    monkeypatch.setattr(_Reader, "_fill", fill)
+
+    async def main():
+        reader = _Reader(r, "utf-8")
+        lines = [await reader.readline() for _ in range(5001)]
+        reader.unread("again\n")
+        return lines, await reader.readline(), await reader.readline()
+
+    lines, again, end = asyncio.run(main())
+    os.close(r)
+
+    assert lines[0] == "line 0\n" and lines[4999] == "line 4999\n"
+    assert lines[5000] == "rest"
+    assert (again, end) == ("again\n", "")
+    # The text that is kept when the next chunk is read is what was not used.
+    assert max(copied) < 20
+
+
+def test_end_of_input():
+    io, w = _pipe_io()
+    os.close(w)
+
+    with pytest.raises(EOFError):
+        asyncio.run(prmt.aio.string("Name?", io=io))
+
+
+def test_retries_exhausted():
+    io = ScriptedIO("x", "x")
+
+    with pytest.raises(prmt.RetriesExhausted):
+        asyncio.run(prmt.aio.integer("Number?", max_retries=1, io=io))
+
+
+def test_editor_runs_as_subprocess(tmp_path, monkeypatch):
+    script = tmp_path / "editor.sh"
+    script.write_text("#!/bin/sh\nprintf 'edited' >> \"$1\"\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("EDITOR", str(script))
+
+    io, w = _pipe_io(interactive=True)
+
+    answer = asyncio.run(prmt.aio.string_from_editor("Text?", default="x", io=io))
+
+    assert answer == "edited"
+    os.close(w)
+
+
+def test_editor_answer_above_the_template(tmp_path, monkeypatch):
+    script = tmp_path / "editor.sh"
+    script.write_text(
+        '#!/bin/sh\nprintf \'edited\' > "$1.new"\ncat "$1" >> "$1.new"\n'
+        'cat "$1.new" > "$1"\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("EDITOR", str(script))
+
+    io, w = _pipe_io(interactive=True)
+
+    answer = asyncio.run(prmt.aio.string_from_editor("Text?", io=io))
+
+    assert answer == "edited"
+    os.close(w)
+
+
+def test_hook_events():
+    events = []
+    prmt.add_hook(events.append)
+    try:
+        asyncio.run(prmt.aio.confirm("Continue?", io=ScriptedIO("maybe", "y")))
+
+        io, w = _pipe_io()
+
+        async def cancelled():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(prmt.aio.string("Name?", io=io), 0.01)
+
+        asyncio.run(cancelled())
+        os.close(w)
+    finally:
+        prmt.remove_hook(events.append)
+
+    assert [(e.type, e.status, e.retries) for e in events] == [
+        ("confirm", "answered", 1),
+        ("string", "cancelled", 0),
+    ]
+
+
+def _ask_async(_):
+    async def main():
+        return [
+            await prmt.aio.integer("Number?"),
+            await prmt.aio.select("Pick", ["a", "b"]),
+        ]
+
+    return asyncio.run(main())
+
+
+def test_prompts_go_to_the_broker():
+    io = ScriptedIO("x", "5", "1")
+
+    with prmt.PromptBroker(io=io):
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            assert pool.map(_ask_async, [None]) == [[5, (1, "b")]]
+
+    assert "Invalid input." in io.getvalue()
+
+
+def test_answers_source():
+    prmt.set_answers({"Number?": "7", "Pick": "b"})
+
+    async def main():
+        return [
+            await prmt.aio.integer("Number?", io=ScriptedIO()),
+            await prmt.aio.select("Pick", {"a": 1, "b": 2}, io=ScriptedIO()),
+        ]
+
+    try:
+        assert asyncio.run(main()) == [7, ("b", 2)]
+    finally:
+        prmt.set_answers(None)
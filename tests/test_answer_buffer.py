@@ -0,0 +1,101 @@
+import os
+import stat
+import tempfile
+
+import pytest
+
+import prmt
+
+
+def test_buffer_joins_chunks():
+    buffer = prmt.AnswerBuffer()
+    for chunk in ["foo", "\n", "bär"]:
+        buffer.write(chunk)
+
+    assert buffer.getvalue() == "foo\nbär"
+    assert buffer.size == len("foo\nbär".encode("utf-8"))
+    assert not buffer.rejected
+
+
+def test_buffer_rejects_above_limit():
+    buffer = prmt.AnswerBuffer(max_bytes=4)
+    buffer.write("abc")
+    buffer.write("de")
+    buffer.write("f")
+
+    assert buffer.rejected
+    assert buffer.getvalue() == ""
+
+
+def test_buffer_spills_above_limit():
+    buffer = prmt.AnswerBuffer(max_bytes=4, overflow="spill")
+    buffer.write("abc")
+    buffer.write("defg")
+
+    result = buffer.getvalue()
+
+    assert not isinstance(result, str)
+    assert os.path.exists(result.name)
+    assert result.read() == "abcdefg"
+
+    result.close()
+    assert not os.path.exists(result.name)
+
+
+def test_buffer_invalid_overflow():
+    with pytest.raises(ValueError):
+        prmt.AnswerBuffer(overflow="truncate")
+
+
+@pytest.fixture
+def editor(tmp_path, monkeypatch, feed):
+    feed()
+    script = tmp_path / "editor.sh"
+    script.write_text('#!/bin/sh\nprintf "%s" "$PRMT_TEST_TEXT" >> "$1"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("EDITOR", str(script))
+    return monkeypatch
+
+
+def test_editor_strips_template(editor, capsys):
+    editor.setenv("PRMT_TEST_TEXT", "hello")
+
+    assert prmt.string_from_editor("Question?") == "hello"
+
+
+def test_editor_strips_template_after_the_answer(tmp_path, monkeypatch, feed, capsys):
+    feed()
+    script = tmp_path / "editor.sh"
+    # Types on the first line, above the instruction.
+    script.write_text(
+        '#!/bin/sh\nprintf "hello" > "$1.new"\ncat "$1" >> "$1.new"\ncat "$1.new" > "$1"\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("EDITOR", str(script))
+
+    assert prmt.string_from_editor("Question?") == "hello"
+    assert prmt.string_from_editor("Question?", default="text") == "hello"
+
+
+def test_template_is_removed_across_chunks():
+    from prmt._editor import _read_answer
+
+    q = "\n# Lines starting with '#' will be ignored.\n"
+    text = "a" * 65530 + q + "b" + q
+
+    with tempfile.TemporaryFile("w+") as f:
+        f.write(text)
+        buffer = prmt.AnswerBuffer()
+        _read_answer(f, q, buffer)
+
+    assert buffer.getvalue() == "a" * 65530 + "b"
+
+
+def test_editor_spills_big_answer(editor, capsys):
+    text = "x" * 100000
+    editor.setenv("PRMT_TEST_TEXT", text)
+
+    answer = prmt.string_from_editor("Question?", max_bytes=1000, overflow="spill")
+
+    with answer:
+        assert answer.read() == text
@@ -0,0 +1,185 @@
+import json
+import os
+import stat
+
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = prmt.set_answer_cache(prmt.AnswerCache(tmp_path / "answers.json"))
+    yield cache
+    prmt.set_answer_cache(None)
+
+
+def _next_run(cache):
+    # A new process reads the file again.
+    return prmt.set_answer_cache(prmt.AnswerCache(cache.path))
+
+
+def test_last_answer_is_the_default(cache):
+    io = ScriptedIO("web-1, web-2", "42", "no", "ops")
+
+    prmt.list_of_string("Hosts?", prompt_id="hosts", io=io)
+    prmt.integer("Count?", prompt_id="count", io=io)
+    prmt.confirm("Deploy?", prompt_id="deploy", io=io)
+    prmt.string("Team?", prompt_id="team", io=io)
+
+    _next_run(cache)
+    io = ScriptedIO("", "", "", "")
+
+    assert prmt.list_of_string("Hosts?", prompt_id="hosts", io=io) == [
+        "web-1",
+        "web-2",
+    ]
+    assert prmt.integer("Count?", prompt_id="count", io=io) == 42
+    assert prmt.confirm("Deploy?", prompt_id="deploy", io=io) is False
+    assert prmt.string("Team?", prompt_id="team", io=io) == "ops"
+    assert "[web-1, web-2]" in io.getvalue()
+
+
+def test_select_and_editor(cache):
+    io = ScriptedIO("b", editor=lambda text: "fix typo")
+    options = {"a": "Apple", "b": "Banana"}
+
+    assert prmt.select("Fruit?", options, prompt_id="fruit", io=io) == ("b", "Banana")
+    prmt.string_from_editor("Message?", prompt_id="message", io=io)
+
+    _next_run(cache)
+    io = ScriptedIO("", editor=lambda text: text)
+
+    assert prmt.select("Fruit?", options, prompt_id="fruit", io=io) == ("b", "Banana")
+    assert prmt.string_from_editor("Message?", prompt_id="message", io=io) == (
+        "fix typo"
+    )
+
+
+def test_custom_select_answer(cache):
+    io = ScriptedIO("1", "mine")
+
+    prmt.select("Pick", ["a", "other"], custom_key=1, prompt_id="pick", io=io)
+
+    _next_run(cache)
+    io = ScriptedIO("", "")
+
+    assert prmt.select(
+        "Pick", ["a", "other"], custom_key=1, prompt_id="pick", io=io
+    ) == (1, "mine")
+
+
+def test_default_and_invalid_answers_win(cache):
+    cache.put("count", "7")
+    cache.put("name", "root")
+
+    io = ScriptedIO("", "", "bob")
+
+    assert prmt.integer("Count?", blacklist=[7], prompt_id="count", io=io) is None
+    assert prmt.integer("Count?", default="3", prompt_id="count", io=io) == 3
+    # "root" is not valid anymore, so there is no default.
+    assert prmt.string("Name?", blacklist=["root"], prompt_id="name", io=io) == "bob"
+
+
+def test_only_prompts_with_id_and_user_answers(cache):
+    prmt.set_answers({"count": "5"})
+
+    try:
+        io = ScriptedIO("1")
+        assert prmt.integer("Count?", prompt_id="count", io=io) == 5
+        assert prmt.integer("Count?", io=io) == 1
+    finally:
+        prmt.set_answers(None)
+
+    assert cache.answers("count") == []
+    assert not os.path.exists(cache.path)
+
+
+def test_last_answers_per_prompt(tmp_path):
+    cache = prmt.AnswerCache(tmp_path / "answers.json", max_answers=3)
+
+    for answer in ["a", "b", "c", "a", "d"]:
+        cache.put("id", answer)
+
+    assert cache.answers("id") == ["d", "a", "c"]
+    assert cache.get("id") == "d"
+    assert cache.get("other") is None
+
+    cache.forget("id")
+    assert prmt.AnswerCache(cache.path).get("id") is None
+
+
+def test_least_recently_used_prompts_are_dropped(tmp_path):
+    cache = prmt.AnswerCache(tmp_path / "answers.json", max_prompts=2)
+
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+
+    assert prmt.AnswerCache(cache.path).answers("b") == []
+    assert prmt.AnswerCache(cache.path).get("a") == "1"
+
+
+def test_size_limit(tmp_path):
+    cache = prmt.AnswerCache(tmp_path / "answers.json", max_bytes=50)
+
+    cache.put("a", "x" * 20)
+    cache.put("b", "y" * 20)
+
+    assert cache.answers("a") == []
+    assert cache.get("b") == "y" * 20
+
+    # An answer that does not fit at all is not kept.
+    cache.put("b", "z" * 100)
+    assert cache.answers("b") == ["y" * 20]
+
+    # Older answers are dropped until the prompt fits.
+    cache.put("b", "z" * 25)
+    assert cache.answers("b") == ["z" * 25]
+    assert os.path.getsize(cache.path) <= 50 + len('{"version":1,"prompts":{}}')
+
+
+def test_file_is_read_once_and_replaced(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "answers.json"
+    cache = prmt.AnswerCache(path)
+    cache.put("id", "secret")
+
+    assert os.listdir(path.parent) == ["answers.json"]
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert json.loads(path.read_text()) == {"version": 1, "prompts": {"id": ["secret"]}}
+
+    cache = prmt.AnswerCache(path)
+    opened = []
+    real_open = open
+    monkeypatch.setattr(
+        "builtins.open",
+        lambda *args, **kw: opened.append(args) or real_open(*args, **kw),
+    )
+
+    cache.get("id")
+    cache.get("other")
+
+    assert len([args for args in opened if args[0] == str(path)]) == 1
+
+
+def test_unreadable_file_is_empty(tmp_path):
+    path = tmp_path / "answers.json"
+    path.write_text("{not json")
+
+    cache = prmt.AnswerCache(path)
+
+    assert cache.get("id") is None
+    cache.put("id", "value")
+    assert prmt.AnswerCache(path).get("id") == "value"
+
+
+def test_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRMT_ANSWER_CACHE", str(tmp_path / "answers.json"))
+    monkeypatch.setattr(prmt, "_answer_cache_loaded", False)
+
+    try:
+        assert prmt.get_answer_cache().path == str(tmp_path / "answers.json")
+    finally:
+        prmt.set_answer_cache(None)
@@ -0,0 +1,89 @@
+import io
+import json
+import sys
+
+import pytest
+
+import prmt
+
+
+@pytest.fixture(autouse=True)
+def no_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    yield
+    prmt.set_answers(None)
+
+
+def test_answers_from_mapping(capsys):
+    prmt.set_answers(
+        {
+            "name": "joe",
+            "Continue?": True,
+            "count": 3,
+            "hosts": ["a", "b"],
+            "env": "prod",
+        }
+    )
+
+    assert prmt.string("Name?", prompt_id="name") == "joe"
+    assert prmt.confirm("Continue?") is True
+    assert prmt.integer("How many?", prompt_id="count") == 3
+    assert prmt.list_of_string("Hosts?", prompt_id="hosts") == ["a", "b"]
+    assert prmt.select("Env?", {"dev": 1, "prod": 2}, prompt_id="env") == ("prod", 2)
+    assert capsys.readouterr().out == ""
+
+
+def test_answers_from_file(tmp_path):
+    path = tmp_path / "answers.json"
+    path.write_text(json.dumps({"Pick": 1}))
+    prmt.set_answers(str(path))
+
+    assert prmt.select("Pick", ["a", "b"]) == (1, "b")
+
+
+def test_answers_from_env(monkeypatch):
+    monkeypatch.setenv("PRMT_ANSWER_DB_HOST", "localhost")
+    prmt.set_answers(prmt.Answers.from_env())
+
+    assert prmt.string("Host?", prompt_id="db.host") == "localhost"
+
+
+def test_empty_answer_uses_default():
+    prmt.set_answers({"count": ""})
+
+    assert prmt.integer("How many?", default="5", prompt_id="count") == 5
+
+
+def test_invalid_answer_fails_fast():
+    prmt.set_answers({"count": "many", "Continue?": "maybe", "Name?": ""})
+
+    with pytest.raises(prmt.InvalidAnswer):
+        prmt.integer("How many?", prompt_id="count")
+    with pytest.raises(prmt.InvalidAnswer):
+        prmt.confirm("Continue?")
+    with pytest.raises(prmt.InvalidAnswer):
+        prmt.string("Name?", blacklist=[""])
+
+
+def test_missing_answer_asks_user(monkeypatch):
+    prmt.set_answers({})
+    monkeypatch.setattr(sys, "stdin", io.StringIO("typed\n"))
+
+    assert prmt.string("Name?", prompt_id="name") == "typed"
+
+
+def test_strict_answers():
+    prmt.set_answers(prmt.Answers({}, strict=True))
+
+    with pytest.raises(prmt.MissingAnswer):
+        prmt.confirm("Continue?", prompt_id="continue")
+
+
+def test_select_custom_answer():
+    prmt.set_answers({"env": "other", "env.custom": "staging"})
+
+    answer = prmt.select(
+        "Env?", {"prod": 1, "other": "Enter env"}, custom_key="other", prompt_id="env"
+    )
+
+    assert answer == ("other", "staging")
@@ -0,0 +1,232 @@
+import fcntl
+import os
+import signal
+import struct
+import termios
+import time
+
+import pytest
+
+import prmt
+from prmt import _terminal
+from prmt.testing import ScriptedIO
+
+UP = "\x1b[A"
+DOWN = "\x1b[B"
+PAGE_UP = "\x1b[5~"
+PAGE_DOWN = "\x1b[6~"
+HOME = "\x1b[H"
+END = "\x1b[F"
+
+OPTIONS = [f"option {i}" for i in range(100)]
+
+
+def _select(keys, **kwargs):
+    io = ScriptedIO()
+    io.feed_keys(keys)
+    kwargs.setdefault("page_size", 5)
+    value = prmt.select("Pick", OPTIONS, arrow_keys=True, io=io, **kwargs)
+    return value, io.getvalue()
+
+
+def test_move_and_select():
+    value, output = _select(DOWN + DOWN + UP + "\r")
+
+    assert value == (1, "option 1")
+    frame = output.partition("\x1b7")[0]
+    assert "  4: option 4\n  1 of 100\n\n> " in frame
+    assert "option 5" not in frame
+    assert output.endswith("\r> 1\x1b[K\n")
+
+
+def test_page_keys_and_home_end():
+    assert _select(PAGE_DOWN + PAGE_DOWN + DOWN + "\r")[0] == (11, "option 11")
+    assert _select(END + PAGE_UP + "\r")[0] == (94, "option 94")
+    assert _select(END + HOME + UP + "\r")[0] == (0, "option 0")
+    assert _select(END + DOWN + "\r")[0] == (99, "option 99")
+
+
+def test_only_changed_rows_are_drawn():
+    _, output = _select(DOWN + "\r")
+
+    update = output.partition("\x1b7")[2]
+
+    # The old and the new highlighted row and the status line.
+    assert update.count("\x1b8\x1b[") == 3
+    assert "\x1b[7m  1: option 1\x1b[0m" in update
+    assert "  2 of 100" in update
+
+
+def test_scrolling_moves_the_window():
+    _, output = _select(DOWN * 5 + "\r")
+
+    update = output.rpartition("\x1b7")[2]
+    assert "\x1b[7m  5: option 5\x1b[0m" in update
+    assert "  1: option 1" in update
+    assert "  0: option 0" not in update
+
+
+def test_default_is_highlighted():
+    value, output = _select("\r", default=50)
+
+    assert value == (50, "option 50")
+    assert "\x1b[7m  50: option 50\x1b[0m" in output
+    assert "  48: option 48\n" in output
+
+
+def test_typed_key():
+    assert _select("42\r")[0] == (42, "option 42")
+    assert _select("7\x7f8\r")[0] == (8, "option 8")
+
+
+def test_invalid_typed_key_retries():
+    value, output = _select("x\r" + DOWN + "\r", max_retries=1)
+
+    assert value == (1, "option 1")
+    assert output.count("Pick") == 2
+
+
+def test_dict():
+    io = ScriptedIO()
+    io.feed_keys(DOWN + "\r")
+    options = {"a": "Apple", "b": "Banana"}
+
+    assert prmt.select("Pick", options, arrow_keys=True, io=io) == ("b", "Banana")
+
+
+def test_lazy_options_are_read_as_far_as_shown():
+    read = []
+
+    def options():
+        for i in range(100_000):
+            read.append(i)
+            yield f"option {i}"
+
+    io = ScriptedIO()
+    io.feed_keys(DOWN * 3 + PAGE_DOWN + "\r")
+
+    value = prmt.select("Pick", options(), arrow_keys=True, page_size=5, io=io)
+
+    assert value == (8, "option 8")
+    assert len(read) <= 15
+    assert "  9 of ?" in io.getvalue()
+
+    io = ScriptedIO()
+    io.feed_keys(END + "\r")
+    value = prmt.select(
+        "Pick", (f"option {i}" for i in range(500)), arrow_keys=True, page_size=5, io=io
+    )
+
+    assert value == (499, "option 499")
+    assert "  500 of 500" in io.getvalue()
+
+
+def test_line_file(tmp_path):
+    path = tmp_path / "options.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(10_000)))
+
+    io = ScriptedIO()
+    io.feed_keys(DOWN + DOWN + "\r")
+
+    with prmt.LineFile(path) as options:
+        value = prmt.select("Pick", options, arrow_keys=True, page_size=5, io=io)
+        indexed = len(options._offsets)
+
+    assert value == (2, "line 2")
+    assert indexed < 20
+
+
+def test_wide_rows_are_truncated_to_the_terminal():
+    io = ScriptedIO(size=(12, 24))
+    io.feed_keys("\r")
+    options = ["\u6771\u4eac\u90fd\u6e0b\u8c37\u533a", "e\u0301t\u00e9 long name"]
+
+    prmt.select("Pick", options, arrow_keys=True, io=io)
+
+    output = io.getvalue()
+    # 11 columns: "  0: " and three wide characters, the combining accent
+    # takes none.
+    assert "  0: \u6771\u4eac\u90fd\x1b[0m" in output
+    assert "  1: e\u0301t\u00e9 lo\n" in output
+
+
+def test_without_terminal_reads_lines():
+    io = ScriptedIO("3", interactive=False)
+
+    assert prmt.select("Pick", OPTIONS, arrow_keys=True, io=io) == (3, "option 3")
+
+
+class _Console:
+    # Stands in for 'msvcrt'.
+    def __init__(self, keys):
+        self.keys = list(keys)
+
+    def kbhit(self):
+        return bool(self.keys)
+
+    def getwch(self):
+        return self.keys.pop(0)
+
+
+def test_windows_keys(monkeypatch):
+    console = _Console(["a", "\xe0", "H", "\x00", "P", "\xe0", "S", "\r"])
+    monkeypatch.setattr(_terminal, "WINDOWS", True)
+    monkeypatch.setattr(_terminal, "msvcrt", console, raising=False)
+    monkeypatch.setattr(os, "isatty", lambda fd: True)
+    drawn = []
+
+    keys = _terminal.read_keys(0, lambda: drawn.append(True), time.monotonic() + 5)
+
+    assert next(keys) == [] and drawn == [True]
+    # The delete key is dropped.
+    assert [next(keys) for _ in range(4)] == [["a"], [UP], [DOWN], ["\r"]]
+
+    # No key before the deadline.
+    keys = _terminal.read_keys(0, None, time.monotonic() + 0.05)
+    assert next(keys) == []
+
+    with pytest.raises(TimeoutError):
+        next(keys)
+
+
+def _resize(fd, columns, lines):
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", lines, columns, 0, 0))
+
+
+def test_size_is_cached_until_resize():
+    previous = signal.getsignal(signal.SIGWINCH)
+    master, slave = os.openpty()
+
+    try:
+        terminal = prmt.Terminal(fd=slave)
+        _resize(slave, 100, 30)
+
+        assert terminal.size() == (100, 30)
+
+        _resize(slave, 120, 40)
+        assert terminal.size() == (100, 30)
+
+        os.kill(os.getpid(), signal.SIGWINCH)
+        assert terminal.size() == (120, 40)
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
+        os.close(master)
+        os.close(slave)
+
+
+def test_size_is_not_cached_with_own_handler():
+    previous = signal.signal(signal.SIGWINCH, lambda *args: None)
+    master, slave = os.openpty()
+
+    try:
+        terminal = prmt.Terminal(fd=slave)
+        _resize(slave, 100, 30)
+        assert terminal.size() == (100, 30)
+
+        _resize(slave, 120, 40)
+        assert terminal.size() == (120, 40)
+        assert not _terminal.watch_size()
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
+        os.close(master)
+        os.close(slave)
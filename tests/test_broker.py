@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+def _confirm_many(n):
+    return [prmt.confirm(f"Continue {i}?") for i in range(n)]
+
+
+def _ask_all(_):
+    return (
+        prmt.string("Name?", default="joe"),
+        prmt.integer("Number?"),
+        prmt.list_of_string("Items?"),
+        prmt.select("Pick", {"a": object(), "b": "bee"}),
+        prmt.select("Pick", ["x", "other"], custom_key=1),
+    )
+
+
+def _exhausted(_):
+    try:
+        prmt.integer("Number?", max_retries=1)
+    except prmt.RetriesExhausted as e:
+        return e.retries
+
+
+def _timeout(_):
+    try:
+        prmt.confirm("Continue?", timeout=0.01, on_timeout="raise")
+    except prmt.PromptTimeout as e:
+        return e.timeout
+
+
+def _paged(path):
+    options = prmt.LineFile(path)
+    # The broker reads the file, this process only the selected line.
+    return prmt.select("Pick", options), len(options._offsets) < 50
+
+
+def _lazy(_):
+    try:
+        prmt.select("Pick", (f"item {i}" for i in range(50)))
+    except prmt.BrokerError as e:
+        return str(e)
+
+
+def _spilled(_):
+    answer = prmt.string("Text?", multiline=True, max_bytes=4, overflow="spill")
+    with answer:
+        return type(answer).__name__, answer.read()
+
+
+def _option_set(_):
+    return prmt.select("Pick", prmt.OptionSet({"one": 1, "other": 2}))
+
+
+def _multi_select(_):
+    selection = prmt.multi_select("Pick", {"a": 1, "b": 2, "c": 3}, default=["a"])
+    return list(selection)
+
+
+def _table(_):
+    return prmt.select("Pick", prmt.Table({"a": ("alpha", 1), "b": ("beta", 22)}))
+
+
+def _pool():
+    return multiprocessing.get_context("fork").Pool(4)
+
+
+def test_children_prompt_through_the_broker():
+    io = ScriptedIO(*(["y"] * 2000))
+
+    with prmt.PromptBroker(io=io) as broker:
+        assert os.environ["PRMT_BROKER"] == broker.path
+
+        with _pool() as pool:
+            answers = pool.map(_confirm_many, [500] * 4)
+
+        # Each child reuses a single connection.
+        assert broker.connections <= 4
+
+    assert answers == [[True] * 500] * 4
+    assert io.getvalue().count("Continue") == 2000
+    assert "PRMT_BROKER" not in os.environ
+    assert not os.path.exists(broker.path)
+
+
+def test_answer_types():
+    io = ScriptedIO("", "x", "5", "a, b", "b", "1", "mine")
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            (answer,) = pool.map(_ask_all, [None])
+
+    name, number, items, picked, custom = answer
+
+    assert (name, number, items) == ("joe", 5, ["a", "b"])
+    assert picked == ("b", "bee")
+    assert custom == (1, "mine")
+    assert "Invalid input." in io.getvalue()
+
+
+def test_errors_are_raised_in_the_child():
+    io = ScriptedIO("x", "x")
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            assert pool.map(_exhausted, [None]) == [1]
+
+
+def test_broker_process_prompts_locally(monkeypatch):
+    monkeypatch.setattr(prmt, "_get_io", lambda: ScriptedIO("y"))
+
+    with prmt.PromptBroker(io=ScriptedIO()) as broker:
+        assert prmt.confirm("Continue?") is True
+        assert broker.connections == 0
+        assert prmt.confirm("Continue?", io=ScriptedIO("y")) is True
+
+
+def test_lost_broker(monkeypatch, tmp_path):
+    monkeypatch.setenv("PRMT_BROKER", str(tmp_path / "missing"))
+
+    with pytest.raises(prmt.BrokerError):
+        prmt.confirm("Continue?")
+
+
+def test_timeout_is_raised_in_the_child():
+    with prmt.PromptBroker(io=ScriptedIO()):
+        with _pool() as pool:
+            assert pool.map(_timeout, [None]) == [0.01]
+
+
+def test_line_files_are_paged_by_the_broker(tmp_path):
+    path = tmp_path / "items.txt"
+    path.write_text("".join(f"item {i}\n" for i in range(50)))
+    io = ScriptedIO(">", "30")
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            assert pool.map(_paged, [str(path)]) == [((30, "item 30"), True)]
+
+    output = io.getvalue()
+    assert "  Page 2 of 3" in output
+    assert "item 40" not in output
+
+
+def test_lazy_sources_are_not_sent():
+    with prmt.PromptBroker(io=ScriptedIO("1")):
+        with _pool() as pool:
+            (message,) = pool.map(_lazy, [None])
+
+    assert "read lazily" in message
+
+
+def test_spilled_answers_spill_in_the_child():
+    io = ScriptedIO("0123456789", ".", interactive=False)
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            (answer,) = pool.map(_spilled, [None])
+
+    assert answer[0] != "str" and answer[1] == "0123456789\n"
+
+
+def test_multi_select_through_the_broker():
+    io = ScriptedIO("b-c", "")
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            assert pool.map(_multi_select, [None]) == [[("a", 1), ("b", 2), ("c", 3)]]
+
+    assert "[x]  a: 1" in io.getvalue()
+
+
+def test_tables_are_aligned_by_the_broker():
+    io = ScriptedIO("^2", "be")
+
+    with prmt.PromptBroker(io=io):
+        with _pool() as pool:
+            assert pool.map(_table, [None]) == [("b", ("beta", 22))]
+
+    assert "  b: beta   22\n" in io.getvalue()
+
+
+def test_option_sets_are_indexed_by_the_broker():
+    with prmt.PromptBroker(io=ScriptedIO("ot")):
+        with _pool() as pool:
+            assert pool.map(_option_set, [None]) == [("other", 2)]
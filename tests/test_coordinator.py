@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+class QuestionIO(ScriptedIO):
+    """
+    Answers every prompt with its question.
+    """
+
+    def readline(self, prompt):
+        self.write(prompt)
+        return prompt.split()[0]
+
+
+def test_answers_go_to_their_caller():
+    io = QuestionIO()
+
+    with prmt.PromptCoordinator(io=io) as prompts:
+        with ThreadPoolExecutor(8) as pool:
+            answers = list(pool.map(lambda i: prompts.string(f"q{i}"), range(200)))
+
+    assert answers == [f"q{i}" for i in range(200)]
+
+    # Every prompt is rendered in one piece.
+    blocks = io.getvalue().strip("\n").split("\n\n")
+    assert sorted(blocks) == sorted(f"q{i}\n> " for i in range(200))
+
+
+def _blocked(prompts):
+    """
+    Occupy the coordinator until the returned event is set.
+    """
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    prompts.submit(block)
+    started.wait()
+
+    return release
+
+
+def test_priority_order():
+    order = []
+    prompts = prmt.PromptCoordinator()
+    release = _blocked(prompts)
+
+    futures = [
+        prompts.submit(order.append, name, priority=priority)
+        for name, priority in [("low", 0), ("high", 10), ("low2", 0), ("mid", 5)]
+    ]
+
+    assert prompts.stats().queued == 4
+
+    release.set()
+    for future in futures:
+        future.result()
+    prompts.close()
+
+    assert order == ["high", "mid", "low", "low2"]
+
+    stats = prompts.stats()
+    assert stats.queued == 0
+    assert stats.served == 5
+    assert stats.wait_ns_max > 0
+    assert stats.wait_ns_mean <= stats.wait_ns_max
+
+
+def test_exceptions_reach_the_caller():
+    with prmt.PromptCoordinator(io=ScriptedIO("x")) as prompts:
+        with pytest.raises(prmt.RetriesExhausted):
+            prompts.integer("Number?", max_retries=0)
+
+
+def test_nested_prompt_runs_right_away():
+    with prmt.PromptCoordinator(io=ScriptedIO("y", "joe")) as prompts:
+
+        def ask_both():
+            return prompts.confirm("Continue?"), prompts.string("Name?")
+
+        assert prompts.submit(ask_both).result() == (True, "joe")
+
+
+def test_close_cancels_queued_requests():
+    prompts = prmt.PromptCoordinator()
+    release = _blocked(prompts)
+    future = prompts.submit(prmt.confirm, "Continue?")
+
+    closer = threading.Thread(target=prompts.close, kwargs={"cancel": True})
+    closer.start()
+    while not future.cancelled():
+        closer.join(0.001)
+    release.set()
+    closer.join()
+
+    assert future.cancelled()
+    assert prompts.stats().queued == 0
+
+    with pytest.raises(RuntimeError):
+        prompts.submit(prmt.confirm, "Continue?")
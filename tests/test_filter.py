@@ -0,0 +1,213 @@
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+UP = "\x1b[A"
+DOWN = "\x1b[B"
+BACKSPACE = "\x7f"
+
+HOSTS = ["web-1", "web-2", "db-main", "db-replica", "cache", "Webhook relay"]
+
+
+def test_matches_subsequences():
+    index = prmt.FuzzyIndex(HOSTS)
+
+    assert list(index.matches("")) == list(range(6))
+    assert list(index.matches("dbr")) == [3]
+    assert list(index.matches("WEB")) == [0, 1, 5]
+    assert list(index.matches("xyz")) == []
+
+
+def test_matches_narrow_the_previous_matches():
+    index = prmt.FuzzyIndex(HOSTS)
+
+    index.matches("d")
+    index._postings.clear()
+
+    # "db" extends "d", so the index is not used.
+    assert list(index.matches("db")) == [2, 3]
+    assert [query for query, _ in index._history] == ["d", "db"]
+
+    index.matches("w")
+    assert [query for query, _ in index._history] == ["w"]
+
+
+def test_one_character_is_answered_from_the_index(monkeypatch):
+    index = prmt.FuzzyIndex(HOSTS)
+    monkeypatch.setattr("prmt.options._is_subsequence", None)
+
+    assert list(index.matches("W")) == [0, 1, 5]
+    monkeypatch.undo()
+
+    # The kept matches are not the index itself.
+    index.extend(["www"])
+    assert list(index.matches("w")) == [0, 1, 5, 6]
+    assert list(index._postings["w"]) == [0, 1, 5, 6]
+
+
+def test_search_ranks_and_limits():
+    index = prmt.FuzzyIndex(["a web", "web", "website", "w e b", "xweb"])
+
+    best, count = index.search("web", 3)
+
+    assert count == 5
+    assert best == [1, 2, 0]
+
+
+def test_select_filter():
+    io = ScriptedIO()
+    io.feed_keys("db" + DOWN + "\r")
+
+    assert prmt.select("Host?", HOSTS, filter=True, page_size=4, io=io) == (
+        3,
+        "db-replica",
+    )
+
+    output = io.getvalue()
+    assert "  6 of 6" in output
+    assert "  2 of 6" in output
+    assert "\x1b[7m  3: db-replica\x1b[0m" in output
+    # The selected key is shown on the prompt line.
+    assert output.endswith("\r> 3\x1b[K\n")
+
+
+def test_only_changed_rows_are_drawn():
+    io = ScriptedIO()
+    io.feed_keys("w")
+    options = [f"item {i}" for i in range(10)] + ["w"]
+
+    with pytest.raises(EOFError):
+        prmt.select("Pick", options, filter=True, page_size=3, io=io)
+
+    output = io.getvalue()
+    frame, _, update = output.partition("\x1b7")
+
+    assert frame.count("item") == 3
+    # Row 1 and 2 are empty now, the status line changed and the first row.
+    assert update.count("\x1b8\x1b[") == 4
+    assert "  1 of 11" in update
+
+
+def test_backspace_and_clear():
+    io = ScriptedIO()
+    io.feed_keys("cx" + BACKSPACE + "\r")
+
+    assert prmt.select("Host?", HOSTS, filter=True, io=io) == (4, "cache")
+
+    io.feed_keys("zz\x1b" + DOWN + "\r")
+
+    assert prmt.select("Host?", HOSTS, filter=True, io=io) == (1, "web-2")
+
+
+def test_enter_without_filter_selects_default_or_first():
+    io = ScriptedIO("", "")
+
+    assert prmt.select("Host?", HOSTS, default=2, filter=True, io=io) == (
+        2,
+        "db-main",
+    )
+    assert prmt.select("Host?", HOSTS, filter=True, io=io) == (0, "web-1")
+
+
+def test_filter_dict_and_option_set():
+    io = ScriptedIO("pro", "beta")
+    options = {"dev": "Development", "prod": "Production"}
+
+    assert prmt.select("Env?", options, filter=True, io=io) == ("prod", "Production")
+
+    option_set = prmt.OptionSet(HOSTS)
+    assert prmt.select("Host?", option_set, filter=True, io=ScriptedIO("rel")) == (
+        5,
+        "Webhook relay",
+    )
+    assert option_set.fuzzy_index()._history[-1][0] == "rel"
+
+
+def test_filter_custom_key():
+    io = ScriptedIO("oth", "mine")
+
+    assert prmt.select("Pick", ["a", "other"], custom_key=1, filter=True, io=io) == (
+        1,
+        "mine",
+    )
+
+
+def test_filter_timeout():
+    io = ScriptedIO()
+
+    assert prmt.select("Host?", HOSTS, default=4, filter=True, timeout=5, io=io) == (
+        4,
+        "cache",
+    )
+
+
+def test_filter_without_terminal_reads_lines():
+    io = ScriptedIO("2", interactive=False)
+
+    assert prmt.select("Host?", HOSTS, filter=True, io=io) == (2, "db-main")
+
+
+def test_option_set_keeps_its_index(monkeypatch):
+    from prmt import _filter
+
+    built = []
+    monkeypatch.setattr(
+        _filter,
+        "FuzzyIndex",
+        lambda texts: built.append(texts) or prmt.FuzzyIndex(texts),
+    )
+    option_set = prmt.OptionSet(HOSTS)
+    indexes = []
+
+    for answer in ["web", "cache"]:
+        io = ScriptedIO()
+        io.feed_keys(answer + "\r")
+        prmt.select("Host?", option_set, filter=True, io=io)
+        indexes.append(option_set.fuzzy_index())
+
+    assert indexes[0] is indexes[1]
+    assert indexes[1]._history[-1][0] == "cache"
+    assert built == []
+
+    # A list may change between prompts, it is indexed for each.
+    options = list(HOSTS)
+
+    for answer in ["web", "web-3"]:
+        io = ScriptedIO()
+        io.feed_keys(answer + "\r")
+        prmt.select("Host?", options, filter=True, io=io)
+        options.append("web-3")
+
+    assert len(built) == 2 and len(built[1]) == len(HOSTS) + 1
+
+
+def test_query_checks_the_intersection_of_its_characters(monkeypatch):
+    from prmt import options
+
+    texts = [f"q{i}" for i in range(50)] + [f"z{i}" for i in range(50)] + ["qz"]
+    index = prmt.FuzzyIndex(texts)
+    checked = []
+    real = options._is_subsequence
+    monkeypatch.setattr(
+        options,
+        "_is_subsequence",
+        lambda query, text: checked.append(text) or real(query, text),
+    )
+
+    assert index.matches("qz") == [100]
+    assert checked == ["qz"]
+    assert index.matches("zq") == []
+
+
+def test_line_file_keeps_its_index(tmp_path):
+    path = tmp_path / "hosts.txt"
+    path.write_text("\n".join(HOSTS))
+
+    with prmt.LineFile(path) as options:
+        io = ScriptedIO()
+        io.feed_keys("dbr\r")
+
+        assert prmt.select("Host?", options, filter=True, io=io) == (3, "db-replica")
+        assert options.fuzzy_index() is options.fuzzy_index()
+        assert options.fuzzy_index()._history[-1][0] == "dbr"
@@ -0,0 +1,113 @@
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+def _deploy_form():
+    form = prmt.Form("deploy")
+    form.select("env", "Environment?", ["dev", "prod"])
+    form.confirm("sure", "Deploy to production?", when=lambda env: env[1] == "prod")
+    form.list_of_string(
+        "hosts", "Hosts?", default=lambda env: f"{env[1]}-1, {env[1]}-2"
+    )
+    form.integer("workers", lambda hosts: f"Workers for {len(hosts)} hosts?")
+    return form
+
+
+def test_questions_that_apply_are_asked():
+    form = _deploy_form()
+    io = ScriptedIO("0", "", "")
+
+    answers = form.run(prmt.Prompt(io=io))
+
+    assert dict(answers) == {
+        "env": (0, "dev"),
+        "hosts": ["dev-1", "dev-2"],
+        "workers": None,
+    }
+    assert answers.skipped == ("sure",)
+    assert answers.sure is None
+    assert answers.hosts == ["dev-1", "dev-2"]
+
+    output = io.getvalue()
+    assert "production" not in output
+    assert "[dev-1, dev-2]" in output
+    assert "Workers for 2 hosts?" in output
+
+
+def test_plan_is_compiled_once():
+    form = _deploy_form()
+    plan = form.compile()
+
+    answers = form.run(prmt.Prompt(io=ScriptedIO("1", "y", "a", "3")))
+
+    assert form.compile() is plan
+    assert list(answers) == ["env", "sure", "hosts", "workers"]
+    assert answers["sure"] is True and answers["workers"] == 3
+
+
+def test_skipped_dependencies_skip_the_question():
+    calls = []
+
+    def question(sure):
+        calls.append(sure)
+        return "Why?"
+
+    form = prmt.Form()
+    form.confirm("sure", "Sure?", when=False)
+    form.string("reason", question)
+    form.string("note", "Note?", when=lambda sure=None: sure is None)
+
+    answers = form.run(prmt.Prompt(io=ScriptedIO("text")))
+
+    assert dict(answers) == {"note": "text"}
+    assert answers.skipped == ("sure", "reason")
+    assert calls == []
+
+
+def test_dependencies_order_the_questions():
+    form = prmt.Form()
+    form.string("greeting", lambda name: f"Hello {name}, how are you?")
+    form.string("name", "Name?")
+
+    io = ScriptedIO("joe", "fine")
+
+    assert list(form.run(prmt.Prompt(io=io)).items()) == [
+        ("name", "joe"),
+        ("greeting", "fine"),
+    ]
+    assert "Hello joe" in io.getvalue()
+
+
+def test_invalid_dependencies():
+    form = prmt.Form()
+    form.string("a", lambda b: "A?")
+    form.string("b", lambda a: "B?")
+
+    with pytest.raises(ValueError, match="depend on each other: a, b"):
+        form.compile()
+
+    form = prmt.Form().string("a", "A?", when=lambda missing: True)
+
+    with pytest.raises(ValueError, match="'missing'"):
+        form.compile()
+
+    with pytest.raises(ValueError, match="already"):
+        form.string("a", "Again?")
+
+
+def test_prompt_ids_use_the_answers_source():
+    prmt.set_answers({"deploy.env": "1", "deploy.sure": "no"})
+
+    try:
+        answers = _deploy_form().run(prmt.Prompt(io=ScriptedIO("", "4")))
+    finally:
+        prmt.set_answers(None)
+
+    assert dict(answers) == {
+        "env": (1, "prod"),
+        "sure": False,
+        "hosts": ["prod-1", "prod-2"],
+        "workers": 4,
+    }
@@ -0,0 +1,129 @@
+import io
+import json
+
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+@pytest.fixture
+def events():
+    events = []
+    prmt.add_hook(events.append)
+    yield events
+    prmt.remove_hook(events.append)
+
+
+def test_no_hooks_by_default():
+    assert prmt._hooks == ()
+
+
+def test_event_after_retries(events):
+    io = ScriptedIO("maybe", "nope", "y")
+
+    assert prmt.confirm("Continue?", prompt_id="go", io=io) is True
+
+    (event,) = events
+    assert event.type == "confirm"
+    assert event.question == "Continue?"
+    assert event.prompt_id == "go"
+    assert event.source == "user"
+    assert event.status == "answered"
+    assert event.retries == 2
+    assert event.answer_size == len("yes")
+    assert event.editor_spawn_ns is None
+    assert event.total_ns >= event.render_ns + event.wait_ns
+    assert event.validation_ns > 0
+
+
+def test_event_status_on_exhausted(events):
+    io = ScriptedIO("x", "x", "x", "x")
+
+    assert (
+        prmt.integer(
+            "Number?", default="7", max_retries=1, on_exhausted="default", io=io
+        )
+        == 7
+    )
+    with pytest.raises(prmt.RetriesExhausted):
+        prmt.integer("Number?", max_retries=1, io=io)
+
+    assert [e.status for e in events] == ["default", "exhausted"]
+    assert [e.retries for e in events] == [1, 1]
+
+
+def test_event_on_end_of_input(events):
+    with pytest.raises(EOFError):
+        prmt.string("Name?", io=ScriptedIO())
+
+    assert events[0].status == "interrupted"
+    assert events[0].answer_size is None
+
+
+def test_event_for_preset_answer(events):
+    prmt.set_answers({"Name?": "joe"})
+    try:
+        assert prmt.string("Name?", io=ScriptedIO()) == "joe"
+    finally:
+        prmt.set_answers(None)
+
+    assert events[0].source == "answers"
+    assert events[0].wait_ns == 0
+
+
+def test_event_for_editor(events):
+    io = ScriptedIO(editor=lambda text: text + " edited")
+
+    prmt.string_from_editor("Text?", default="foo", io=io)
+
+    (event,) = events
+    assert event.type == "string_from_editor"
+    assert event.editor_spawn_ns <= event.editor_exit_ns
+    assert event.answer_size == len("foo edited")
+
+
+def test_select_custom_emits_two_events(events):
+    io = ScriptedIO("1", "mine")
+
+    assert prmt.select(
+        "Pick", ["a", "other"], custom_key=1, prompt_id="pick", io=io
+    ) == (1, "mine")
+
+    assert [(e.type, e.prompt_id) for e in events] == [
+        ("string", "pick.custom"),
+        ("select", "pick"),
+    ]
+
+
+def test_prompt_class_emits_events(events):
+    prmt.Prompt(io=ScriptedIO("3")).integer("Number?")
+
+    assert events[0].type == "integer"
+
+
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = prmt.add_hook(prmt.JSONLinesSink(path))
+    try:
+        prmt.confirm("A?", io=ScriptedIO("y"))
+        prmt.confirm("B?", io=ScriptedIO("n"))
+    finally:
+        prmt.remove_hook(sink)
+        sink.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [line["question"] for line in lines] == ["A?", "B?"]
+    assert set(lines[0]) == set(prmt.PromptEvent._fields)
+
+
+def test_json_lines_sink_to_stream():
+    stream = io.StringIO()
+    sink = prmt.add_hook(prmt.JSONLinesSink(stream))
+    try:
+        prmt.string("Name?", io=ScriptedIO("joe"))
+    finally:
+        prmt.remove_hook(sink)
+
+    assert json.loads(stream.getvalue())["answer_size"] == 3
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Microseconds that 'import prmt' may take, not counting 'typing', which most
+# programs import anyway.
+BUDGET_US = 20_000
+
+# Modules that must only be imported when a prompt needs them.
+LAZY_MODULES = (
+    "array",
+    "asyncio",
+    "heapq",
+    "inspect",
+    "mmap",
+    "platform",
+    "prmt.aio",
+    "prmt.broker",
+    "prmt.cache",
+    "prmt.coordinator",
+    "prmt.form",
+    "prmt.options",
+    "prmt._editor",
+    "prmt._filter",
+    "prmt._live",
+    "prmt._terminal",
+    "select",
+    "signal",
+    "socket",
+    "subprocess",
+    "tempfile",
+    "termios",
+    "threading",
+    "unicodedata",
+)
+
+
+def _run(*args):
+    env = os.environ.copy()
+    # Let the first run write the bytecode, so compiling is not measured.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_us():
+    times = {}
+
+    for line in _run("-X", "importtime", "-c", "import prmt").stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            pass
+
+    return times["prmt"] - times.get("typing", 0)
+
+
+def test_import_does_not_load_lazy_modules():
+    out = _run(
+        "-c",
+        "import sys, prmt; print(' '.join(sorted(sys.modules)))",
+    ).stdout.split()
+
+    assert [name for name in LAZY_MODULES if name in out] == []
+
+
+def test_lazy_names_are_importable():
+    out = _run(
+        "-c",
+        "import prmt; print(prmt.read_stdin_multiline.__module__, "
+        "prmt.get_input_from_texteditor.__module__)",
+    ).stdout.split()
+
+    assert out == ["prmt._terminal", "prmt._editor"]
+
+
+def test_import_time_budget():
+    _run("-c", "import prmt")
+
+    best = min(_import_time_us() for _ in range(3))
+
+    assert best < BUDGET_US, f"import prmt took {best} us, budget is {BUDGET_US} us"
@@ -0,0 +1,156 @@
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+OPTIONS = [f"option {i}" for i in range(300)]
+
+
+def _selection(size):
+    return prmt.Selection(list(range(size)), size)
+
+
+def test_toggle_ranges():
+    selection = _selection(300)
+
+    selection.toggle(3, 251)
+    assert len(selection) == 248
+    assert 2 not in selection and 3 in selection and 250 in selection
+    assert 251 not in selection
+
+    selection.toggle(5)
+    selection.toggle(0, 8)
+    assert list(selection.positions())[:6] == [0, 1, 2, 5, 8, 9]
+
+
+def test_all_none_invert():
+    selection = _selection(13)
+
+    selection.select_all()
+    assert len(selection) == 13
+    assert selection.bits == bytearray(b"\xff\x1f")
+
+    selection.toggle(0, 2)
+    selection.invert()
+    assert list(selection.positions()) == [0, 1]
+
+    selection.clear()
+    assert len(selection) == 0
+    assert 20 not in selection
+
+
+def test_iteration_is_lazy():
+    looked_up = []
+
+    class Options(dict):
+        def __getitem__(self, key):
+            looked_up.append(key)
+            return super().__getitem__(key)
+
+    options = Options(a=1, b=2, c=3)
+    selection = prmt.Selection(options, 3, list(options))
+    selection.toggle(1, 3)
+
+    pairs = iter(selection)
+    assert next(pairs) == ("b", 2)
+    assert looked_up == ["b"]
+    assert list(selection.keys()) == ["b", "c"]
+    assert repr(selection) == "Selection(['b', 'c'])"
+
+
+def test_multi_select():
+    io = ScriptedIO("1, 3-5", "4", "")
+
+    selection = prmt.multi_select("Pick", OPTIONS[:8], io=io)
+
+    assert list(selection.keys()) == [1, 3, 5]
+    assert list(selection)[0] == (1, "option 1")
+
+    output = io.getvalue()
+    assert "[ ]  0: option 0\n" in output
+    assert "[x]  4: option 4\n" in output
+    assert "[4 selected]" in output
+    assert output.endswith("[3 selected]> \n")
+
+
+def test_commands_and_keys():
+    options = {"dev": "Development", "prod": "Production", "pre-prod": "Staging"}
+    io = ScriptedIO("ALL", "invert pre-prod", "")
+
+    selection = prmt.multi_select("Env?", options, io=io)
+
+    assert list(selection) == [("pre-prod", "Staging")]
+
+    io = ScriptedIO("dev-pre-prod none", "")
+    assert len(prmt.multi_select("Env?", options, default=["dev"], io=io)) == 0
+
+
+def test_default():
+    io = ScriptedIO("")
+
+    selection = prmt.multi_select("Pick", ["a", "b", "c"], default=[0, 2], io=io)
+
+    assert list(selection.keys()) == [0, 2]
+    assert "[2 selected]" in io.getvalue()
+
+    with pytest.raises(ValueError):
+        prmt.multi_select("Pick", ["a"], default=[3], io=io)
+
+
+def test_invalid_answer_keeps_the_selection():
+    io = ScriptedIO("0", "0 x", "2", "")
+
+    selection = prmt.multi_select("Pick", ["a", "b", "c"], max_retries=1, io=io)
+
+    assert list(selection.keys()) == [0, 2]
+
+
+def test_retries_exhausted():
+    io = ScriptedIO("x", "y")
+
+    with pytest.raises(prmt.RetriesExhausted):
+        prmt.multi_select("Pick", ["a"], max_retries=1, io=io)
+
+    io = ScriptedIO("0", "x")
+    selection = prmt.multi_select(
+        "Pick", ["a", "b"], default=[1], max_retries=0, on_exhausted="default", io=io
+    )
+    assert list(selection.keys()) == [1]
+
+
+def test_pages():
+    io = ScriptedIO(">", "all", "")
+
+    selection = prmt.multi_select("Pick", iter(OPTIONS), page_size=100, io=io)
+
+    assert len(selection) == 300
+    output = io.getvalue()
+    assert "  Page 2 of 3" in output
+    assert "[x]  150: option 150\n" in output
+    assert "option 250" not in output
+
+
+def test_option_set():
+    options = prmt.OptionSet(["red", "green", "blue"])
+    io = ScriptedIO("gr b", "")
+
+    assert list(prmt.multi_select("Color?", options, io=io)) == [
+        (1, "green"),
+        (2, "blue"),
+    ]
+
+
+def test_prompt_formats():
+    prompt = prmt.Prompt(io=ScriptedIO("0", ""), fmt_select_option=" {}) {}")
+
+    prompt.multi_select("Pick", ["a"])
+
+    assert "[x] 0) a\n" in prompt.io.getvalue()
+
+
+def test_timeout_returns_default():
+    io = ScriptedIO()
+
+    selection = prmt.multi_select("Pick", ["a", "b"], default=[1], timeout=5, io=io)
+
+    assert list(selection.keys()) == [1]
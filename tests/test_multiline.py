@@ -0,0 +1,126 @@
+import os
+import pty
+import subprocess
+import sys
+import termios
+import time
+
+import pytest
+
+from prmt import AnswerBuffer, _terminal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASTE_SIZE = 4 * 1024 * 1024
+MIN_BYTES_PER_SECOND = 1024 * 1024
+
+CHILD = """
+import sys
+import prmt
+
+answer = prmt.string(question="Paste:", multiline=True)
+sys.stderr.write(str(len(answer)))
+"""
+
+
+def _wait_for_noncanonical(fd, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while termios.tcgetattr(fd)[3] & termios.ICANON:
+        assert time.monotonic() < deadline, "prompt did not enter raw mode"
+        time.sleep(0.01)
+
+
+def test_multiline_paste_throughput():
+    master, slave = pty.openpty()
+
+    attrs = termios.tcgetattr(slave)
+    attrs[3] = attrs[3] & ~termios.ECHO
+    termios.tcsetattr(slave, termios.TCSANOW, attrs)
+
+    line = b"x" * 99 + b"\n"
+    paste = line * (PASTE_SIZE // len(line))
+
+    proc = subprocess.Popen(
+        [sys.executable, "-c", CHILD],
+        stdin=slave,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        cwd=ROOT,
+    )
+
+    try:
+        _wait_for_noncanonical(slave)
+
+        start = time.perf_counter()
+        view = memoryview(paste)
+        while view:
+            written = os.write(master, view[:65536])
+            view = view[written:]
+        os.write(master, b"\x04")
+
+        _, err = proc.communicate(timeout=60)
+        elapsed = time.perf_counter() - start
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        restored = termios.tcgetattr(slave)
+        os.close(master)
+        os.close(slave)
+
+    assert proc.returncode == 0, err
+    assert int(err) == len(paste)
+    assert restored[3] & termios.ICANON
+    assert len(paste) / elapsed >= MIN_BYTES_PER_SECOND
+
+
+class _Console:
+    # Stands in for 'msvcrt'.
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.echo = []
+
+    def kbhit(self):
+        return bool(self.keys)
+
+    def getwch(self):
+        return self.keys.pop(0)
+
+    def putwch(self, char):
+        self.echo.append(char)
+
+
+def _windows_console(monkeypatch, keys):
+    console = _Console(keys)
+    monkeypatch.setattr(_terminal, "WINDOWS", True)
+    monkeypatch.setattr(_terminal, "msvcrt", console, raising=False)
+    monkeypatch.setattr(os, "isatty", lambda fd: True)
+    return console
+
+
+def test_windows_multiline_ends_with_ctrl_z(monkeypatch):
+    console = _windows_console(monkeypatch, "ab\r\xe0Hc\x1arest")
+
+    buffer = _terminal.read_stdin_multiline(typed="x", deadline=time.monotonic() + 5)
+
+    # The up arrow is dropped, the keys after ctrl+z are not read.
+    assert buffer.getvalue() == "xab\nc"
+    assert "".join(console.echo) == "ab\r\nc\r\n"
+    assert console.keys == list("rest")
+
+
+def test_windows_multiline_ends_with_ctrl_c_or_ctrl_d(monkeypatch):
+    for end in ("\x03", "\x04"):
+        _windows_console(monkeypatch, "a" + end)
+        assert _terminal.read_stdin_multiline_windows().getvalue() == "a"
+
+
+def test_windows_multiline_timeout_keeps_the_typed_text(monkeypatch):
+    _windows_console(monkeypatch, "ab")
+    buffer = AnswerBuffer()
+    start = time.monotonic()
+
+    with pytest.raises(TimeoutError):
+        _terminal.read_stdin_multiline_windows(buffer, time.monotonic() + 0.05)
+
+    assert time.monotonic() - start >= 0.05
+    assert buffer.getvalue() == "ab"
@@ -0,0 +1,101 @@
+import pytest
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+def test_lookup_list():
+    options = prmt.OptionSet(["foo", "bar", "Baz"])
+
+    assert options.lookup("1") == (1, "bar")
+    assert options.lookup("-1") == (2, "Baz")
+    assert options.lookup("bar") == (1, "bar")
+    assert options.lookup("BAZ") == (2, "Baz")
+    assert options.lookup("f") == (0, "foo")
+    assert options.lookup("ba") is None
+    assert options.lookup("bar ") is None
+    assert options.lookup("3") is None
+    assert options.lookup("") is None
+
+
+def test_lookup_dict():
+    options = prmt.OptionSet({"bar": "Bar", "barn": "Barn", 1: "one", "1": "text one"})
+
+    # An exact key wins over a longer name with the same prefix.
+    assert options.lookup("bar") == ("bar", "Bar")
+    assert options.lookup("barn") == ("barn", "Barn")
+    assert options.lookup("1") == ("1", "text one")
+    assert options.lookup("01") == (1, "one")
+    assert options.lookup("text") == ("1", "text one")
+    assert options.lookup("ba") is None
+
+
+def test_prefix_of_a_key_and_its_option():
+    options = prmt.OptionSet({"apple": "Apple pie", "b": "Banana"})
+
+    # The key and the text of the same option are no conflict.
+    assert options.lookup("ap") == ("apple", "Apple pie")
+    assert options.lookup("ban") == ("b", "Banana")
+
+
+def test_equal_options_are_ambiguous():
+    options = prmt.OptionSet(["same", "same", "other"])
+
+    assert options.lookup("same") is None
+    assert options.lookup("o") == (2, "other")
+
+
+def test_key_of():
+    unhashable = ["x"]
+    options = prmt.OptionSet({"a": 1, "b": 1, "c": unhashable})
+
+    assert options.key_of(1) == "a"
+    assert options.key_of(["x"]) == "c"
+    with pytest.raises(KeyError):
+        options.key_of(2)
+
+
+def test_mapping():
+    options = prmt.OptionSet(iter(["a", "b"]))
+
+    assert len(options) == 2
+    assert list(options) == [0, 1]
+    assert dict(options.items()) == {0: "a", 1: "b"}
+    assert 1 in options and 2 not in options and -1 not in options
+
+
+def test_select():
+    options = prmt.OptionSet(["red", "green", "blue"])
+    io = ScriptedIO("gr", "r", "x", "0")
+
+    assert prmt.select("Color?", options, io=io) == (1, "green")
+    assert prmt.select("Color?", options, io=io) == (0, "red")
+    assert prmt.select("Color?", options, io=io) == (0, "red")
+
+    output = io.getvalue()
+    assert output.count("  2: blue\n") == 4
+    assert "Page" not in output
+
+
+def test_options_are_rendered_once():
+    rendered = []
+
+    class Option:
+        def __str__(self):
+            rendered.append(self)
+            return "option"
+
+    options = prmt.OptionSet([Option(), Option()])
+    prompt = prmt.Prompt(io=ScriptedIO("0", "1"))
+
+    prompt.select("Pick", options)
+    prompt.select("Pick", options)
+
+    assert len(rendered) == 2
+
+
+def test_select_without_answer_or_default():
+    options = prmt.OptionSet(["None of these", "All"])
+    io = ScriptedIO("", "a")
+
+    assert prmt.select("Pick", options, io=io) == (1, "All")
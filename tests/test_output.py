@@ -0,0 +1,87 @@
+import io as _io
+import sys
+
+import prmt
+from prmt.testing import ScriptedIO
+
+
+class CountingIO(_io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def _io_with(*answers):
+    output = CountingIO()
+    io = prmt.PromptIO(
+        input=_io.StringIO("".join(a + "\n" for a in answers)),
+        output=output,
+        terminal=prmt.Terminal(interactive=True),
+    )
+    return io, output
+
+
+def test_select_is_written_at_once():
+    io, output = _io_with("1")
+    options = [f"option {i}" for i in range(1000)]
+
+    assert prmt.select("Pick", options, default=2, io=io) == (1, "option 1")
+
+    # The frame and the end of the prompt line.
+    assert output.writes == 2
+    assert io.writer.writes == 2
+    assert "  999: option 999\n\n[2]> " in output.getvalue()
+
+
+def test_retry_is_written_with_the_next_frame():
+    io, output = _io_with("x", "5")
+
+    assert prmt.integer("Number?", io=io) == 5
+    assert output.writes == 3
+    assert "Invalid input.\n\n\nNumber?\n> " in output.getvalue()
+
+
+def test_bytes_written():
+    io = ScriptedIO("ja", "y")
+
+    prmt.string("Näme?", io=io)
+    prmt.confirm("Continue?", io=io)
+
+    assert io.writer.bytes_written == len(io.getvalue().encode("utf-8"))
+
+
+def test_shared_writer():
+    writer = prmt.OutputWriter()
+    first = ScriptedIO("y")
+    second = ScriptedIO("y")
+    first.writer = second.writer = writer
+
+    prmt.confirm("Continue?", io=first)
+    prmt.confirm("Continue?", io=second)
+
+    assert writer.writes == 4
+    assert writer.bytes_written == len(first.getvalue()) + len(second.getvalue())
+
+
+def test_output_to_stderr(feed, capsys, monkeypatch):
+    monkeypatch.setenv("PRMT_OUTPUT", "stderr")
+    feed("joe")
+
+    assert prmt.string("Name?") == "joe"
+    assert capsys.readouterr() == ("", "\nName?\n> \n")
+
+
+def test_hook_output_bytes():
+    events = []
+    io = ScriptedIO("y")
+    prmt.add_hook(events.append)
+    try:
+        prmt.confirm("Continue?", io=io)
+    finally:
+        prmt.remove_hook(events.append)
+
+    assert events[0].output_bytes == len(io.getvalue()) > 0
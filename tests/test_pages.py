@@ -0,0 +1,149 @@
+import asyncio
+
+import prmt
+from prmt import aio
+from prmt.testing import ScriptedIO
+
+
+class Label:
+    rendered = []
+
+    def __init__(self, n):
+        self.n = n
+
+    def __str__(self):
+        Label.rendered.append(self.n)
+        return f"item {self.n}"
+
+
+def _write(tmp_path, data):
+    path = tmp_path / "options.txt"
+    path.write_bytes(data)
+    return path
+
+
+def test_line_file(tmp_path):
+    path = _write(tmp_path, b"one\r\ntwo\n\nfour")
+
+    with prmt.LineFile(path) as lines:
+        assert lines[1] == "two"
+        assert lines[-1] == "four"
+        assert len(lines) == 4
+        assert list(lines) == ["one", "two", "", "four"]
+
+
+def test_line_file_is_indexed_as_far_as_used(tmp_path):
+    path = _write(tmp_path, b"".join(b"line %d\n" % i for i in range(1000)))
+
+    with prmt.LineFile(path) as lines:
+        assert lines[2] == "line 2"
+        assert len(lines._offsets) == 4
+        assert len(lines) == 1000
+
+
+def test_line_file_empty(tmp_path):
+    with prmt.LineFile(_write(tmp_path, b"")) as lines:
+        assert len(lines) == 0
+        assert list(lines) == []
+
+
+def test_lazy_sequence():
+    seq = prmt.LazySequence(iter(range(100)))
+
+    assert seq[3] == 3
+    assert len(seq._items) == 4
+    assert not seq.complete
+    assert seq[-1] == 99
+    assert seq.complete
+
+
+def test_select_pages():
+    Label.rendered = []
+    options = prmt.LazySequence(Label(i) for i in range(100))
+    io = ScriptedIO(">", ">", "<", "12")
+
+    assert prmt.select("Pick", options, page_size=5, io=io) == (12, options[12])
+
+    output = io.getvalue()
+    assert "  Page 1 of ? (> next, < previous)" in output
+    assert "  Page 3 of ? (> next, < previous)" in output
+    assert "  12: item 12" in output
+    assert "item 15" not in output
+    # Pages are rendered once, also when they are shown again.
+    assert Label.rendered == list(range(15))
+
+
+def test_select_page_commands_are_not_retries():
+    io = ScriptedIO(">", ">", "<", "x", "3")
+
+    assert prmt.select("Pick", list("abcdefg"), page_size=3, max_retries=1, io=io) == (
+        3,
+        "d",
+    )
+    assert "  Page 2 of 3 (> next, < previous)" in io.getvalue()
+
+
+def test_select_stays_on_the_last_page():
+    io = ScriptedIO(">", ">", ">", "<", "<", "<", "0")
+
+    assert prmt.select("Pick", ["a", "b", "c"], page_size=2, io=io) == (0, "a")
+
+    output = io.getvalue()
+    assert output.count("Page 2 of 2") == 3
+    assert output.count("Page 1 of 2") == 4
+
+
+def test_select_key_on_another_page():
+    io = ScriptedIO("98")
+    options = prmt.LazySequence(f"item {i}" for i in range(100))
+
+    assert prmt.select("Pick", options, io=io) == (98, "item 98")
+    # The default page size fits the terminal.
+    assert "  17: item 17\n  Page 1 of ?" in io.getvalue()
+
+
+def test_select_line_file(tmp_path):
+    path = _write(tmp_path, b"".join(b"host-%d\n" % i for i in range(500)))
+    io = ScriptedIO(">", "450")
+
+    with prmt.LineFile(path) as hosts:
+        assert prmt.select("Host?", hosts, page_size=10, default=3, io=io) == (
+            450,
+            "host-450",
+        )
+
+    output = io.getvalue()
+    assert "  Page 2 of 50" in output
+    assert "  19: host-19" in output
+    assert "host-20" not in output
+
+
+def test_select_generator():
+    io = ScriptedIO("2")
+
+    assert prmt.select("Pick", (c for c in "abc"), io=io) == (2, "c")
+    assert "  Page 1 of 1" in io.getvalue()
+
+
+def test_select_mapping_key_wins_over_page_command():
+    io = ScriptedIO(">")
+    options = {">": "forward", "<": "back", "x": "other"}
+
+    assert prmt.select("Pick", options, page_size=1, io=io) == (">", "forward")
+
+
+def test_select_without_page_size_shows_all_options():
+    io = ScriptedIO(">", "1")
+
+    assert prmt.select("Pick", ["a", "b"], io=io) == (1, "b")
+    assert "Page" not in io.getvalue()
+
+
+def test_aio_select_pages():
+    io = ScriptedIO(">", "4")
+
+    async def main():
+        return await aio.select("Pick", iter("abcdef"), page_size=3, io=io)
+
+    assert asyncio.run(main()) == (4, "e")
+    assert "  Page 2 of ? (> next, < previous)" in io.getvalue()
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import prmt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_pipe_does_not_render(feed, capsys):
+    feed("joe", "y", "1", "a, b", "5", tty=False)
+
+    assert prmt.string("Name?") == "joe"
+    assert prmt.confirm("Continue?") is True
+    assert prmt.select("Pick", ["a", "b"]) == (1, "b")
+    assert prmt.list_of_string("Items?") == ["a", "b"]
+    assert prmt.integer("Number?") == 5
+    assert capsys.readouterr() == ("", "")
+
+
+def test_pipe_echo_to_stderr(feed, capsys, monkeypatch):
+    monkeypatch.setenv("PRMT_PIPE_ECHO", "1")
+    feed("", tty=False)
+
+    assert prmt.string("Name?", default="joe") == "joe"
+    assert capsys.readouterr() == ("", "\nName?\n[joe]> \n")
+
+
+def test_pipe_multiline(feed):
+    feed("first", "second", prmt.MULTILINE_END, "next", tty=False)
+
+    assert prmt.string("Text?", multiline=True) == "first\nsecond\n"
+    assert prmt.string("Next?") == "next"
+
+
+def test_pipe_multiline_until_eof(feed):
+    feed("first", "second", tty=False)
+
+    assert prmt.string_from_editor("Text?") == "first\nsecond\n"
+
+
+def test_pipe_retries_on_invalid_lines(feed):
+    feed("maybe", "no", tty=False)
+
+    assert prmt.confirm("Continue?") is False
+
+
+def test_pipe_subprocess():
+    code = (
+        "import prmt\n"
+        "for i in range(5000):\n"
+        "    assert prmt.confirm('Continue?') is True\n"
+        "print(prmt.string('Text?', multiline=True), end='')\n"
+    )
+    answers = "y\n" * 5000 + "multi\nline\n.\n"
+
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input=answers,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        timeout=60,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout == "multi\nline\n"
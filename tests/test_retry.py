@@ -0,0 +1,76 @@
+import sys
+
+import pytest
+
+import prmt
+
+
+def test_retry_loop_has_constant_stack(feed):
+    feed(*(["maybe"] * (sys.getrecursionlimit() * 2)), "y")
+
+    assert prmt.confirm("Continue?") is True
+
+
+def test_max_retries_raise(feed):
+    feed("a", "b", "c", "1")
+
+    with pytest.raises(prmt.RetriesExhausted) as e:
+        prmt.integer("Number?", max_retries=2)
+
+    assert e.value.retries == 2
+    assert sys.stdin.readline() == "1\n"
+
+
+def test_max_retries_default(feed):
+    feed("x", "x")
+
+    assert (
+        prmt.integer(
+            "Number?", default="7", blacklist=[3], max_retries=1, on_exhausted="default"
+        )
+        == 7
+    )
+
+
+def test_max_retries_none(feed):
+    feed("", "", "")
+
+    assert prmt.confirm("Continue?", max_retries=2, on_exhausted="none") is None
+
+
+def test_invalid_on_exhausted(feed):
+    feed("y")
+
+    with pytest.raises(ValueError):
+        prmt.confirm("Continue?", on_exhausted="ignore")
+
+
+def test_string_blacklist_retries(feed):
+    feed("", "", "foo")
+
+    assert prmt.string("Name?", blacklist=[""]) == "foo"
+
+
+def test_list_of_string_retries(feed):
+    feed("a, b", "c, d")
+
+    assert prmt.list_of_string("Items?", blacklist=["a"]) == ["c", "d"]
+
+
+def test_select_retries(feed, capsys):
+    feed("9", "foo", "1")
+
+    assert prmt.select("Pick", options=["a", "b"]) == (1, "b")
+    assert capsys.readouterr().out.count("  1: b") == 3
+
+
+def test_select_default_on_exhausted(feed):
+    feed("x")
+
+    assert prmt.select(
+        "Pick",
+        options={"foo": 1, "bar": 2},
+        default="bar",
+        max_retries=0,
+        on_exhausted="default",
+    ) == ("bar", 2)
@@ -0,0 +1,10 @@
+import pytest
+
+from tests.pty_harness import run_scenario
+from tests.scenarios import SCENARIOS
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[s.name for s in SCENARIOS])
+def test_scenario(scenario):
+    error = run_scenario(scenario)
+    assert error is None, error
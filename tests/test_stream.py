@@ -0,0 +1,176 @@
+import asyncio
+import os
+import threading
+import time
+
+import prmt
+import prmt.aio
+from prmt.testing import ScriptedIO
+
+
+def _gated(gate, done, count=100):
+    """
+    Yield two options, then wait for 'gate' before each of the others.
+    """
+    try:
+        for i in range(count):
+            if i >= 2:
+                gate.wait()
+            yield f"host {i}"
+    finally:
+        done.set()
+
+
+async def _hosts(count, delay=0.0):
+    for i in range(count):
+        await asyncio.sleep(delay)
+        yield f"host {i}"
+
+
+def test_stream_index_grows():
+    stream = prmt.OptionStream(iter(["web", "db", "Web", "cache"]))
+
+    assert stream.wait(5)
+    assert len(stream) == 4
+    assert stream.lookup("1") == (1, "db")
+    assert stream.lookup("CACHE") == (3, "cache")
+    # Two options have this text.
+    assert stream.lookup("web") is None
+    assert stream.lookup("4") is None
+    assert list(stream.items()) == [(0, "web"), (1, "db"), (2, "Web"), (3, "cache")]
+
+
+def test_keyed_stream():
+    pairs = [("eu", "Europe"), ("us", "America"), ("eu", "again")]
+
+    with prmt.OptionStream(pairs, keyed=True) as stream:
+        stream.wait(5)
+
+        assert dict(stream.items()) == {"eu": "Europe", "us": "America"}
+        assert stream.lookup("us") == ("us", "America")
+        assert stream.lookup("europe") == ("eu", "Europe")
+        assert stream["eu"] == "Europe"
+
+
+def test_errors_end_the_stream():
+    def broken():
+        yield "a"
+        raise OSError("gone")
+
+    stream = prmt.OptionStream(broken())
+
+    assert stream.wait(5)
+    assert len(stream) == 1
+    assert isinstance(stream.error, OSError)
+
+
+def test_wake_fd_is_readable_after_options_arrive():
+    import select
+
+    stream = prmt.OptionStream(iter(["a"]))
+    stream.wait(5)
+
+    assert select.select([stream.fileno()], [], [], 0)[0]
+
+
+def test_select_waits_for_an_option_that_did_not_arrive():
+    gate, done = threading.Event(), threading.Event()
+    stream = prmt.OptionStream(_gated(gate, done))
+    io = ScriptedIO("5", interactive=False)
+
+    threading.Timer(0.05, gate.set).start()
+
+    assert prmt.select("Host?", stream, io=io) == (5, "host 5")
+    assert done.wait(5)
+
+
+def test_select_before_discovery_finishes_cancels():
+    gate, done = threading.Event(), threading.Event()
+    stream = prmt.OptionStream(_gated(gate, done))
+
+    while len(stream) < 2:
+        stream.wait(0.01)
+
+    io = ScriptedIO("1", interactive=False)
+    assert prmt.select("Host?", stream, io=io) == (1, "host 1")
+
+    gate.set()
+
+    # The generator is closed once it produced the option it was working on.
+    assert done.wait(5)
+    assert stream.wait(5)
+    assert len(stream) == 2
+    assert "Page 1 of ?" in io.getvalue()
+
+
+def test_async_source_is_cancelled():
+    stream = prmt.OptionStream(_hosts(1000, delay=0.01))
+    io = ScriptedIO("2", interactive=False)
+
+    assert prmt.select("Host?", stream, io=io) == (2, "host 2")
+    assert stream.wait(5)
+    assert len(stream) < 1000
+
+
+def test_aio_select_reads_in_the_running_loop():
+    io = ScriptedIO("3", interactive=False)
+
+    async def main():
+        return await prmt.aio.select("Host?", _hosts(10), io=io)
+
+    assert asyncio.run(main()) == (3, "host 3")
+
+
+def test_aio_preset_waits_for_the_option():
+    prmt.set_answers({"host": "5"})
+
+    async def main():
+        return await prmt.aio.select(
+            "Host?", _hosts(10, delay=0.01), prompt_id="host", io=ScriptedIO()
+        )
+
+    try:
+        assert asyncio.run(main()) == (5, "host 5")
+    finally:
+        prmt.set_answers(None)
+
+
+def test_multi_select_waits_for_all_options():
+    io = ScriptedIO("all", "", interactive=False)
+    stream = prmt.OptionStream(iter(["a", "b", "c"]))
+
+    assert len(prmt.multi_select("Pick", stream, io=io)) == 3
+
+
+def test_multi_select_wait_is_part_of_the_timeout():
+    gate, done = threading.Event(), threading.Event()
+    stream = prmt.OptionStream(_gated(gate, done))
+    r, w = os.pipe()
+    io = prmt.PromptIO(
+        input=os.fdopen(r, "r"),
+        output=open(os.devnull, "w"),
+        terminal=prmt.Terminal(interactive=False),
+    )
+    start = time.monotonic()
+
+    selection = prmt.multi_select("Pick", stream, timeout=0.3, io=io)
+
+    # Waiting for the options and the answer share the timeout.
+    assert time.monotonic() - start < 0.55
+    assert selection is not None and len(selection) == 0
+    gate.set()
+    assert done.wait(5)
+    os.close(w)
+
+
+def test_fuzzy_index_extend_updates_kept_matches():
+    index = prmt.FuzzyIndex(["web-1", "db"])
+
+    assert list(index.matches("w")) == [0]
+    assert list(index.matches("we")) == [0]
+
+    index.extend(["cache", "web-2"])
+
+    assert list(index.matches("we")) == [0, 3]
+    assert list(index.matches("w")) == [0, 3]
+    assert list(index.matches("c")) == [2]
@@ -0,0 +1,131 @@
+import prmt
+from prmt.options import display_width
+from prmt.testing import ScriptedIO
+
+TAB = "\t"
+UP = "\x1b[A"
+
+HOSTS = [
+    ("web-1", "eu-west", 0.25),
+    ("db-main", "us-east", 12),
+    ("cache", None, 3.5),
+]
+
+
+def test_display_width():
+    assert display_width("host") == 4
+    assert display_width("東京") == 4
+    assert display_width("é") == 1
+    assert display_width("") == 0
+
+
+def test_columns_are_aligned():
+    table = prmt.Table(HOSTS, columns=["host", "region", "load"])
+
+    assert table.widths == [7, 7, 4]
+    assert table.header_line("  {}: {}") == "     host     region   load"
+    assert table.option_line("  {}: {}", 0) == "  0: web-1    eu-west  0.25"
+    assert table.option_line("  {}: {}", 1) == "  1: db-main  us-east    12"
+    assert table.option_line("  {}: {}", 2) == "  2: cache              3.5"
+
+
+def test_wide_characters():
+    table = prmt.Table({"tyo": ("東京", 1), "sfo": ("San Francisco", 2)})
+
+    assert table.option_line("{} {}", 0) == "tyo 東京           1"
+    assert table.option_line("{} {}", 1) == "sfo San Francisco  2"
+    assert table.header_line("{} {}") is None
+
+
+def test_dict_rows():
+    table = prmt.Table([{"name": "a", "size": 10}, {"name": "bb", "size": 2}])
+
+    assert table.columns == ["name", "size"]
+    assert table.header_line("{}: {}") == "   name  size"
+    assert table.lookup("bb") == (1, {"name": "bb", "size": 2})
+
+
+def test_sort_orders_are_kept():
+    table = prmt.Table(HOSTS, columns=["host", "region", "load"])
+
+    table.sort("load")
+    assert list(table.order) == [0, 2, 1]
+    ascending = table.order
+
+    table.sort("load")
+    assert list(table.order) == [1, 2, 0]
+    assert table.sorted_by == (2, True)
+
+    table.sort(2, descending=False)
+    assert table.order is ascending
+
+    # Empty cells sort last.
+    table.sort("REGION")
+    assert list(table.order) == [0, 1, 2]
+
+    table.sort()
+    assert list(table.order) == [0, 1, 2]
+    assert table.sorted_by is None
+
+
+def test_only_shown_rows_are_padded():
+    table = prmt.Table([(f"host {i}", i) for i in range(1000)])
+
+    prmt.select("Host?", table, page_size=10, io=ScriptedIO("5"))
+
+    assert len(table._texts) == 10
+
+
+def test_select_sorts():
+    table = prmt.Table(HOSTS, columns=["host", "region", "load"])
+    io = ScriptedIO("^3", "^load", "db")
+
+    assert prmt.select("Host?", table, io=io) == (1, ("db-main", "us-east", 12))
+
+    frames = io.getvalue().split("Host?")
+    assert frames[1].index("web-1") < frames[1].index("db-main")
+    assert frames[2].index("  2: cache") < frames[2].index("  1: db-main")
+    assert frames[3].index("  1: db-main") < frames[3].index("  2: cache")
+    assert "\n     host     region   load\n" in frames[1]
+
+
+def test_unknown_sort_column_is_invalid():
+    table = prmt.Table(HOSTS)
+    io = ScriptedIO("^9", "0")
+
+    assert prmt.select("Host?", table, max_retries=1, io=io)[0] == 0
+
+
+def test_pages_follow_the_order():
+    table = prmt.Table([(f"host {i}", -i) for i in range(10)])
+    io = ScriptedIO("^2", ">", "")
+
+    prmt.select("Host?", table, default=0, page_size=4, io=io)
+
+    frames = io.getvalue().split("Host?")
+    assert "  9: host 9" in frames[2] and "  5: host 5" not in frames[2]
+    assert "  5: host 5" in frames[3]
+
+
+def test_arrow_keys_sort_with_tab():
+    table = prmt.Table(HOSTS, columns=["host", "region", "load"])
+    io = ScriptedIO()
+    # The highlight stays on "web-1", which is sorted last.
+    io.feed_keys(TAB + UP + "\r")
+
+    assert prmt.select("Host?", table, arrow_keys=True, io=io)[0] == 1
+
+    output = io.getvalue()
+    assert "     host     region   load\n" in output
+    assert ", sorted by host ↑" in output
+
+
+def test_multi_select_table():
+    table = prmt.Table(HOSTS, columns=["host", "region", "load"])
+    io = ScriptedIO("^load", "0-2", "")
+
+    selection = prmt.multi_select("Hosts?", table, io=io)
+
+    assert list(selection.keys()) == [0, 1, 2]
+    assert "[x]  2: cache              3.5\n" in io.getvalue()
+    assert "\n        host     region   load\n" in io.getvalue()
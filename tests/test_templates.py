@@ -0,0 +1,72 @@
+import sys
+
+import prmt
+
+
+def test_templates_are_cached():
+    a = prmt._template(["{} ", "[{}] ", "> {}"])
+    b = prmt._template(fmt_question="{} ", fmt_default="[{}] ", fmt_prompt="> {}")
+
+    assert a is b
+    assert a.prompt_start == "> "
+    assert a.prompt_end == ""
+    assert prmt._template() is prmt._DEFAULT_TEMPLATE
+
+
+def test_template_render():
+    template = prmt._template(fmt_question="<{}>", fmt_default="({})")
+
+    assert template.render("q") == "<q>> "
+    assert template.render("q", "d") == "<q>(d)> "
+
+
+def test_prompt_compiles_templates_once():
+    prompt = prmt.Prompt(fmt_question="[A]{}[B]", fmt_string_default="[C]{}[D]")
+
+    assert prompt._string_template.question == "[A]{}[B]"
+    assert prompt._string_template.default == "[C]{}[D]"
+    assert prompt._integer_template.default == "[{}]"
+    assert prompt._select_template.custom.question == "[A]{}[B]"
+
+
+def test_prompt_string(feed, capsys):
+    feed("")
+    prompt = prmt.Prompt(fmt_question="[A]{}[B]", fmt_string_default="[C]{}[D]")
+
+    assert prompt.string("Name?", default="foo") == "foo"
+    assert capsys.readouterr().out == "[A]Name?[B][C]foo[D]> \n"
+
+
+def test_prompt_call_formats_override_instance(feed, capsys):
+    feed("y")
+    prompt = prmt.Prompt(fmt_question="[A]{}[B]")
+
+    assert prompt.confirm("Sure?", fmt_question="{}: ") is True
+    assert capsys.readouterr().out == "Sure?: > \n"
+
+
+def test_prompt_select(feed, capsys):
+    feed("bar")
+    prompt = prmt.Prompt(fmt_question="{}", fmt_select_option="{} -> {}")
+
+    assert prompt.select("Pick", options={"foo": 1, "bar": 2}) == ("bar", 2)
+    assert "foo -> 1" in capsys.readouterr().out
+
+
+def test_select_custom_key(feed):
+    feed("1", "custom")
+
+    assert prmt.select("Pick", options=["a", "Other"], custom_key=1) == (1, "custom")
+
+
+def test_positional_formats(feed, capsys):
+    feed("", "", "0")
+    fmt = ["{} ", "<{}> ", ": {}"]
+
+    assert prmt.string("Name?", "joe", None, False, fmt) == "joe"
+    assert prmt.integer("Count?", "3", None, fmt) == 3
+    assert prmt.select("Pick", ["a"], None, None, ["{}", " {}={}", "", "", ": "]) == (
+        0,
+        "a",
+    )
+    assert capsys.readouterr().out.startswith("Name? <joe> : Count? <3> : ")
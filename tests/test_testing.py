@@ -0,0 +1,57 @@
+import prmt
+from prmt.testing import ScriptedIO
+
+
+def test_scripted_answers_and_output():
+    io = ScriptedIO("joe", "maybe", "y")
+
+    assert prmt.string("Name?", io=io) == "joe"
+    assert prmt.confirm("Continue?", io=io) is True
+    assert io.take_output() == "\nName?\n> \n\nContinue?\n> \n\nContinue?\n> \n"
+    assert io.getvalue() == ""
+
+
+def test_feed_after_start():
+    io = ScriptedIO()
+
+    for i in range(100):
+        io.feed(str(i))
+        assert prmt.integer("Number?", io=io) == i
+
+
+def test_multiline_ends_with_ctrl_d():
+    io = ScriptedIO()
+    io.feed_keys("first\nsecond\n\x04")
+
+    assert prmt.string("Text?", multiline=True, io=io) == "first\nsecond\n"
+
+    io.feed("next")
+    assert prmt.string("Next?", io=io) == "next"
+
+
+def test_select_output():
+    io = ScriptedIO("1")
+
+    assert prmt.select("Pick", ["a", "b"], io=io) == (1, "b")
+    assert "  0: a\n  1: b\n" in io.getvalue()
+
+
+def test_non_interactive_script():
+    io = ScriptedIO("a", "b", prmt.MULTILINE_END, interactive=False)
+
+    assert prmt.string("Text?", multiline=True, io=io) == "a\nb\n"
+
+
+def test_editor_callback():
+    io = ScriptedIO(editor=lambda text: text + " edited")
+
+    assert prmt.string_from_editor("Text?", default="foo", io=io) == "foo edited"
+
+
+def test_prompt_io():
+    io = ScriptedIO("", "n")
+    prompt = prmt.Prompt(fmt_question="{} ", io=io)
+
+    assert prompt.string("Name?", default="joe") == "joe"
+    assert prompt.confirm("Sure?") is False
+    assert io.getvalue().startswith("Name? [joe]> ")
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+import prmt
+import prmt.aio
+from prmt.testing import ScriptedIO
+
+
+def _pipe_io():
+    """
+    A non-interactive PromptIO that reads from a pipe. Returns the io and the
+    write end.
+    """
+    r, w = os.pipe()
+    io = prmt.PromptIO(
+        input=os.fdopen(r, "r"),
+        terminal=prmt.Terminal(interactive=False),
+    )
+    return io, w
+
+
+def test_default_on_timeout():
+    io, w = _pipe_io()
+
+    start = time.monotonic()
+    answer = prmt.string("Name?", default="anon", timeout=0.05, io=io)
+
+    assert answer == "anon"
+    assert time.monotonic() - start < 1
+    os.close(w)
+
+
+def test_raise_on_timeout():
+    io, w = _pipe_io()
+
+    with pytest.raises(prmt.PromptTimeout) as e:
+        prmt.integer("Number?", timeout=0.01, on_timeout="raise", io=io)
+
+    assert isinstance(e.value, TimeoutError)
+    assert e.value.timeout == 0.01
+    os.close(w)
+
+
+def test_answers_read_ahead_are_kept():
+    io, w = _pipe_io()
+    os.write(w, b"joe\ny\n")
+
+    assert prmt.string("Name?", timeout=5, io=io) == "joe"
+    assert prmt.confirm("Continue?", timeout=5, io=io) is True
+
+    os.write(w, b"5\n")
+    os.close(w)
+
+    assert prmt.integer("Number?", io=io) == 5
+
+
+def test_multiline_timeout():
+    io, w = _pipe_io()
+    os.write(w, b"a\nb\n")
+
+    answer = prmt.string("Text?", multiline=True, default="none", timeout=0.05, io=io)
+
+    assert answer == "none"
+
+    os.write(w, b"c\n.\n")
+
+    assert prmt.string("Text?", multiline=True, timeout=5, io=io) == "c\n"
+    os.close(w)
+
+
+def test_retries_share_the_deadline():
+    io = ScriptedIO("x")
+
+    assert prmt.integer("Number?", default="7", timeout=5, io=io) == 7
+    assert "Invalid input." in io.getvalue()
+
+
+def test_select_timeout():
+    assert prmt.select("Pick", ["a", "b"], default=1, timeout=5, io=ScriptedIO()) == (
+        1,
+        "b",
+    )
+
+    # The custom value times out, the select prompt returns its default.
+    io = ScriptedIO("1")
+    answer = prmt.select(
+        "Pick", ["a", "other"], default=0, custom_key=1, timeout=5, io=io
+    )
+
+    assert answer == (0, "a")
+
+    with pytest.raises(prmt.PromptTimeout) as e:
+        prmt.select(
+            "Pick",
+            ["a", "other"],
+            custom_key=1,
+            timeout=5,
+            on_timeout="raise",
+            io=ScriptedIO("1"),
+        )
+
+    assert e.value.question == "Pick"
+
+
+def test_countdown():
+    io = ScriptedIO("joe")
+
+    assert prmt.string("Name?", timeout=10, countdown=True, io=io) == "joe"
+    assert "\nName?\n10s left\n> " in io.getvalue()
+
+
+def test_prompt_defaults():
+    prompt = prmt.Prompt(io=ScriptedIO(), timeout=5)
+
+    assert prompt.confirm("Continue?", default="y") is True
+
+    with pytest.raises(prmt.PromptTimeout):
+        prompt.confirm("Continue?", on_timeout="raise")
+
+    # Without a timeout the prompt reaches the end of the input.
+    with pytest.raises(EOFError):
+        prmt.Prompt(io=ScriptedIO()).confirm("Continue?")
+
+
+def test_hook_status():
+    events = []
+    prmt.add_hook(events.append)
+    try:
+        prmt.confirm("Continue?", default="n", timeout=1, io=ScriptedIO())
+        with pytest.raises(prmt.PromptTimeout):
+            prmt.confirm("Continue?", timeout=1, on_timeout="raise", io=ScriptedIO())
+    finally:
+        prmt.remove_hook(events.append)
+
+    assert [e.status for e in events] == ["timeout", "timeout"]
+
+
+def test_aio_timeout():
+    io, w = _pipe_io()
+
+    async def main():
+        answer = await prmt.aio.string("Name?", default="anon", timeout=0.05, io=io)
+
+        with pytest.raises(prmt.PromptTimeout):
+            await prmt.aio.confirm("Continue?", timeout=0.01, on_timeout="raise", io=io)
+
+        os.write(w, b"joe\n")
+
+        return [answer, await prmt.aio.string("Name?", timeout=5, io=io)]
+
+    assert asyncio.run(main()) == ["anon", "joe"]
+    os.close(w)